@@ -7,6 +7,37 @@ int no_module = 3;
 
 braille bra(dataPin, latchPin, clockPin, no_module);
 
+// Serial 프레임 프로토콜 (raspberrypi/serial_link.py와 동일)
+// Host → Arduino: [STX, TYPE, SEQ, LEN, PAYLOAD..., CRC8]
+// Arduino → Host: [ACK|NAK, SEQ, FREE, CRC8]  (FREE = 수신 버퍼 남은 바이트)
+#define FRAME_STX 0x02
+#define FRAME_ACK 0x06
+#define FRAME_NAK 0x15
+#define FRAME_TYPE_DATA 0x00
+#define FRAME_TYPE_SYNC 0x01
+#define FRAME_TYPE_PROBE 0x02
+#define FRAME_MAX_PAYLOAD 48
+#define RX_BUFFER_SIZE 100      // CMD/PATTERN 패킷 수신 버퍼 (호스트 윈도우 크기)
+#define WINDOW_UPDATE_STEP 16   // 버퍼가 이만큼 비면 윈도우 갱신 ACK 전송
+#define CHAR_DWELL_MS 400       // 한 페이지(최대 3셀) 표시 시간
+
+#define CMD_SINGLE 0x80
+#define CMD_MULTI 0x81
+#define CMD_CLEAR 0x82
+#define CMD_CLEAR_LEGACY 0x00
+
+enum { FRAME_IDLE, FRAME_TYPE, FRAME_SEQ, FRAME_LEN, FRAME_PAYLOAD, FRAME_CRC };
+
+byte rx_ring[RX_BUFFER_SIZE];
+byte rx_head = 0, rx_count = 0;
+byte frame_state = FRAME_IDLE;
+byte frame_type, frame_seq, frame_len, frame_pos, frame_crc;
+byte frame_payload[FRAME_MAX_PAYLOAD];
+byte expected_seq = 0, last_seq = 0xFF;
+byte advertised_free = RX_BUFFER_SIZE;
+byte cell_pos = 3;              // 다음 패턴을 그릴 셀 (3 = 새 페이지 필요)
+unsigned long page_shown_at = 0;
+
 // 버퍼 및 문자 저장 변수
 char string_buffer[100];
 char string_buffer_serial[100][4];
@@ -57,7 +88,7 @@ byte ascii_data[127] = {
 };
 
 void setup() {
-  Serial.begin(9600);
+  Serial.begin(115200);
   bra.begin();
   delay(1000);
   bra.all_off();
@@ -65,84 +96,250 @@ void setup() {
 }
 
 void loop() {
-  if (Serial.available()) {
-    String str = Serial.readStringUntil('\n');
-    str.replace("\r", "");
-    str.trim();
-    
-    // 테스트 명령 처리
-    if (str == "test") {
-      test_all_dots();
-      return;
+  consume_packets();
+  if (!Serial.available()) return;
+
+  // 프레임 수신 중이 아니고 STX로 시작하지 않으면 기존 텍스트 명령 (시리얼 모니터 입력)
+  if (frame_state == FRAME_IDLE && Serial.peek() != FRAME_STX) {
+    handle_text_line();
+    return;
+  }
+  while (Serial.available()) {
+    frame_receive_byte(Serial.read());
+  }
+}
+
+// ===== 프레임 수신 (ACK + 슬라이딩 윈도우) =====
+
+byte crc8_update(byte crc, byte data) {
+  crc ^= data;
+  for (int i = 0; i < 8; i++) {
+    crc = (crc & 0x80) ? (byte)((crc << 1) ^ 0x07) : (byte)(crc << 1);
+  }
+  return crc;
+}
+
+byte rx_free() {
+  return RX_BUFFER_SIZE - rx_count;
+}
+
+void send_ack(byte kind, byte seq) {
+  byte free_bytes = rx_free();
+  byte reply[4] = {kind, seq, free_bytes, 0};
+  reply[3] = crc8_update(crc8_update(crc8_update(0, kind), seq), free_bytes);
+  Serial.write(reply, 4);
+  advertised_free = free_bytes;
+}
+
+void frame_receive_byte(byte b) {
+  switch (frame_state) {
+    case FRAME_IDLE:
+      if (b == FRAME_STX) frame_state = FRAME_TYPE;
+      break;
+    case FRAME_TYPE:
+      frame_type = b;
+      frame_crc = crc8_update(0, b);
+      frame_state = FRAME_SEQ;
+      break;
+    case FRAME_SEQ:
+      frame_seq = b;
+      frame_crc = crc8_update(frame_crc, b);
+      frame_state = FRAME_LEN;
+      break;
+    case FRAME_LEN:
+      frame_crc = crc8_update(frame_crc, b);
+      if (b > FRAME_MAX_PAYLOAD) {
+        // 잘못된 길이: 프레임을 버리고 재전송 요청
+        frame_state = FRAME_IDLE;
+        send_ack(FRAME_NAK, expected_seq);
+        break;
+      }
+      frame_len = b;
+      frame_pos = 0;
+      frame_state = frame_len ? FRAME_PAYLOAD : FRAME_CRC;
+      break;
+    case FRAME_PAYLOAD:
+      frame_payload[frame_pos++] = b;
+      frame_crc = crc8_update(frame_crc, b);
+      if (frame_pos >= frame_len) frame_state = FRAME_CRC;
+      break;
+    case FRAME_CRC:
+      frame_state = FRAME_IDLE;
+      handle_frame(b == frame_crc);
+      break;
+  }
+}
+
+void handle_frame(bool crc_ok) {
+  if (!crc_ok) {
+    send_ack(FRAME_NAK, expected_seq);
+    return;
+  }
+  if (frame_type == FRAME_TYPE_SYNC) {
+    // 시퀀스 초기화 + 버퍼/표시 상태 초기화
+    rx_head = rx_count = 0;
+    cell_pos = 3;
+    last_seq = frame_seq;
+    expected_seq = frame_seq + 1;
+    send_ack(FRAME_ACK, last_seq);
+    return;
+  }
+  if (frame_type == FRAME_TYPE_PROBE) {
+    send_ack(FRAME_ACK, last_seq);
+    return;
+  }
+  if (frame_seq != expected_seq) {
+    byte behind = expected_seq - frame_seq;
+    if (behind > 0 && behind <= 128) {
+      send_ack(FRAME_ACK, last_seq);      // 이미 받은 프레임 (재전송 중복)
+    } else {
+      send_ack(FRAME_NAK, expected_seq);  // 앞 프레임 유실
+    }
+    return;
+  }
+  if (frame_len > rx_free()) {
+    send_ack(FRAME_NAK, expected_seq);    // 윈도우 초과 (호스트가 FREE를 다시 확인)
+    return;
+  }
+  for (byte i = 0; i < frame_len; i++) {
+    rx_ring[(rx_head + rx_count) % RX_BUFFER_SIZE] = frame_payload[i];
+    rx_count++;
+  }
+  last_seq = frame_seq;
+  expected_seq = frame_seq + 1;
+  send_ack(FRAME_ACK, last_seq);
+}
+
+// ===== 패킷 표시 (CMD/PATTERN) =====
+
+byte rx_pop() {
+  byte b = rx_ring[rx_head];
+  rx_head = (rx_head + 1) % RX_BUFFER_SIZE;
+  rx_count--;
+  return b;
+}
+
+void draw_pattern(int cell, byte pattern) {
+  // bit 0 → dot 1 ... bit 5 → dot 6
+  for (int i = 0; i < 6; i++) {
+    if (pattern & (1 << i)) bra.on(cell, i);
+  }
+}
+
+void consume_packets() {
+  // delay() 없이 millis()로 표시 시간을 지켜 수신/ACK가 멈추지 않도록 함
+  while (rx_count >= 2) {
+    byte cmd = rx_ring[rx_head];
+    bool new_page = (cmd != CMD_MULTI) || cell_pos >= 3;
+    if (new_page && millis() - page_shown_at < CHAR_DWELL_MS) break;
+
+    cmd = rx_pop();
+    byte pattern = rx_pop();
+    if (new_page) {
+      bra.all_off();
+      cell_pos = 0;
+      page_shown_at = millis();
+    }
+    if (cmd == CMD_CLEAR || cmd == CMD_CLEAR_LEGACY) {
+      cell_pos = 3;
+    } else if (cmd == CMD_SINGLE) {
+      draw_pattern(0, pattern);
+      cell_pos = 3;
+    } else if (cmd == CMD_MULTI) {
+      draw_pattern(cell_pos++, pattern);
     }
-    if (str == "all") {
-      test_all_cells_all_dots();
+    bra.refresh();
+  }
+
+  byte free_bytes = rx_free();
+  if (free_bytes - advertised_free >= WINDOW_UPDATE_STEP ||
+      (rx_count == 0 && advertised_free < RX_BUFFER_SIZE)) {
+    send_ack(FRAME_ACK, last_seq);        // 윈도우 갱신
+  }
+}
+
+// ===== 텍스트 명령 (시리얼 모니터) =====
+
+void handle_text_line() {
+  String str = Serial.readStringUntil('\n');
+  str.replace("\r", "");
+  str.trim();
+
+  // 테스트 명령 처리
+  if (str == "test") {
+    test_all_dots();
+    return;
+  }
+  if (str == "all") {
+    test_all_cells_all_dots();
+    delay(2000);
+    bra.all_off();
+    bra.refresh();
+    return;
+  }
+  if (str.startsWith("cell")) {
+    int cellNum = str.charAt(4) - '0';
+    if (cellNum >= 1 && cellNum <= 3) {
+      test_cell_all(cellNum - 1);
       delay(2000);
       bra.all_off();
       bra.refresh();
-      return;
     }
-    if (str.startsWith("cell")) {
-      int cellNum = str.charAt(4) - '0';
-      if (cellNum >= 1 && cellNum <= 3) {
-        test_cell_all(cellNum - 1);
-        delay(2000);
-        bra.all_off();
-        bra.refresh();
-      }
-      return;
-    }
-    
-    // 기존 문자 입력 처리
-    Serial.println("입력됨: " + str);
-    
-    strcpy(string_buffer, str.c_str());
-    int ind = 0, len = strlen(string_buffer), index = 0;
-    
-    while (ind < len) {
-      int bytes = get_char_byte(string_buffer + ind);
-      if (bytes == 1) {
-        string_buffer_serial[index][0] = *(string_buffer + ind);
-        string_buffer_serial[index][1] = 0;
-        index++;
-      } else if (bytes == 3) {
-        string_buffer_serial[index][0] = *(string_buffer + ind);
-        string_buffer_serial[index][1] = *(string_buffer + ind + 1);
-        string_buffer_serial[index][2] = *(string_buffer + ind + 2);
-        string_buffer_serial[index][3] = 0;
-        index++;
-      }
-      ind += bytes;
+    return;
+  }
+
+  // 기존 문자 입력 처리
+  Serial.println("입력됨: " + str);
+
+  strncpy(string_buffer, str.c_str(), sizeof(string_buffer) - 1);
+  string_buffer[sizeof(string_buffer) - 1] = 0;
+  int ind = 0, len = strlen(string_buffer), index = 0;
+
+  while (ind < len && index < 100) {
+    int bytes = get_char_byte(string_buffer + ind);
+    if (ind + bytes > len) break;  // 잘린 멀티바이트 문자
+    if (bytes == 1) {
+      string_buffer_serial[index][0] = *(string_buffer + ind);
+      string_buffer_serial[index][1] = 0;
+      index++;
+    } else if (bytes == 3) {
+      string_buffer_serial[index][0] = *(string_buffer + ind);
+      string_buffer_serial[index][1] = *(string_buffer + ind + 1);
+      string_buffer_serial[index][2] = *(string_buffer + ind + 2);
+      string_buffer_serial[index][3] = 0;
+      index++;
     }
-    
-    str_char_count = index;
-    
-    for (int i = 0; i < str_char_count; i++) {
-      if (string_buffer_serial[i][1] == 0) {
-        int code = string_buffer_serial[i][0];
-        ascii_braille(code);
-        delay(300);
-        bra.all_off();
-        bra.refresh();
-        delay(100);
-        Serial.print("ASCII 출력: ");
-        Serial.println(ascii_data[code], BIN);
-      } else {
-        unsigned int cho, jung, jong;
-        split_han_cho_jung_jong(string_buffer_serial[i][0], string_buffer_serial[i][1], string_buffer_serial[i][2], cho, jung, jong);
-        last_cho = cho;
-        last_jung = jung;
-        last_jong = jong;
-        han_braille(cho, jung, jong);
-        delay(300);
-        bra.all_off();
-        bra.refresh();
-        delay(100);
-      }
+    ind += bytes;
+  }
+
+  str_char_count = index;
+
+  for (int i = 0; i < str_char_count; i++) {
+    if (string_buffer_serial[i][1] == 0) {
+      int code = string_buffer_serial[i][0];
+      if (code < 0 || code >= 127) continue;
+      ascii_braille(code);
+      delay(300);
+      bra.all_off();
+      bra.refresh();
+      delay(100);
+      Serial.print("ASCII 출력: ");
+      Serial.println(ascii_data[code], BIN);
+    } else {
+      unsigned int cho, jung, jong;
+      split_han_cho_jung_jong(string_buffer_serial[i][0], string_buffer_serial[i][1], string_buffer_serial[i][2], cho, jung, jong);
+      last_cho = cho;
+      last_jung = jung;
+      last_jong = jong;
+      han_braille(cho, jung, jong);
+      delay(300);
+      bra.all_off();
+      bra.refresh();
+      delay(100);
     }
-    
-    Serial.println();
   }
+
+  Serial.println();
 }
 
 void han_braille(int index1, int index2, int index3) {
@@ -3,6 +3,7 @@ from django.views.decorators.csrf import csrf_exempt
 import json, re
 import xml.etree.ElementTree as ET
 import urllib.request
+from services.deadline import timeout_for
 from utils.braille_converter import _load_braille_map
 
 # 점자 매핑은 ko_braille.json에서 로드 (업데이트된 데이터 사용)
@@ -54,7 +55,7 @@ def news_list(request):
     q = request.GET.get("q","한국 주요 뉴스")
     url = f"https://news.google.com/rss/search?q={urllib.parse.quote(q)}&hl=ko&gl=KR&ceid=KR:ko"
     try:
-        with urllib.request.urlopen(url, timeout=5) as resp:
+        with urllib.request.urlopen(url, timeout=timeout_for(5)) as resp:
             xml = resp.read()
         root = ET.fromstring(xml)
         items=[]
@@ -0,0 +1,259 @@
+"""
+디바이스 WebSocket 채널 (ASGI)
+
+ws://<host>/ws/device/<device_id>/?token=<DEVICE_CHANNEL_TOKEN> 에 연결한 PWA/브릿지로 서버가 점자 프레임을 바로 보냅니다.
+토큰은 ?token= 쿼리 또는 X-Device-Token 헤더로 보내고, 틀리면 4401로 닫습니다
+(settings.DEVICE_CHANNEL_TOKEN이 비어 있으면 DEBUG에서만 토큰 없이 허용).
+HTTP 요청/응답 없이 채팅 키워드, 학습 단계, 뉴스 헤드라인이 준비되는 즉시 페이지 단위로 전송됩니다.
+
+서버 → 디바이스:
+    {"type": "page", "kind": "keywords", "text": "...", "index": 0, "total": 2,
+     "packets": [[cmd, pattern], ...]}
+디바이스 → 서버:
+    {"type": "encode", "text": "..."}                       텍스트 인코딩 요청
+    {"type": "lesson", "mode": "chars", "index": 0}         학습 단계 요청
+    {"type": "timeline", "text": "...", "profile": "normal"} → {"type": "timeline", ...}
+    {"type": "ping"}                                        → {"type": "pong"}
+
+Django channels 없이 단일 프로세스(uvicorn/daphne 워커 1개) 안에서 동작하는 레지스트리입니다.
+동기 뷰(스레드)에서도 publish할 수 있도록 call_soon_threadsafe로 이벤트 루프에 넘깁니다.
+"""
+import asyncio
+import hmac
+import json
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qs
+
+from django.conf import settings
+
+from utils.encode_hangul import text_to_pages
+
+logger = logging.getLogger(__name__)
+
+WS_PATH = re.compile(r"^/ws/device/(?P<device_id>[\w.:-]{1,64})/?$")
+DISPLAY_CELLS = 3
+QUEUE_SIZE = 256  # 세션당 대기 메시지 (가득 차면 오래된 것부터 버림)
+
+# 학습 모드 → (데이터 파일, 출력할 텍스트 필드)
+LESSON_SOURCES = {
+    "chars": ("lesson_chars.json", "char"),
+    "words": ("lesson_words.json", "word"),
+    "sentences": ("lesson_sentences.json", "sentence"),
+    "keywords": ("lesson_keywords.json", "content"),
+}
+
+
+class _Session:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.dropped = 0
+
+    def offer(self, message: dict):
+        """이벤트 루프 스레드에서 호출"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
+_sessions: Dict[str, Set[_Session]] = {}
+_lock = threading.Lock()
+
+
+def _register(device_id: str, session: _Session):
+    with _lock:
+        _sessions.setdefault(device_id, set()).add(session)
+
+
+def _unregister(device_id: str, session: _Session):
+    with _lock:
+        sessions = _sessions.get(device_id)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del _sessions[device_id]
+
+
+def connected_devices() -> List[str]:
+    with _lock:
+        return sorted(_sessions)
+
+
+def publish(device_id: str, message: dict) -> int:
+    """
+    디바이스의 모든 세션에 메시지 전송 (어느 스레드에서나 호출 가능)
+
+    Returns:
+        메시지를 받은 세션 수 (연결이 없으면 0)
+    """
+    with _lock:
+        sessions = list(_sessions.get(device_id, ()))
+    for session in sessions:
+        try:
+            session.loop.call_soon_threadsafe(session.offer, message)
+        except RuntimeError:
+            # 이벤트 루프가 이미 종료됨
+            _unregister(device_id, session)
+    return len(sessions)
+
+
+def page_messages(text: str, kind: str, cells: int = DISPLAY_CELLS, **meta) -> List[dict]:
+    """텍스트를 디스플레이 페이지별 메시지로 인코딩"""
+    pages = text_to_pages(text, cells)
+    return [
+        {
+            "type": "page",
+            "kind": kind,
+            "text": text,
+            "index": index,
+            "total": len(pages),
+            "packets": [list(packet) for packet in packets],
+            **meta,
+        }
+        for index, packets in enumerate(pages)
+    ]
+
+
+def push_text(device_id: Optional[str], text: str, kind: str = "text", **meta) -> int:
+    """
+    텍스트를 페이지 단위 프레임으로 인코딩해 디바이스로 전송
+
+    연결된 세션이 없으면 인코딩하지 않고 0을 반환합니다.
+    """
+    if not device_id or not text:
+        return 0
+    with _lock:
+        if device_id not in _sessions:
+            return 0
+    messages = page_messages(text, kind, **meta)
+    for message in messages:
+        publish(device_id, message)
+    return len(messages)
+
+
+def device_id_from_request(request) -> Optional[str]:
+    """요청에서 디바이스 ID 추출: X-Device-Id 헤더 또는 ?device= 쿼리"""
+    device_id = request.headers.get("X-Device-Id") or request.GET.get("device")
+    return device_id.strip() if device_id else None
+
+
+def lesson_text(mode: str, index: int) -> Optional[str]:
+    source = LESSON_SOURCES.get(mode)
+    if source is None:
+        return None
+    from utils.data_loader import load_json
+
+    filename, field = source
+    data = load_json(filename, {"items": []})
+    items = data if isinstance(data, list) else data.get("items", [])
+    if not 0 <= index < len(items):
+        return None
+    return items[index].get(field)
+
+
+# --- ASGI 핸들러 ---
+
+def _token_from_scope(scope) -> str:
+    """?token= 쿼리 (브라우저 WebSocket은 헤더를 못 붙임) 또는 X-Device-Token 헤더"""
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    if query.get("token"):
+        return query["token"][0]
+    for name, value in scope.get("headers", []):
+        if name.lower() == b"x-device-token":
+            return value.decode("latin-1")
+    return ""
+
+
+def _authorized(scope) -> bool:
+    expected = getattr(settings, "DEVICE_CHANNEL_TOKEN", "")
+    if not expected:
+        # 토큰을 설정하지 않은 배포에서는 열지 않음 (개발 중에만 허용)
+        return settings.DEBUG
+    return hmac.compare_digest(_token_from_scope(scope).encode(), expected.encode())
+
+
+async def _handle_client_message(device_id: str, session: _Session, message: dict):
+    kind = message.get("type")
+    if kind == "ping":
+        session.offer({"type": "pong"})
+    elif kind == "encode":
+        for page in page_messages(str(message.get("text") or ""), "text"):
+            session.offer(page)
+    elif kind == "lesson":
+        mode = message.get("mode", "chars")
+        try:
+            index = int(message.get("index", 0))
+        except (TypeError, ValueError):
+            index = -1
+        text = await asyncio.to_thread(lesson_text, mode, index)  # 데이터 파일 읽기는 이벤트 루프 밖에서
+        if text is None:
+            session.offer({"type": "error", "error": "lesson_not_found", "mode": mode, "index": index})
+            return
+        for page in page_messages(text, "lesson", mode=mode, step=index):
+            session.offer(page)
+    elif kind == "timeline":
+        from utils.braille_timeline import DEFAULT_PROFILE, MAX_TEXT_LENGTH, get_timeline
+
+        text = str(message.get("text") or "")
+        if len(text) > MAX_TEXT_LENGTH:
+            session.offer({"type": "error", "error": "text_too_long"})
+            return
+        try:
+            # 캐시 조회/계산은 블로킹이므로 스레드에서 (이벤트 루프의 다른 소켓을 막지 않도록)
+            timeline = await asyncio.to_thread(get_timeline, text, message.get("profile") or DEFAULT_PROFILE)
+        except ValueError as e:
+            session.offer({"type": "error", "error": str(e)})
+            return
+        session.offer({"type": "timeline", **timeline})
+    else:
+        session.offer({"type": "error", "error": "unknown_message", "received": kind})
+
+
+async def device_socket(scope, receive, send):
+    """ws/device/<device_id>/ WebSocket 엔드포인트"""
+    match = WS_PATH.match(scope.get("path", ""))
+    event = await receive()
+    if event["type"] != "websocket.connect":
+        return
+    if match is None:
+        await send({"type": "websocket.close", "code": 4404})
+        return
+
+    device_id = match.group("device_id")
+    if not _authorized(scope):
+        logger.warning("[DeviceChannel] %s 토큰 불일치로 연결 거부", device_id)
+        await send({"type": "websocket.close", "code": 4401})
+        return
+    session = _Session(asyncio.get_running_loop())
+    _register(device_id, session)
+    await send({"type": "websocket.accept"})
+    logger.info("[DeviceChannel] %s 연결됨", device_id)
+
+    async def sender():
+        while True:
+            message = await session.queue.get()
+            await send({"type": "websocket.send", "text": json.dumps(message, ensure_ascii=False)})
+
+    send_task = asyncio.create_task(sender())
+    try:
+        while True:
+            event = await receive()
+            if event["type"] == "websocket.disconnect":
+                break
+            if event["type"] != "websocket.receive":
+                continue
+            try:
+                message = json.loads(event.get("text") or event.get("bytes") or "{}")
+            except ValueError:
+                session.offer({"type": "error", "error": "invalid_json"})
+                continue
+            if isinstance(message, dict):
+                await _handle_client_message(device_id, session, message)
+    finally:
+        send_task.cancel()
+        _unregister(device_id, session)
+        logger.info("[DeviceChannel] %s 연결 종료", device_id)
@@ -5,5 +5,6 @@ urlpatterns = [
     path("encode/", views.braille_convert, name="braille_encode"),
     path("convert/", views.braille_convert, name="braille_convert"),  # legacy compatibility
     path("packets/", views.braille_packets, name="braille_packets"),  # packets only endpoint
+    path("timeline/", views.braille_timeline, name="braille_timeline"),  # 재생 타임라인
     path("", views.braille_convert, name="braille_convert_root"),  # /api/convert/ 호환
 ]
\ No newline at end of file
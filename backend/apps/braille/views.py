@@ -3,6 +3,9 @@ from django.views.decorators.csrf import csrf_exempt
 import json
 from utils.braille_converter import text_to_cells
 from utils.encode_hangul import text_to_packets
+from utils.braille_timeline import (
+    DEFAULT_PROFILE, MAX_TEXT_LENGTH, SPEED_PROFILES, get_timeline,
+)
 
 @csrf_exempt
 def braille_convert(request):
@@ -80,6 +83,40 @@ def braille_packets(request):
         traceback.print_exc()
         return JsonResponse({"error": str(e)}, status=500)
 
+@csrf_exempt
+def braille_timeline(request):
+    """
+    POST {"text": "...", "profile": "slow|normal|fast", "cells": 3}
+    -> {"frames": [{"index", "at_ms", "dwell_ms", "text", "packets"}, ...], "total_ms": ...}
+    서버에서 계산한 순차 읽기 재생 타임라인 (같은 텍스트/프로필은 캐시 재사용)
+    """
+    try:
+        if request.method == "GET":
+            params = request.GET
+        else:
+            params = json.loads(request.body.decode("utf-8") or "{}")
+
+        text = params.get("text", "")
+        profile = params.get("profile") or DEFAULT_PROFILE
+        try:
+            cells = int(params.get("cells") or 3)
+        except (TypeError, ValueError):
+            cells = 0
+
+        if not text:
+            return JsonResponse({"error": "bad_request", "detail": "text is required"}, status=400)
+        if len(text) > MAX_TEXT_LENGTH:
+            return JsonResponse({"error": "bad_request", "detail": f"text is too long (max {MAX_TEXT_LENGTH})"}, status=400)
+        if profile not in SPEED_PROFILES:
+            return JsonResponse({"error": "bad_request", "detail": f"profile must be one of {sorted(SPEED_PROFILES)}"}, status=400)
+        if not 1 <= cells <= 32:
+            return JsonResponse({"error": "bad_request", "detail": "cells must be 1-32"}, status=400)
+
+        return JsonResponse(get_timeline(text, profile, cells))
+    except Exception as e:
+        print(f"[braille_timeline] Error: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
 @csrf_exempt
 def convert(request):
     """레거시 호환"""
@@ -5,117 +5,237 @@ Provides structured responses with keyword extraction for braille output
 
 import json
 import re
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Any
+from django.conf import settings
 from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
-import google.generativeai as genai
-import os
+import time
+
+from services.answer_store import get_answer_store
+from services.breaker import CircuitOpen
+from services.deadline import Deadline, DeadlineExceeded, timeout_for, wait_for
+from services.json_stream import StreamingJsonParser, parse_json_object
+from services.limiter import Saturated, llm_slot
+from services.prefetch import get_prefetcher
+from services.router import get_router
+from services.singleflight import flight_key, group as singleflight
+from services.usage import get_usage_meter
+
+from apps.braille.channel import device_id_from_request
+from jeomgeuli_backend.middleware import deadline_exceeded_response
+from utils.keywords import extract_keywords
+
+from . import cache as response_cache
+from .prompts import request_prompt, system_prompt, template_for
+from .streaming import BrailleKeywords, sse, sse_response, wants_stream
+from .views import chat_ask, csrf_exempt
+
+
+_TOO_MANY_REQUESTS = "요청이 너무 많습니다. 잠시 후 다시 시도해주세요."
+
+
+def _get_llm():
+    # Same latency-ranked LLM router as the chat endpoints (OpenAI/Gemini + hedge, services.router)
+    return get_router()
 
-# Configure Gemini AI
-genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-model = genai.GenerativeModel('gemini-1.5-flash')
 
 class AIAssistantProcessor:
     """Processes queries for visually impaired users with structured responses"""
-    
-    def __init__(self):
-        self.prompt_template = """
-# 역할
-당신은 시각장애인 친화 모바일 PWA <점글이(Jeomgeuli)>의 정보탐색 어시스턴트입니다.
-대화는 "요약 → (사용자가 요청 시) 자세히"의 2단계로 진행되며,
-항상 핵심 키워드 2~3개를 추출해 점자 출력용으로 제공합니다.
-
-# 데모 모드
-- 실제 검색/크롤링/뉴스 링크가 없어도, 교육용 예시로 그럴듯한 내용을 "안전하고 일반적인 수준"에서 생성합니다.
-- 사실 주장·수치가 필요한 경우는 구체 수치를 피하고, "예시 요약", "일반적 경향"처럼 완곡하게 표현합니다.
-
-# 입력 해석 규칙
-- 사용자가 처음 질문하면 → 무조건 "요약 모드" (불릿 2~5개).
-- 사용자가 "자세히", "더 알려줘", "1번 자세히", "첫 번째 뉴스 자세히" 등 말하면 → "자세히 모드".
-- 사용자가 "키워드 점자 출력", "점자 출력"이라고 말하면 → keywords 3개를 그대로 braille_words에 복제.
-- 명령 예: "오늘의 뉴스", "오늘 날씨 알려줘", "블록체인 설명해줘", "GPT-5가 뭐야?"
-
-# 응답 형식(JSON만)
-반드시 아래 스키마로만 출력합니다. (마크다운 본문은 chat_markdown에)
-
-{{
-  "mode": "summary | detail | qa",
-  "chat_markdown": "모바일 낭독 친화 본문(마크다운 불릿 허용).",
-  "simple_tts": "한 줄 요약(20~40자, 쉬운 말).",
-  "bullets": ["요약1", "요약2", "요약3"],      // summary일 때만
-  "detail": {{                                   // detail일 때만
-    "title": "확장 주제(예: 첫 번째 뉴스)",
-    "sections": [
-      {{"heading":"배경", "text":"2~3문장 단락"}},
-      {{"heading":"핵심 내용", "text":"2~3문장 단락"}},
-      {{"heading":"영향/의미", "text":"2~3문장 단락"}},
-      {{"heading":"추가로 알아두면", "text":"1~2문장"}}
-    ]
-  }},
-  "keywords": ["키워드1","키워드2","키워드3"],   // 1~3글자 선호, 명사 위주
-  "braille_words": ["키워드1","키워드2","키워드3"],
-  "actions": {{
-    "voice_hint": "명령어: '자세히', '다음', '반복', '키워드 점자 출력'",
-    "learn_suggestion": "이 키워드로 학습을 이어가 보세요."
-  }},
-  "meta": {{
-    "note": "데모 응답입니다. 예시/교육 목적."
-  }}
-}}
-
-# 작성 지침
-- 가독성/문해력 배려: 문장 길이 짧게, 전문용어는 쉬운 말로 풀이, 목록 위주.
-- TTS 친화: chat_markdown은 2~4문장(혹은 3~5 불릿), simple_tts는 20~40자로 한 줄.
-- 점자 최적화: keywords 2~3개는 1~3글자 명사 위주(예: 경제, 물가, 정부 / 개념, 원리, 사례).
-- 과도한 장문은 detail 모드에서만. summary에서는 간결하게.
-
-# 모드별 템플릿
-
-## 1) 요약 모드 (summary)
-- 뉴스 요청: 불릿 5개(•로 시작), 각 항목 1문장.
-- 날씨/개념/일반 질문: 불릿 2~4개, 핵심만.
-- simple_tts: 핵심만 쉬운 말로 1줄.
-- keywords: 주제에서 핵심 2~3개(짧은 명사).
-- braille_words = keywords.
-
-## 2) 자세히 모드 (detail)
-- 제목(title)을 명시하고, sections 3~4개를 소제목+단락으로 제공.
-- 각 단락은 2~3문장, 예시 1개 포함 가능.
-- 마지막 단락에 "추가로 알아두면" 1~2문장.
-- simple_tts: 확장 내용의 요지 한 줄.
-- keywords: 확장 주제의 핵심 2~3개(짧은 명사), braille_words = keywords.
-
-## 3) 일반 Q&A(qa)
-- 질문에 대한 직접 답 2~3문장 + 필요한 경우 1~2개 불릿.
-- simple_tts 1줄, keywords 2~3개, braille_words=keywords.
-
-사용자 질문: {query}
-모드: {mode}
-확장 대상(topic): {topic}
-"""
 
-    def process_query(self, query: str, mode: str = "qa", topic: str = "") -> Dict[str, Any]:
-        """Process user query and return structured AI response"""
+    async def process_query(self, query: str, mode: str = "qa", topic: str = "",
+                            client: str = "default") -> Dict[str, Any]:
+        """
+        Process user query and return structured AI response (identical concurrent queries share one call).
+        Detail answers are cached per topic, so a prefetched detail (prefetch_detail) is returned immediately.
+        The model call takes a slot from the shared LLM limiter queued under client; raises Saturated when none is free.
+        """
+        if mode == "detail":
+            subject = topic or query
+            cached = await response_cache.aget_cached("ai_detail", subject)
+            if cached is not None:
+                return cached
+            key = flight_key("ai_assistant", mode, response_cache.normalize_query(subject))
+        else:
+            key = flight_key("ai_assistant", query, mode, topic)
+        return await singleflight.do_async(key, self._process_query, query, mode, topic, client)
+
+    def prefetch_detail(self, query: str, user: str) -> bool:
+        """Speculatively build the detail answer right after a summary was served (CHAT_PREFETCH_DETAIL)"""
+        if not settings.CHAT_PREFETCH_DETAIL or response_cache.ttl_for("ai_detail") <= 0:
+            return False
+        key = flight_key("prefetch_ai_detail", response_cache.normalize_query(query))
+        return get_prefetcher().submit(key, user, self.process_query, query, "detail", query, "prefetch")
+
+    async def prefetched_detail(self, subject: str) -> Optional[Dict[str, Any]]:
+        """Cached detail answer for subject, waiting for an in-flight prefetch_detail job first (like chat_detail)"""
+        cached = await response_cache.aget_cached("ai_detail", subject)
+        if cached is not None:
+            return cached
+        key = flight_key("prefetch_ai_detail", response_cache.normalize_query(subject))
+        if not get_prefetcher().pending(key):
+            return None
+        await get_prefetcher().wait_async(key, timeout=timeout_for(settings.CHAT_PREFETCH_WAIT))
+        return await response_cache.aget_cached("ai_detail", subject)
+
+    async def _process_query(self, query: str, mode: str, topic: str, client: str = "default") -> Dict[str, Any]:
         try:
-            # Create prompt with mode-specific instructions
-            prompt = self.prompt_template.format(query=query, mode=mode, topic=topic)
-            
-            # Get response from Gemini
-            response = model.generate_content(prompt)
-            
-            # Parse JSON response
-            try:
-                ai_response = json.loads(response.text)
-                return self.validate_response(ai_response, mode)
-            except json.JSONDecodeError:
-                # Fallback if JSON parsing fails
-                return self.create_fallback_response(query, mode, response.text)
-                
+            # Static mode prompt goes as the system prompt; only the request lines change per call
+            prompt = request_prompt(query, mode, topic)
+
+            # 서킷 브레이커가 모두 열려 있으면 바로 오류 응답, 요청 마감 시간을 넘기면 DeadlineExceeded (504)
+            async with llm_slot(client):
+                started = time.perf_counter()
+                text = await wait_for(_get_llm().complete(prompt, system=system_prompt(mode)))
+            # The router returns text only, so token counts are estimated
+            get_usage_meter().record(_endpoint(mode), system_prompt(mode) + prompt, text,
+                                     time.perf_counter() - started)
+
+            return await self._finish(query, mode, text, topic=topic)
+
+        except (DeadlineExceeded, Saturated):
+            raise
+        except CircuitOpen:
+            return self.create_error_response(query, mode)
         except Exception as e:
             print(f"AI Assistant error: {e}")
             return self.create_error_response(query, mode)
 
+    async def _finish(self, query: str, mode: str, text: str, data: Optional[Dict[str, Any]] = None,
+                      topic: str = "") -> Dict[str, Any]:
+        # Parse JSON response (code fences / trailing prose allowed); streaming passes the already parsed object
+        if data is None:
+            data = parse_json_object(text)
+        if data is None:
+            # Fallback if JSON parsing fails
+            return self.create_fallback_response(query, mode, text)
+        response = self.validate_response(data, mode)
+        if mode == "detail":
+            await response_cache.aset_cached("ai_detail", topic or query, response)
+        else:
+            self._learn(query, response)
+        return response
+
+    def local_answer(self, query: str, mode: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer frequent questions from the local answer store (services.answer_store) without calling Gemini.
+        Returns None when nothing scores above ANSWER_STORE_MIN_SCORE (detail answers always go to the model).
+        """
+        store = get_answer_store()
+        if mode == "detail" or store is None:
+            return None
+        match = store.lookup(query)
+        if match is None:
+            return None
+        bullets = self.extract_bullets(match.answer)
+        response = self.validate_response({
+            "keywords": match.keywords or self.extract_keywords(match.answer),
+            "chat_markdown": match.answer,
+            "simple_tts": (bullets[0] if bullets else match.answer)[:40],
+            "bullets": bullets,
+        }, mode)
+        response["meta"]["source"] = f"answer_store:{match.source}"
+        return response
+
+    def _learn(self, query: str, response: Dict[str, Any]):
+        # Keep well-formed model answers so similar questions can skip the model next time
+        store = get_answer_store()
+        if store is None:
+            return
+        bullets = response.get("bullets") or []
+        answer = "\n".join(f"• {b}" for b in bullets) if len(bullets) >= 2 else response.get("chat_markdown", "")
+        store.learn(query, answer, response.get("keywords"))
+
+    @staticmethod
+    async def replay(response: Dict[str, Any], device_id: Optional[str] = None) -> AsyncIterator[str]:
+        """Send a finished response with the same SSE events as stream_query"""
+        braille = BrailleKeywords(device_id)
+        for word in response.get("keywords", []):
+            event = braille.add(word)
+            if event:
+                yield event
+        yield sse("simple_tts", {"text": response.get("simple_tts", "")})
+        for index, bullet in enumerate(response.get("bullets") or []):
+            yield sse("bullet", {"index": index, "text": bullet})
+        yield sse("keywords", {"keywords": response.get("keywords", [])[:3]})
+        yield sse("done", response)
+
+    async def stream_query(self, query: str, mode: str = "qa", topic: str = "",
+                           device_id: Optional[str] = None, deadline: Optional[Deadline] = None,
+                           client: str = "default") -> AsyncIterator[str]:
+        """
+        Stream SSE events while the model is still generating:
+        simple_tts / bullet / keywords as soon as each JSON value closes, then done (= process_query result).
+        When the request deadline runs out mid-stream, done carries what arrived so far with "partial": true.
+        No free slot in the shared LLM limiter (queued under client) ends the stream with an error event (429 body).
+        Each keyword is also sent as a braille event (and to the device channel) as soon as its string closes.
+        """
+        prompt = request_prompt(query, mode, topic)
+        parser = StreamingJsonParser()
+        braille = BrailleKeywords(device_id)
+        parts = []
+        expired = False
+        started = time.perf_counter()
+        try:
+            # 공용 LLM 제한기 자리를 쥔 채로 스트림을 끝까지 받음
+            async with llm_slot(client, deadline):
+                chunks = _get_llm().stream(prompt, system=system_prompt(mode)).__aiter__()
+                try:
+                    while True:
+                        try:
+                            text = await wait_for(chunks.__anext__(), deadline=deadline)
+                        except StopAsyncIteration:
+                            break
+                        parts.append(text)
+                        events = []
+                        if parser is not None:
+                            try:
+                                events = parser.feed(text)
+                            except json.JSONDecodeError:  # JSON이 아님 → 끝까지 받아 fallback 응답으로
+                                parser = None
+                        for path, value in events:
+                            for event in self._stream_events(path, value, braille):
+                                yield event
+                        if parser is not None and parser.done:
+                            break  # 객체 뒤 설명 문장은 기다리지 않음
+                finally:
+                    await chunks.aclose()
+        except Saturated as e:
+            yield sse("error", {"error": "too_many_requests", "detail": _TOO_MANY_REQUESTS,
+                                "retry_after": e.retry_after})
+            return
+        except DeadlineExceeded:
+            expired = True
+        except CircuitOpen:
+            yield sse("done", self.create_error_response(query, mode))
+            return
+        except Exception as e:
+            print(f"AI Assistant stream error: {e}")
+            yield sse("done", self.create_error_response(query, mode))
+            return
+        get_usage_meter().record(_endpoint(mode, stream=True), system_prompt(mode) + prompt, "".join(parts),
+                                 time.perf_counter() - started)
+        if expired:
+            if not parts:
+                yield sse("done", self.create_error_response(query, mode))
+                return
+            # Truncated answers are neither cached nor learned
+            yield sse("done", {**self.create_fallback_response(query, mode, "".join(parts)), "partial": True})
+            return
+        data = parser.value if parser is not None and parser.done else None
+        yield sse("done", await self._finish(query, mode, "".join(parts), data, topic=topic))
+
+    @staticmethod
+    def _stream_events(path, value, braille: BrailleKeywords) -> Iterator[str]:
+        if len(path) == 2 and path[0] in ("keywords", "braille_words") and isinstance(value, str):
+            event = braille.add(value)
+            if event:
+                yield event
+        elif len(path) == 2 and path[0] == "bullets" and isinstance(value, str):
+            yield sse("bullet", {"index": path[1], "text": value})
+        elif path == ("simple_tts",) and isinstance(value, str):
+            yield sse("simple_tts", {"text": value})
+        elif path == ("keywords",) and isinstance(value, list):
+            yield sse("keywords", {"keywords": value[:3]})
+
     def validate_response(self, response: Dict[str, Any], mode: str) -> Dict[str, Any]:
         """Validate and clean AI response"""
         # Ensure required fields
@@ -161,19 +281,8 @@ class AIAssistantProcessor:
         return response
 
     def extract_keywords(self, text: str) -> List[str]:
-        """Extract 2-3 key nouns from text (1-3 characters preferred for braille)"""
-        # Extract Korean words
-        words = re.findall(r'[가-힣]{1,3}', text)
-        
-        # Filter meaningful words (avoid particles, common words)
-        meaningful_words = [
-            word for word in words 
-            if len(word) >= 2 and word not in [
-                "것이", "하는", "있는", "되는", "입니다", "하고", "에서", "으로", "에서", "에게"
-            ]
-        ]
-        
-        return list(set(meaningful_words))[:3]  # Remove duplicates and limit to 3
+        """Extract 2-3 key nouns from text (1-3 characters preferred for braille) - utils.keywords"""
+        return extract_keywords(text, limit=3)
 
     def extract_bullets(self, text: str) -> List[str]:
         """Extract bullet points from markdown text"""
@@ -293,10 +402,22 @@ class AIAssistantProcessor:
 # Global processor instance
 processor = AIAssistantProcessor()
 
+def _endpoint(mode: str, stream: bool = False) -> str:
+    """Usage meter key, e.g. ai_assistant.summary / ai_assistant.detail.stream"""
+    return f"ai_assistant.{template_for(mode)}" + (".stream" if stream else "")
+
+async def _then(events: AsyncIterator[str], fn, *args) -> AsyncIterator[str]:
+    """Run fn(*args) after the SSE stream has been fully sent"""
+    async for event in events:
+        yield event
+    fn(*args)
+
 @csrf_exempt
-@require_http_methods(["POST"])
-def ai_assistant_view(request):
+async def ai_assistant_view(request):
     """Handle AI Assistant requests"""
+    if request.method != "POST":
+        return JsonResponse({"error": "method_not_allowed"}, status=405)
+
     try:
         data = json.loads(request.body)
         query = data.get('q', '').strip()
@@ -308,27 +429,52 @@ def ai_assistant_view(request):
                 "error": "질문을 입력해주세요."
             }, status=400)
         
-        # Validate mode
-        if mode not in ['news', 'explain', 'qa']:
+        # Validate mode (detail: "자세히" follow-up, topic = the summarized question)
+        if mode not in ['news', 'explain', 'qa', 'detail']:
             mode = 'qa'
+        topic = (data.get('topic') or '').strip() if mode == 'detail' else ''
+        device_id = device_id_from_request(request)
+        user = device_id or request.META.get("REMOTE_ADDR", "unknown")
         
         # Process with AI Assistant
         if format_type == 'ai_assistant':
-            response = processor.process_query(query, mode)
+            # Frequent questions are answered from the local answer store without a model call
+            local = processor.local_answer(query, mode)
+            if local is not None:
+                if wants_stream(request, data):
+                    return sse_response(processor.replay(local, device_id))
+                return JsonResponse(local)
+            if wants_stream(request, data):
+                if mode == 'detail':
+                    # Replay a prefetched detail answer instead of starting a second model call
+                    cached = await processor.prefetched_detail(topic or query)
+                    if cached is not None:
+                        return sse_response(processor.replay(cached, device_id))
+                events = processor.stream_query(query, mode, topic, device_id=device_id,
+                                                deadline=getattr(request, "deadline", None), client=user)
+                if mode != 'detail':
+                    events = _then(events, processor.prefetch_detail, query, user)
+                return sse_response(events)
+            response = await processor.process_query(query, mode, topic, client=user)
+            if mode != 'detail':
+                processor.prefetch_detail(query, user)
             return JsonResponse(response)
         else:
             # Fallback to regular chat processing
-            from .views import chat_ask
-            return chat_ask(request)
+            return await chat_ask(request)
             
     except json.JSONDecodeError:
         return JsonResponse({
             "error": "잘못된 요청 형식입니다."
         }, status=400)
+    except Saturated as e:
+        response = JsonResponse({"error": _TOO_MANY_REQUESTS}, status=429)
+        response["Retry-After"] = str(max(1, round(e.retry_after)))
+        return response
+    except DeadlineExceeded as e:
+        return deadline_exceeded_response(e)
     except Exception as e:
         print(f"AI Assistant view error: {e}")
         return JsonResponse({
             "error": "서버 오류가 발생했습니다."
         }, status=500)
-
-
@@ -5,3 +5,8 @@ class ChatConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.chat'
     verbose_name = 'AI 채팅'
+
+    def ready(self):
+        # 공용 LLM 클라이언트 설정 다시 읽기: kill -HUP <pid>
+        from services.clients import install_reload_signal
+        install_reload_signal()
@@ -0,0 +1,122 @@
+"""
+chat_ask / chat_detail 응답 캐시
+
+같은 짧은 질문("오늘 뉴스", "날씨 알려줘")이 하루에도 여러 번 들어오므로
+모드 + 정규화된 질문을 키로 LLM 응답을 Django 캐시에 TTL 동안 보관합니다.
+
+정규화: NFC → 소문자 → 구두점 제거 (기호와 C#의 #은 유지) → 공백 하나로 축약
+TTL 설정: settings.CHAT_CACHE_TTL (환경변수 CHAT_CACHE_TTL_ASK / CHAT_CACHE_TTL_DETAIL, 초 단위, 0이면 캐시 안 함)
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_VERSION = 2  # 정규화 규칙이 바뀌면 올림
+DEFAULT_TTLS = {
+    "ask": 60 * 10,
+    "detail": 60 * 60,
+    "ai_detail": 60 * 60,
+}
+STATS_KEY = "chat:cache:stats:{mode}:{result}"
+
+_SPACES = re.compile(r"\s+")
+
+
+def _is_punctuation(text: str, i: int) -> bool:
+    # 기호(+, $, ℃ 등)는 의미가 있으므로 남기고, 글자 바로 뒤의 #도 남김 ("C++ 배우기"와 "C# 배우기"는 다른 질문)
+    if unicodedata.category(text[i])[0] != "P":
+        return False
+    return not (text[i] == "#" and i > 0 and text[i - 1].isalnum())
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 질문 정규화 (NFC, 소문자, 구두점 제거, 공백 축약)"""
+    text = unicodedata.normalize("NFC", query or "").lower()
+    text = "".join(" " if _is_punctuation(text, i) else ch for i, ch in enumerate(text))
+    return _SPACES.sub(" ", text).strip()
+
+
+def ttl_for(mode: str) -> int:
+    ttls = getattr(settings, "CHAT_CACHE_TTL", {})
+    return int(ttls.get(mode, DEFAULT_TTLS.get(mode, 0)))
+
+
+def cache_key(mode: str, query: str) -> str:
+    digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+    return f"chat:v{CACHE_VERSION}:{mode}:{digest}"
+
+
+def _count(mode: str, result: str):
+    key = STATS_KEY.format(mode=mode, result=result)
+    # add는 키가 없을 때만 0으로 만들고, incr는 여러 프로세스에서도 원자적으로 증가
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_cached(mode: str, query: str) -> Optional[dict]:
+    """캐시된 응답 반환 (없으면 None). 히트/미스 카운트"""
+    if ttl_for(mode) <= 0 or not normalize_query(query):
+        return None
+    value = cache.get(cache_key(mode, query))
+    _count(mode, "hit" if value is not None else "miss")
+    return value
+
+
+def set_cached(mode: str, query: str, response: dict):
+    ttl = ttl_for(mode)
+    if ttl > 0 and normalize_query(query):
+        cache.set(cache_key(mode, query), response, ttl)
+
+
+async def _acount(mode: str, result: str):
+    key = STATS_KEY.format(mode=mode, result=result)
+    await cache.aadd(key, 0, None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, None)
+
+
+async def aget_cached(mode: str, query: str) -> Optional[dict]:
+    """get_cached의 async 버전 (async 뷰용)"""
+    if ttl_for(mode) <= 0 or not normalize_query(query):
+        return None
+    value = await cache.aget(cache_key(mode, query))
+    await _acount(mode, "hit" if value is not None else "miss")
+    return value
+
+
+async def ahas_cached(mode: str, query: str) -> bool:
+    """히트/미스 통계에 세지 않고 캐시 여부만 확인 (미리 만들기용)"""
+    if ttl_for(mode) <= 0 or not normalize_query(query):
+        return False
+    return await cache.ahas_key(cache_key(mode, query))
+
+
+async def aset_cached(mode: str, query: str, response: dict):
+    ttl = ttl_for(mode)
+    if ttl > 0 and normalize_query(query):
+        await cache.aset(cache_key(mode, query), response, ttl)
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """모드별 히트/미스 수와 히트율"""
+    result = {}
+    for mode in DEFAULT_TTLS:
+        hits = cache.get(STATS_KEY.format(mode=mode, result="hit"), 0)
+        misses = cache.get(STATS_KEY.format(mode=mode, result="miss"), 0)
+        total = hits + misses
+        result[mode] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "ttl": ttl_for(mode),
+        }
+    return result
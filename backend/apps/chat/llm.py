@@ -1,12 +1,20 @@
-import os, time, threading
-import google.generativeai as genai
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from google.api_core.exceptions import DeadlineExceeded, ServiceUnavailable
+import time
 
-MODEL_NAME = os.environ.get("GEMINI_MODEL", "gemini-1.5-flash")  # 필요시 pro로 교체
+from services.answer_store import get_answer_store
+from services.breaker import CircuitOpen
+from services.clients import _env_float, call_outbound
+from services.conversation import get_conversation_store, local_summary
+from services.deadline import DeadlineExceeded as RequestDeadlineExceeded, timeout_for, wait_for
+from services.limiter import Saturated, get_limiter
+from services.router import get_router
+from services.singleflight import flight_key, group as singleflight
+from services.usage import get_usage_meter
 
 class TransientError(RuntimeError): ...
-class RateLimitError(RuntimeError): ...
+class RateLimitError(RuntimeError):
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after  # 초 (429 Retry-After)
 
 SYSTEM_PROMPT = (
     "당신은 한국어로 답하는 유용한 도우미입니다. "
@@ -15,28 +23,9 @@ SYSTEM_PROMPT = (
     "답변은 불필요한 사족 없이 5~8줄 이내로 간결하게 작성하세요."
 )
 
-def _get_api_key():
-    key = os.environ.get("GOOGLE_API_KEY")
-    if not key:
-        raise RuntimeError("GOOGLE_API_KEY가 설정되지 않았습니다(.env 또는 환경변수 확인).")
-    return key
-
-def _get_model():
-    genai.configure(api_key=_get_api_key())
-    return genai.GenerativeModel(
-        MODEL_NAME,
-        system_instruction=SYSTEM_PROMPT,
-        safety_settings={
-            # 필요 시 정책 맞게 조정
-            "HARASSMENT": "BLOCK_ONLY_HIGH",
-            "HATE": "BLOCK_ONLY_HIGH",
-        },
-        generation_config={
-            "temperature": 0.7,
-            "top_p": 0.9,
-            "max_output_tokens": 512,
-        },
-    )
+def _get_llm():
+    # 챗 엔드포인트와 같은 LLM 라우터 (OpenAI/Gemini 중 빠른 쪽 + hedge, services.router). 키가 없으면 RuntimeError
+    return get_router()
 
 def explain_gemini_error(e: Exception) -> str:
     msg = str(e)
@@ -47,52 +36,105 @@ def explain_gemini_error(e: Exception) -> str:
         return "요청이 너무 많습니다. 잠시 후 다시 시도해주세요."
     if "Invalid resource name" in msg or "model not found" in msg.lower():
         return "모델 이름이 잘못되었거나 접근 권한이 없습니다."
-    if "GOOGLE_API_KEY" in msg or "not set" in msg.lower():
-        return "서버에 GOOGLE_API_KEY가 없습니다. .env/환경변수를 설정하고 서버를 재시작하세요."
+    if "API 키 미설정" in msg or "GOOGLE_API_KEY" in msg or "not set" in msg.lower():
+        return "서버에 LLM API 키(OPENAI_API_KEY 또는 GEMINI_API_KEY)가 없습니다. .env/환경변수를 설정하고 서버를 재시작하세요."
     return f"LLM 처리 중 오류: {msg}"
 
-# 🔒 429(레이트리밋)은 재시도 금지. 네트워크/서버 불안정(503/timeout)만 재시도.
-@retry(
-  reraise=True,
-  stop=stop_after_attempt(2),
-  wait=wait_exponential(multiplier=1, max=8),
-  retry=retry_if_exception_type((DeadlineExceeded, ServiceUnavailable, TimeoutError))
-)
-def generate_reply(query: str, history: list[dict] | None = None) -> str:
-    """
-    history 예시: [{"role":"user","content":"..."},{"role":"assistant","content":"..."}]
-    """
-    # ⏳ 프로세스 내 소프트 레이트리밋(버스트 방지)
-    _MIN_GAP = float(os.getenv("LLM_MIN_GAP_SEC", "0.8"))  # 호출 최소 간격(초)
-    if not hasattr(generate_reply, "_gate"):
-        generate_reply._gate = {"ts": 0.0, "lock": threading.Lock()}
-    with generate_reply._gate["lock"]:
-        now = time.time()
-        wait = generate_reply._gate["ts"] + _MIN_GAP - now
-        if wait > 0:
-            time.sleep(wait)
-        generate_reply._gate["ts"] = time.time()
-    
-    # 키/모델 준비 실패 시 즉시 예외 (재시도 없음)
-    model = _get_model()
-    # Gemini의 멀티턴 대화 포맷으로 변환
-    chat_history = []
+# LLM 호출 timeout (초). 요청 마감 시간(services.deadline)이 있으면 남은 시간으로 줄어듦
+LLM_TIMEOUT = _env_float("LLM_TIMEOUT", 30.0)
+
+def _history_prompt(query: str, history: list[dict] | None) -> str:
+    """대화 이력 + 질문을 프롬프트 하나로 (라우터는 제공자와 상관없이 텍스트 한 덩어리를 받음)"""
+    lines = []
     for m in (history or []):
-        role = "user" if m.get("role") == "user" else "model"
-        chat_history.append({"role": role, "parts": [m.get("content", "")]})
+        speaker = "사용자" if m.get("role") == "user" else "도우미"
+        lines.append(f"{speaker}: {m.get('content', '')}")
+    if not lines:
+        return query
+    return "이전 대화:\n" + "\n".join(lines) + f"\n\n사용자: {query}"
 
-    chat = model.start_chat(history=chat_history)
+# 제공자 장애/느린 응답은 라우터가 다른 제공자로 넘기므로(failover + hedge) 여기서는 재시도하지 않음
+def _generate_reply(query: str, history: list[dict] | None = None, client: str | None = None) -> str:
+    # 키 미설정 시 즉시 예외
+    try:
+        llm = _get_llm()
+    except RuntimeError as e:
+        raise RuntimeError(explain_gemini_error(e))
+    prompt = _history_prompt(query, history)
+    started = time.perf_counter()
     try:
-        resp = chat.send_message(query)
+        if not llm.ranked():
+            # 모든 제공자가 장애 중이면 대기열에도 들어가지 않고 바로 실패
+            raise CircuitOpen("llm", min(p.breaker.stats()["retry_after"] for p in llm.providers))
+        # ⏳ 프로세스 공용 LLM 호출 제한 (토큰 버킷 + 최대 동시 호출 수 + 클라이언트별 공정 대기열, async 뷰와 공유)
+        limiter = get_limiter()
+        with limiter.acquire(client or "default", timeout=timeout_for(limiter.max_wait)):
+            text = call_outbound(wait_for(llm.complete(prompt, system=SYSTEM_PROMPT), cap=timeout_for(LLM_TIMEOUT)))
+    except CircuitOpen as e:
+        raise TransientError(f"LLM 서비스가 일시적으로 불안정합니다. {e.retry_after:.0f}초 후 다시 시도해주세요.")
+    except Saturated as e:
+        raise RateLimitError("요청이 너무 많습니다. 잠시 후 다시 시도해주세요.", retry_after=e.retry_after)
+    except RequestDeadlineExceeded:
+        raise
     except Exception as e:
         # 예외를 그대로 사람이 읽는 RuntimeError 메시지로 변환
         raise RuntimeError(explain_gemini_error(e))
-    
-    # resp.text가 없으면 candidates/parts에서 수동 추출
-    text = getattr(resp, "text", None)
-    if not text:
-        try:
-            text = resp.candidates[0].content.parts[0].text  # type: ignore
-        except Exception:
-            text = ""
+
+    text = text or ""
+    # 엔드포인트별 토큰/지연 집계 (라우터는 텍스트만 돌려주므로 이력+질문 길이로 추정)
+    get_usage_meter().record("generate_reply", SYSTEM_PROMPT + "\n" + prompt, text, time.perf_counter() - started)
     return text.strip()
+
+SUMMARY_PROMPT = (
+    "다음은 사용자와 도우미의 이전 대화입니다. 이후 대화에 필요한 사실, 사용자의 관심사와 요청을 "
+    "한국어 3~5문장으로 요약하세요. 요약만 출력하세요."
+)
+
+def summarize_turns(summary: str, turns: list[dict]) -> str:
+    """대화 저장소 압축용 요약 (LLM 라우터, 실패하면 로컬 요약)"""
+    lines = [f"이전 요약: {summary}"] if summary else []
+    for m in turns:
+        speaker = "사용자" if m.get("role") == "user" else "도우미"
+        lines.append(f"{speaker}: {m.get('content', '')}")
+    try:
+        llm = _get_llm()
+        limiter = get_limiter()
+        with limiter.acquire("conversation-summary", timeout=timeout_for(limiter.max_wait)):
+            text = call_outbound(wait_for(llm.complete("\n".join(lines), system=SUMMARY_PROMPT),
+                                          cap=timeout_for(LLM_TIMEOUT)))
+        text = (text or "").strip()
+    except Exception as e:
+        print(f"[LLM] 대화 요약 실패, 로컬 요약 사용: {explain_gemini_error(e)}")
+        text = ""
+    return text or local_summary(summary, turns)
+
+def generate_reply(query: str, history: list[dict] | None = None, client: str | None = None,
+                   session_id: str | None = None) -> str:
+    """
+    history 예시: [{"role":"user","content":"..."},{"role":"assistant","content":"..."}]
+    client: 공정 대기열에서 쓰는 호출자 식별자(IP 등)
+    session_id: 주면 대화 이력을 서버(services.conversation)에서 관리합니다. history는 새 세션의 시작 이력으로만
+        쓰이고, 이후에는 최근 턴 + 오래된 턴 요약만 보내므로 대화가 길어져도 프롬프트 크기가 일정합니다.
+    같은 질문+대화 이력의 동시 호출은 진행 중인 LLM 호출 하나를 공유합니다.
+    자주 묻는 질문은 로컬 답변 저장소(services.answer_store)에서 LLM 호출 없이 답합니다.
+    호출 제한기가 포화 상태면 RateLimitError(retry_after=초)를 바로 던집니다.
+    """
+    answers = get_answer_store()
+    store = None
+    if session_id:
+        store = get_conversation_store(summarizer=summarize_turns)
+        if history and not store.has(session_id):
+            store.seed(session_id, history)
+        history = store.history(session_id)
+    # 저장된 답변은 이전 대화와 상관없이 만든 것이므로 이어지는 대화에는 쓰지 않음 (learn과 같은 조건)
+    match = answers.lookup(query) if answers is not None and not history else None
+    if match is not None:
+        reply = match.answer
+    else:
+        key = flight_key("generate_reply", query, history or [])
+        reply = singleflight.do(key, _generate_reply, query, history, client)
+        if answers is not None and not history:
+            answers.learn(query, reply)  # 이전 대화에 기대지 않는 답변만
+    if store is not None:
+        store.append(session_id, query, reply)
+    return reply
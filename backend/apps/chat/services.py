@@ -1,16 +1,20 @@
-import os
-import google.generativeai as genai
-from django.conf import settings
+from services.clients import call_outbound
+from services.deadline import wait_for
+from services.json_stream import parse_json_object
+from services.router import get_router
 
 
 class GeminiService:
+    # Calls go through the shared LLM router (services.router); model comes from OPENAI_MODEL / GEMINI_MODEL
     def __init__(self):
-        api_key = settings.GEMINI_API_KEY
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
-        
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        try:
+            self.llm = get_router()
+        except RuntimeError as e:
+            raise ValueError(str(e))
+
+    def _generate(self, prompt):
+        # Blocking call for sync callers; open breakers raise CircuitOpen right away (→ fallback)
+        return call_outbound(wait_for(self.llm.complete(prompt), cap=30))
     
     def generate_news_response(self, query):
         """Generate news summary response with 5 cards"""
@@ -42,17 +46,17 @@ class GeminiService:
         """
         
         try:
-            response = self.model.generate_content(prompt)
+            text = self._generate(prompt)  # 장애 중에는 바로 폴백
             # -----------------------------------------------------------
-            # DEBUG: Print the raw response from Gemini
+            # DEBUG: Print the raw response from the LLM
             # -----------------------------------------------------------
             print("-----------------------------------------")
-            print(f"Prompt sent to Gemini: {prompt[:200]}...")
-            print(f"Raw response text: {response.text}")
+            print(f"Prompt sent to LLM: {prompt[:200]}...")
+            print(f"Raw response text: {text}")
             print("-----------------------------------------")
             
             # Parse the response and return structured data
-            return self._parse_news_response(response.text, query)
+            return self._parse_news_response(text, query)
         except Exception as e:
             print(f"Error in generate_news_response: {e}")
             return self._get_fallback_news_response(query)
@@ -83,8 +87,7 @@ class GeminiService:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            return self._parse_explain_response(response.text, query)
+            return self._parse_explain_response(self._generate(prompt), query)  # 장애 중에는 바로 폴백
         except Exception as e:
             return self._get_fallback_explain_response(query)
     
@@ -105,56 +108,32 @@ class GeminiService:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            return self._parse_qa_response(response.text, query)
+            return self._parse_qa_response(self._generate(prompt), query)  # 장애 중에는 바로 폴백
         except Exception as e:
             return self._get_fallback_qa_response(query)
     
     def _parse_news_response(self, response_text, query):
         """Parse news response from Gemini"""
-        try:
-            # Extract JSON from response
-            import json
-            import re
-            
-            # Find JSON in the response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-                return data
-        except:
-            pass
+        data = parse_json_object(response_text)
+        if data is not None:
+            return data
         
         # Fallback parsing
         return self._get_fallback_news_response(query)
     
     def _parse_explain_response(self, response_text, query):
         """Parse explain response from Gemini"""
-        try:
-            import json
-            import re
-            
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-                return data
-        except:
-            pass
+        data = parse_json_object(response_text)
+        if data is not None:
+            return data
         
         return self._get_fallback_explain_response(query)
     
     def _parse_qa_response(self, response_text, query):
         """Parse Q&A response from Gemini"""
-        try:
-            import json
-            import re
-            
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-                return data
-        except:
-            pass
+        data = parse_json_object(response_text)
+        if data is not None:
+            return data
         
         return self._get_fallback_qa_response(query)
     
@@ -0,0 +1,145 @@
+"""
+채팅 응답 SSE 스트리밍 (토큰 스트림 → 구조화 이벤트)
+
+LLM 답변이 다 생성되기를 기다리지 않고 파싱되는 즉시 이벤트로 보내, TTS가 첫 불릿부터 읽기 시작할 수 있게 합니다.
+
+    event: bullet      {"index": 0, "text": "..."}      완성된 답변 줄 (불릿 기호 제거)
+    event: simple_tts  {"text": "..."}                  쉬운 말 요약 (ai_assistant)
+    event: braille     {"index": 0, "word": "...", "pages": [[[cmd, pattern], ...], ...]}
+                       키워드 하나가 완성되는 즉시 (같은 페이지가 디바이스 채널로도 전송됨)
+    event: keywords    {"keywords": ["...", ...]}
+    event: done        최종 응답 (스트리밍이 아닐 때의 JSON 응답과 같은 형태)
+    event: error       {"error": "...", "detail": "..."}
+"""
+import json
+import re
+from typing import AsyncIterator, List, Optional, Tuple
+
+from django.http import StreamingHttpResponse
+
+from apps.braille.channel import DISPLAY_CELLS, push_text
+from utils.encode_hangul import text_to_pages
+
+KEYWORD_LABEL = "키워드:"
+_BULLET = re.compile(r"^\s*(?:[•·]|[-*](?=\s)|\d+[.)])\s*")
+
+Event = Tuple[str, dict]
+
+
+def sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events) -> StreamingHttpResponse:
+    """events: SSE 문자열의 (async) iterator"""
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx 프록시 버퍼링 끔
+    return response
+
+
+def wants_stream(request, body: Optional[dict] = None) -> bool:
+    """?stream=1 또는 요청 본문의 "stream": true"""
+    if request.GET.get("stream") in ("1", "true"):
+        return True
+    return bool(body and body.get("stream") is True)
+
+
+def parse_keywords(text: str) -> List[str]:
+    return [kw.strip() for kw in text.split(",") if kw.strip()]
+
+
+class AnswerLineParser:
+    """
+    '• 불릿' 줄들 + 마지막 '키워드: a, b, c' 형태의 답변을 줄 단위로 파싱
+
+    feed()에 토큰 조각을 넣으면 새로 완성된 줄의 이벤트를 돌려줍니다. 마지막 줄은 close()에서 처리합니다.
+    키워드 줄은 줄이 끝나기 전에도 쉼표로 끝난 키워드마다 ("keyword", {"index", "word"})를 먼저 돌려줍니다.
+    """
+
+    def __init__(self, max_keywords: int = 3):
+        self.max_keywords = max_keywords
+        self._buffer = ""
+        self._answer_lines: List[str] = []
+        self.bullets = 0
+        self.keywords: List[str] = []
+        self._words: List[str] = []  # keyword 이벤트로 보낸 키워드
+
+    def feed(self, delta: str) -> List[Event]:
+        self._buffer += delta
+        *lines, self._buffer = self._buffer.split("\n")
+        events = []
+        for line in lines:
+            events.extend(self._line(line))
+        if KEYWORD_LABEL in self._buffer:
+            # 마지막 항목은 아직 쓰는 중일 수 있음
+            *done, _ = self._buffer.rpartition(KEYWORD_LABEL)[2].replace("*", "").split(",")
+            events.extend(self._new_words(parse_keywords(",".join(done))))
+        return events
+
+    def close(self) -> List[Event]:
+        line, self._buffer = self._buffer, ""
+        return self._line(line) if line else []
+
+    def _line(self, line: str) -> List[Event]:
+        if KEYWORD_LABEL in line:
+            before, _, after = line.rpartition(KEYWORD_LABEL)
+            self.keywords = parse_keywords(after.replace("*", ""))[:self.max_keywords]
+            events = self._line(before) if before.strip(" *") else []
+            return events + self._new_words(self.keywords) + [("keywords", {"keywords": self.keywords})]
+        self._answer_lines.append(line)
+        text = _BULLET.sub("", line).replace("**", "").strip()
+        if not text:
+            return []
+        event = ("bullet", {"index": self.bullets, "text": text})
+        self.bullets += 1
+        return [event]
+
+    def _new_words(self, words: List[str]) -> List[Event]:
+        events = []
+        for word in words:
+            if word not in self._words and len(self._words) < self.max_keywords:
+                self._words.append(word)
+                events.append(("keyword", {"index": len(self._words) - 1, "word": word}))
+        return events
+
+    @property
+    def answer(self) -> str:
+        return "\n".join(self._answer_lines).strip()
+
+
+class BrailleKeywords:
+    """
+    완성된 키워드를 바로 점자 페이지로 인코딩해 SSE braille 이벤트로 만들고 디바이스 채널에도 전송
+    (답변 생성이 끝나기 전에 점자 출력을 시작하기 위함)
+    """
+
+    def __init__(self, device_id: Optional[str] = None, limit: int = 3):
+        self.device_id = device_id
+        self.limit = limit
+        self.words: List[str] = []
+
+    def add(self, word: str) -> Optional[str]:
+        word = (word or "").strip()
+        if not word or word in self.words or len(self.words) >= self.limit:
+            return None
+        index = len(self.words)
+        self.words.append(word)
+        push_text(self.device_id, word, kind="keyword", index=index)
+        pages = text_to_pages(word, DISPLAY_CELLS)
+        return sse("braille", {"index": index, "word": word,
+                               "pages": [[list(packet) for packet in page] for page in pages]})
+
+
+async def replay(result: dict) -> AsyncIterator[str]:
+    """완성된(캐시된) 응답을 같은 이벤트 순서로 전송"""
+    parser = AnswerLineParser()
+    for event, data in parser.feed(result.get("answer", "")) + parser.close():
+        yield sse(event, data)
+    braille = BrailleKeywords()  # 디바이스 전송은 호출 측에서 (캐시 히트 시 한 번에)
+    for word in result.get("keywords", []):
+        event = braille.add(word)
+        if event:
+            yield event
+    yield sse("keywords", {"keywords": result.get("keywords", [])})
+    yield sse("done", result)
@@ -1,49 +1,278 @@
 # apps/chat/views.py
-import os, json, time, requests
+import asyncio, html, os, json, re, time
+import httpx
+from django.conf import settings
 from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-
-# --- 레이트리밋(그대로) ---
-_LAST = {}
-def _ok_rate(ip: str, interval=1.0):
-    now = time.time()
-    last = _LAST.get(ip, 0)
-    if now - last < interval:
-        return False
-    _LAST[ip] = now
-    return True
-
-def _get_openai_client():
-    # 안전장치: .env 파일 자동 탐색 및 로드
-    from dotenv import load_dotenv, find_dotenv
-    load_dotenv(find_dotenv(), override=True, encoding="utf-8")
-    
-    try:
-        from openai import OpenAI
-    except Exception as e:
-        raise RuntimeError(f"OpenAI SDK(v1+) 필요: {e}")
-    
-    key = os.getenv("OPENAI_API_KEY")
-    
-    # 확인 코드 추가 (로깅)
-    import logging
-    logging.warning("OPENAI_API_KEY prefix: %s", (key[:10] if key else "NONE"))
-    
-    if not key:
-        raise RuntimeError("OPENAI_API_KEY 미설정")
-    return OpenAI(api_key=key)
+
+from apps.braille.channel import device_id_from_request, push_text
+from services.ai import summarize_many
+from services.answer_store import get_answer_store
+from services.clients import get_async_http_client, run_outbound
+from services.prefetch import get_prefetcher
+from services.breaker import CircuitOpen
+from services.deadline import DeadlineExceeded, timeout_for, wait_for
+from services.limiter import Saturated, get_limiter, llm_slot
+from services.ratelimit import get_rate_limiter
+from services.router import get_router
+from services.singleflight import flight_key, group as singleflight
+from services.usage import get_usage_meter
+from utils.keywords import extract_keywords
+from jeomgeuli_backend.middleware import deadline_exceeded_response
+
+from . import cache as response_cache
+from .streaming import AnswerLineParser, BrailleKeywords, replay, sse, sse_response, wants_stream
+
+# --- 레이트리밋 (services.ratelimit, 라우트별 정책은 settings.RATE_LIMITS) ---
+async def _rate_limited(request, route: str):
+    """한도 초과면 429 응답 (Retry-After 포함), 아니면 None"""
+    decision = await get_rate_limiter().acheck(route, request.META.get("REMOTE_ADDR", "unknown"))
+    if decision.allowed:
+        return None
+    return _too_many_requests(decision.retry_after)
+
+def _too_many_requests(retry_after):
+    response = JsonResponse({"error":"too_many_requests","detail":"잠시 후 다시 시도해주세요."}, status=429)
+    response["Retry-After"] = str(max(1, round(retry_after)))
+    return response
+
+def _client_id(request):
+    """LLM 호출 제한기(services.limiter)의 대기열 구분용: 디바이스 ID, 없으면 IP"""
+    return device_id_from_request(request) or request.META.get("REMOTE_ADDR", "unknown")
+
+def csrf_exempt(view_func):
+    """
+    async 뷰도 그대로 두는 csrf_exempt (Django 4.2의 csrf_exempt는 sync 래퍼를 씌워
+    async 뷰가 스레드에서 코루틴을 반환하게 됨)
+    """
+    view_func.csrf_exempt = True
+    return view_func
+
+def _get_llm():
+    # 지연 시간 기반 LLM 라우터 (OpenAI/Gemini 중 빠른 쪽 + hedge, services.router)
+    # 설정 변경은 services.clients.reload_config()
+    return get_router()
+
+async def _complete(llm, prompt, kind="chat", client="default"):
+    # 프로세스 공용 LLM 호출 제한기: 자리를 못 받으면 Saturated (뷰에서 429)
+    async with llm_slot(client):
+        started = time.perf_counter()
+        # 요청 마감 시간(RequestDeadline)까지 남은 시간 안에 끝나지 않으면 취소 + DeadlineExceeded
+        answer = await wait_for(llm.complete(prompt))
+    # 엔드포인트별 토큰/지연 집계 (라우터는 텍스트만 돌려주므로 추정치)
+    get_usage_meter().record(kind, prompt, answer, time.perf_counter() - started)
+    return answer
+
+async def _complete_shared(llm, kind, query, prompt, client="default"):
+    """같은 질문의 동시 요청은 진행 중인 LLM 호출 하나를 공유 (single-flight, 제한기 자리도 하나만 씀)"""
+    key = flight_key(kind, response_cache.normalize_query(query))
+    return await singleflight.do_async(key, _complete, llm, prompt, kind, client)
+
+def _unavailable(err: CircuitOpen):
+    """제공자 브레이커가 모두 열림: LLM 호출 없이 바로 503 (Retry-After)"""
+    response = JsonResponse({"error": "llm_unavailable", "detail": "AI 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요.",
+                             "retry_after": round(err.retry_after, 1)}, status=503)
+    response["Retry-After"] = str(max(1, round(err.retry_after)))
+    return response
+
+# 스트림 모드에서는 키워드를 답변보다 먼저 받아 점자 출력을 바로 시작
+_KEYWORDS_LAST = '답변 후에 핵심 키워드 3개를 추출해서 "키워드: 키워드1, 키워드2, 키워드3" 형태로 끝에 추가해주세요.'
+_KEYWORDS_FIRST = '답변보다 먼저, 핵심 키워드 3개를 "키워드: 키워드1, 키워드2, 키워드3" 형태로 첫 줄에 써주세요.'
+
+def _keyword_instruction(stream: bool) -> str:
+    """CHAT_KEYWORDS_SOURCE=local이면 LLM에 키워드를 요청하지 않음 (답변에서 로컬 추출)"""
+    if getattr(settings, "CHAT_KEYWORDS_SOURCE", "llm") == "local":
+        return ""
+    return _KEYWORDS_FIRST if stream else _KEYWORDS_LAST
+
+def _local_keywords(query, answer):
+    """LLM이 키워드를 주지 않았을 때 답변(+질문 가중)에서 추출"""
+    return extract_keywords(answer, limit=3, boost=query)
+
+def _push_keywords(request, keywords):
+    """디바이스 채널이 연결돼 있으면 키워드를 점자 페이지로 바로 전송"""
+    if keywords:
+        push_text(device_id_from_request(request), " ".join(keywords), kind="keywords")
+
+def _learn_answer(query, result):
+    """품질이 괜찮은 LLM 답변을 로컬 답변 저장소에 기록 (비슷한 질문은 다음부터 LLM 없이)"""
+    store = get_answer_store()
+    if store is not None:
+        store.learn(query, result.get("answer", ""), result.get("keywords"))
 
 # --- 헬스 체크들 ---
 def health(_request):
     return JsonResponse({"ok": True})
 
 def llm_health(_request):
-    # LLM 연결상태 간단 점검(키 유무만 확인)
-    has_key = bool(os.getenv("OPENAI_API_KEY"))
-    return JsonResponse({"ok": has_key, "provider": "openai", "model": "gpt-4o-mini"})
+    # LLM 연결상태 간단 점검(키 유무만 확인) + 제공자별 지연 시간 + 응답 캐시 히트율
+    try:
+        router = get_router()
+    except RuntimeError:
+        return JsonResponse({"ok": False, "provider": None, "model": None, "cache": response_cache.stats()})
+    ranked = router.ranked()  # 브레이커가 모두 열려 있으면 비어 있음
+    store = get_answer_store()
+    primary = ranked[0] if ranked else None
+    return JsonResponse({"ok": primary is not None,
+                         "provider": primary and primary.name, "model": primary and primary.model,
+                         "router": router.stats(), "cache": response_cache.stats(),
+                         "prefetch": get_prefetcher().stats(), "usage": get_usage_meter().stats(),
+                         "limiter": get_limiter().stats(),
+                         "answer_store": store.stats() if store is not None else None})
+
+async def _cached_response(request, mode, query, stream=False):
+    """캐시 히트면 JsonResponse(또는 SSE, X-Cache: HIT), 아니면 None"""
+    cached = await response_cache.aget_cached(mode, query)
+    if cached is None:
+        return None
+    _push_keywords(request, cached.get("keywords"))
+    response = sse_response(replay(cached)) if stream else JsonResponse(cached)
+    response["X-Cache"] = "HIT"
+    return response
+
+async def _local_answer(request, query, stream=False):
+    """
+    로컬 답변 저장소(services.answer_store)에 충분히 비슷한 질문이 있으면 LLM 없이 응답
+    (X-Answer-Store: curated | learned), 없으면 None
+    """
+    store = get_answer_store()
+    match = store.lookup(query) if store is not None else None
+    if match is None:
+        return None
+    result = {"answer": match.answer, "keywords": match.keywords or _local_keywords(query, match.answer)}
+    _push_keywords(request, result["keywords"])
+    response = sse_response(replay(result)) if stream else JsonResponse(result)
+    response["X-Answer-Store"] = match.source
+    return response
+
+async def _stream_answer(request, llm, kind, mode, query, prompt, **extra):
+    """
+    LLM 토큰 스트림을 bullet/braille/keywords 이벤트로 바로 전송 (stream 모드)
+    키워드는 하나씩 완성되는 즉시 점자 페이지로 인코딩해 braille 이벤트 + 디바이스 채널로 전송
+    끝나면 JSON 응답과 같은 형태로 done 이벤트 + 캐시 저장
+    """
+    parser = AnswerLineParser()
+    braille = BrailleKeywords(device_id_from_request(request))
+    started = time.perf_counter()
+    # 스트림 본문은 미들웨어가 끝난 뒤 만들어지므로 request.deadline을 직접 씀
+    deadline = getattr(request, "deadline", None)
+    partial = False
+
+    def events(parsed):
+        for event, data in parsed:
+            if event == "keyword":
+                message = braille.add(data["word"])
+                if message:
+                    yield message
+            else:
+                yield sse(event, data)
+
+    try:
+        async with llm_slot(_client_id(request), deadline):
+            chunks = llm.stream(prompt).__aiter__()
+            try:
+                while True:
+                    try:
+                        delta = await wait_for(chunks.__anext__(), deadline=deadline)
+                    except StopAsyncIteration:
+                        break
+                    for message in events(parser.feed(delta)):
+                        yield message
+            finally:
+                await chunks.aclose()
+    except Saturated as e:
+        yield sse("error", {"error": "too_many_requests", "detail": "잠시 후 다시 시도해주세요.",
+                            "retry_after": e.retry_after})
+        return
+    except DeadlineExceeded as e:
+        # 마감 시간까지 받은 부분만 done으로 보냄 (받은 것이 없으면 오류)
+        if not parser.answer.strip():
+            yield sse("error", {"error": "deadline_exceeded", "detail": str(e)})
+            return
+        partial = True
+    except CircuitOpen as e:
+        yield sse("error", {"error": "llm_unavailable", "detail": str(e), "retry_after": round(e.retry_after, 1)})
+        return
+    except Exception as e:
+        yield sse("error", {"error": f"{kind}_failed", "detail": str(e)})
+        return
+    for message in events(parser.close()):
+        yield message
+
+    get_usage_meter().record(f"{kind}.stream", prompt, parser.answer, time.perf_counter() - started)
+
+    if not parser.keywords:
+        keywords = _local_keywords(query, parser.answer)
+        for word in keywords:
+            message = braille.add(word)
+            if message:
+                yield message
+        yield sse("keywords", {"keywords": keywords})
+    else:
+        keywords = parser.keywords
+
+    result = {"answer": parser.answer, "keywords": keywords, **extra}
+    if partial:
+        # 잘린 답변은 캐시/학습하지 않음
+        yield sse("done", {**result, "partial": True})
+        return
+    await response_cache.aset_cached(mode, query, result)
+    if mode == "ask":
+        _learn_answer(query, result)
+        _schedule_detail_prefetch(request, query)
+    yield sse("done", result)
+
+def _detail_prompt(topic, stream=False):
+    """자세한 설명을 위한 프롬프트"""
+    return f""""{topic}"에 대해 자세하고 구체적으로 설명해주세요. 
+
+다음 내용을 포함해주세요:
+- 기본 개념과 정의
+- 주요 특징과 원리
+- 실제 활용 사례나 예시
+- 관련된 중요 정보
+
+{_keyword_instruction(stream)}"""
+
+async def _generate_detail(llm, topic, client="prefetch"):
+    """chat_detail 답변 생성 + 캐시 저장 ("자세히" 미리 만들기에서도 사용)"""
+    answer = await _complete_shared(llm, "chat_detail", topic, _detail_prompt(topic), client)
+    
+    # 키워드 추출
+    keywords = []
+    if "키워드:" in answer:
+        keyword_part = answer.split("키워드:")[-1].strip()
+        keywords = [kw.strip() for kw in keyword_part.split(",") if kw.strip()]
+        answer = answer.split("키워드:")[0].strip()
+    
+    result = {
+        "answer": answer,
+        "keywords": keywords[:3] or _local_keywords(topic, answer),
+        "mode": "detail"
+    }
+    await response_cache.aset_cached("detail", topic, result)
+    return result
+
+# --- "자세히" 미리 만들기 (services.prefetch) ---
+def _prefetch_key(topic):
+    return flight_key("prefetch_detail", response_cache.normalize_query(topic))
+
+async def _prefetch_detail(topic):
+    if await response_cache.ahas_cached("detail", topic):
+        return
+    await _generate_detail(_get_llm(), topic)
+
+def _schedule_detail_prefetch(request, topic):
+    """
+    요약 응답을 보낸 뒤 같은 주제의 chat_detail 답변을 백그라운드에서 만들어 캐시에 저장
+    (CHAT_PREFETCH_DETAIL=1일 때만, 사용자/전체 동시 작업 수 제한 - services/prefetch.py)
+    """
+    if not settings.CHAT_PREFETCH_DETAIL or response_cache.ttl_for("detail") <= 0:
+        return
+    user = _client_id(request)
+    get_prefetcher().submit(_prefetch_key(topic), user, _prefetch_detail, topic)
 
 @csrf_exempt
-def news_summary(request):
+async def news_summary(request):
     try:
         if request.method == "POST":
             try:
@@ -62,19 +291,18 @@ def news_summary(request):
         
         # OpenAI를 사용한 뉴스 요약
         try:
-            client = _get_openai_client()
+            llm = _get_llm()
             prompt = f"'{q}'에 대한 최신 뉴스를 5개 항목으로 요약해주세요. 각 항목은 제목과 간단한 설명을 포함해주세요."
             
-            resp = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            answer = resp.choices[0].message.content
+            answer = await _complete_shared(llm, "news_summary", q, prompt, _client_id(request))
             # 간단한 파싱 (실제로는 더 정교한 파싱이 필요할 수 있음)
             items = [{"title": line.strip(), "summary": ""} for line in answer.split('\n') if line.strip()]
             
             return JsonResponse({"ok": True, "items": items, "q": q, "answer": answer})
+        except Saturated as e:
+            return _too_many_requests(e.retry_after)
+        except DeadlineExceeded as e:
+            return deadline_exceeded_response(e)
         except Exception as e:
             return JsonResponse({"ok": False, "error": str(e), "items": [], "q": q})
             
@@ -83,28 +311,44 @@ def news_summary(request):
 
 # --- 실제 챗 엔드포인트 ---
 @csrf_exempt
-def chat_ask(request):
+async def chat_ask(request):
     if request.method != "POST":
         return JsonResponse({"error": "method_not_allowed"}, status=405)
 
-    ip = request.META.get("REMOTE_ADDR", "unknown")
-    if not _ok_rate(ip):
-        return JsonResponse({"error":"too_many_requests","detail":"잠시 후 다시 시도해주세요."}, status=429)
-
     try:
         body = json.loads(request.body.decode("utf-8"))
         user_query = (body.get("query") or body.get("q") or "").strip()
         if not user_query:
             return JsonResponse({"error":"bad_request","detail":"query or q is required"}, status=400)
 
+        stream = wants_stream(request, body)
+
+        # 같은 질문은 LLM 호출 없이 캐시에서 (레이트리밋 대상 아님)
+        cached = await _cached_response(request, "ask", user_query, stream)
+        if cached is not None:
+            _schedule_detail_prefetch(request, user_query)
+            return cached
+
+        # 자주 묻는 질문은 로컬 답변 저장소에서 (LLM 호출 없음, 레이트리밋 대상 아님)
+        local = await _local_answer(request, user_query, stream)
+        if local is not None:
+            return local
+
+        limited = await _rate_limited(request, "chat_ask")
+        if limited is not None:
+            return limited
+
         try:
-            client = _get_openai_client()
+            llm = _get_llm()
         except Exception as cfg_err:
-            # 개발 환경에서는 API 키 없이도 목업 응답 제공
-            return JsonResponse({
+            # 개발 환경에서는 API 키 없이도 목업 응답 제공 (키워드는 질문에서 로컬 추출)
+            keywords = extract_keywords(user_query) or ["개발", "모드", "테스트"]
+            _push_keywords(request, keywords)
+            result = {
                 "answer": f"'{user_query}'에 대한 답변입니다. (개발 모드 - OpenAI API 키가 설정되지 않음)\n\n• 첫 번째 핵심 내용\n• 두 번째 핵심 내용\n• 세 번째 핵심 내용",
-                "keywords": ["개발", "모드", "테스트"]
-            })
+                "keywords": keywords
+            }
+            return sse_response(replay(result)) if stream else JsonResponse(result)
 
         # 불릿 요약 + 키워드 추출을 위한 프롬프트 수정
         enhanced_prompt = f"""다음 질문에 대해 불릿 포인트 형태로 답변해주세요: {user_query}
@@ -114,13 +358,12 @@ def chat_ask(request):
 • 두 번째 핵심 내용  
 • 세 번째 핵심 내용
 
-답변 후에 핵심 키워드 3개를 추출해서 "키워드: 키워드1, 키워드2, 키워드3" 형태로 끝에 추가해주세요."""
+{_keyword_instruction(stream)}"""
 
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",   # 필요시 gpt-4o 등으로 변경
-            messages=[{"role": "user", "content": enhanced_prompt}]
-        )
-        answer = resp.choices[0].message.content
+        if stream:
+            return sse_response(_stream_answer(request, llm, "chat_ask", "ask", user_query, enhanced_prompt))
+
+        answer = await _complete_shared(llm, "chat_ask", user_query, enhanced_prompt, _client_id(request))  # 모델은 OPENAI_MODEL / GEMINI_MODEL
         
         # 키워드 추출
         keywords = []
@@ -133,76 +376,81 @@ def chat_ask(request):
             except:
                 pass
         
-        return JsonResponse({
+        result = {
             "answer": answer,
-            "keywords": keywords[:3]  # 최대 3개 키워드
-        })
+            "keywords": keywords[:3] or _local_keywords(user_query, answer)  # 최대 3개 키워드
+        }
+        await response_cache.aset_cached("ask", user_query, result)
+        _learn_answer(user_query, result)
+        _push_keywords(request, result["keywords"])
+        _schedule_detail_prefetch(request, user_query)
+        return JsonResponse(result)
 
+    except CircuitOpen as e:
+        return _unavailable(e)
+    except Saturated as e:
+        return _too_many_requests(e.retry_after)
+    except DeadlineExceeded as e:
+        return deadline_exceeded_response(e)
     except Exception as e:
         return JsonResponse({"error":"chat_ask_failed","detail":str(e)}, status=500)
 
 
 @csrf_exempt
-def chat_detail(request):
+async def chat_detail(request):
     """자세한 설명 모드"""
     if request.method != "POST":
         return JsonResponse({"error": "method_not_allowed"}, status=405)
 
-    ip = request.META.get("REMOTE_ADDR", "unknown")
-    if not _ok_rate(ip):
-        return JsonResponse({"error":"too_many_requests","detail":"잠시 후 다시 시도해주세요."}, status=429)
-
     try:
         body = json.loads(request.body.decode("utf-8"))
         topic = (body.get("topic") or "").strip()
         if not topic:
             return JsonResponse({"error":"bad_request","detail":"topic is required"}, status=400)
 
+        stream = wants_stream(request, body)
+        cached = await _cached_response(request, "detail", topic, stream)
+        if cached is not None:
+            return cached
+
+        # 요약 뒤 미리 만들기가 진행 중이면 LLM을 다시 부르지 않고 끝나기를 기다렸다가 캐시에서
+        prefetch_key = _prefetch_key(topic)
+        if get_prefetcher().pending(prefetch_key):
+            await get_prefetcher().wait_async(prefetch_key, timeout=timeout_for(settings.CHAT_PREFETCH_WAIT))
+            cached = await _cached_response(request, "detail", topic, stream)
+            if cached is not None:
+                return cached
+
+        limited = await _rate_limited(request, "chat_detail")
+        if limited is not None:
+            return limited
+
         try:
-            client = _get_openai_client()
+            llm = _get_llm()
         except Exception as cfg_err:
             return JsonResponse({"error":"config_error","detail":str(cfg_err)}, status=503)
 
-        # 자세한 설명을 위한 프롬프트
-        detail_prompt = f""""{topic}"에 대해 자세하고 구체적으로 설명해주세요. 
+        if stream:
+            return sse_response(_stream_answer(request, llm, "chat_detail", "detail", topic,
+                                               _detail_prompt(topic, stream), mode="detail"))
 
-다음 내용을 포함해주세요:
-- 기본 개념과 정의
-- 주요 특징과 원리
-- 실제 활용 사례나 예시
-- 관련된 중요 정보
-
-답변 후에 핵심 키워드 3개를 추출해서 "키워드: 키워드1, 키워드2, 키워드3" 형태로 끝에 추가해주세요."""
-
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": detail_prompt}]
-        )
-        answer = resp.choices[0].message.content
-        
-        # 키워드 추출
-        keywords = []
-        if "키워드:" in answer:
-            try:
-                keyword_part = answer.split("키워드:")[-1].strip()
-                keywords = [kw.strip() for kw in keyword_part.split(",") if kw.strip()]
-                answer = answer.split("키워드:")[0].strip()
-            except:
-                pass
-        
-        return JsonResponse({
-            "answer": answer,
-            "keywords": keywords[:3],
-            "mode": "detail"
-        })
+        result = await _generate_detail(llm, topic, _client_id(request))
+        _push_keywords(request, result["keywords"])
+        return JsonResponse(result)
 
+    except CircuitOpen as e:
+        return _unavailable(e)
+    except Saturated as e:
+        return _too_many_requests(e.retry_after)
+    except DeadlineExceeded as e:
+        return deadline_exceeded_response(e)
     except Exception as e:
         return JsonResponse({"error":"chat_detail_failed","detail":str(e)}, status=500)
 
 
 # --- 네이버 뉴스 API 프록시 ---
 @csrf_exempt
-def naver_news(request):
+async def naver_news(request):
     """
     네이버 뉴스 API 프록시
     GET /api/news?q=검색어&display=10&start=1&sort=sim
@@ -211,10 +459,6 @@ def naver_news(request):
         return JsonResponse({"error": "method_not_allowed"}, status=405)
     
     try:
-        # .env 강제 로드
-        from dotenv import load_dotenv, find_dotenv
-        load_dotenv(find_dotenv(), override=True, encoding="utf-8")
-        
         # 네이버 API 키 확인
         client_id = os.getenv("NAVER_CLIENT_ID")
         client_secret = os.getenv("NAVER_CLIENT_SECRET")
@@ -248,7 +492,8 @@ def naver_news(request):
         }
         
         # 네이버 API 호출
-        response = requests.get(naver_url, headers=headers, params=params, timeout=10)
+        call = get_async_http_client().get(naver_url, headers=headers, params=params, timeout=timeout_for(10))
+        response = await run_outbound(call)  # 연결 풀이 있는 전용 루프에서 (services.clients)
         
         if response.status_code == 200:
             # 네이버 API 응답을 그대로 반환
@@ -260,12 +505,14 @@ def naver_news(request):
                 "naver_response": response.text
             }, status=response.status_code)
             
-    except requests.exceptions.Timeout:
+    except DeadlineExceeded as e:
+        return deadline_exceeded_response(e)
+    except httpx.TimeoutException:
         return JsonResponse({
             "error": "timeout",
             "detail": "네이버 API 호출 시간 초과"
         }, status=504)
-    except requests.exceptions.RequestException as e:
+    except httpx.RequestError as e:
         return JsonResponse({
             "error": "network_error",
             "detail": f"네트워크 오류: {str(e)}"
@@ -278,29 +525,118 @@ def naver_news(request):
 
 
 # --- 정보탐색 모드: GPT + 네이버 뉴스 통합 ---
+_TIMED_OUT = object()
+
+async def _fan_out(calls, deadline):
+    """
+    calls({이름: 코루틴})를 동시에 실행하고 끝나는 순서대로 (이름, 결과)를 내보냄
+
+    deadline(초)이 지나면 남은 호출은 취소하고 (이름, _TIMED_OUT)을 내보냅니다.
+    """
+    loop = asyncio.get_running_loop()
+    names = {asyncio.ensure_future(coro): name for name, coro in calls.items()}
+    pending = set(names)
+    end = loop.time() + deadline
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=max(0.0, end - loop.time()),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                # 공유(single-flight) 호출의 leader가 취소된 경우도 시간 초과로 처리
+                yield names[task], _TIMED_OUT if task.cancelled() else task.result()
+        for task in pending:
+            task.cancel()
+        for task in pending:
+            yield names[task], _TIMED_OUT
+    finally:
+        # 스트리밍 중 클라이언트가 끊긴 경우
+        for task in pending:
+            task.cancel()
+
+async def _explore_answer(query, client="default"):
+    try:
+        llm = _get_llm()
+        return await _complete_shared(llm, "explore", query, f"'{query}'에 대해 간결하고 정확하게 설명해주세요.", client)
+    except Exception as e:
+        return f"GPT 답변 생성 중 오류가 발생했습니다: {str(e)}"
+
+async def _explore_news(query, client_id, client_secret):
+    try:
+        naver_url = "https://openapi.naver.com/v1/search/news.json"
+        headers = {
+            'X-Naver-Client-Id': client_id,
+            'X-Naver-Client-Secret': client_secret
+        }
+        params = {
+            'query': query,
+            'display': 5,
+            'sort': 'sim'
+        }
+
+        call = get_async_http_client().get(naver_url, headers=headers, params=params, timeout=timeout_for(10))
+        news_response = await run_outbound(call)  # 연결 풀이 있는 전용 루프에서 (services.clients)
+
+        if news_response.status_code == 200:
+            return news_response.json().get("items", [])
+        return []
+
+    except Exception as e:
+        print(f"네이버 뉴스 API 오류: {e}")
+        return []
+
+_TAGS = re.compile(r"<[^>]+>")
+
+def _news_text(item):
+    """네이버 뉴스 항목의 제목 + 설명 (<b> 강조 태그, HTML 엔티티 제거)"""
+    text = f"{item.get('title', '')}\n{item.get('description', '')}"
+    return html.unescape(_TAGS.sub("", text)).strip()
+
+async def _with_digests(news):
+    """
+    뉴스 항목마다 digest(summary/bullets/keywords) 추가 (summarize=1)
+    기사 여러 개를 services.ai.summarize_many로 한 번에 배치 요약 (동기 함수라 스레드에서, 마감 시간은 그대로)
+    """
+    items = await news
+    if not items:
+        return items
+    digests = await asyncio.to_thread(summarize_many, [_news_text(item) for item in items])
+    return [{**item, "digest": digest} for item, digest in zip(items, digests)]
+
+async def _explore_events(calls, deadline):
+    """stream 모드: 먼저 끝난 결과부터 SSE 이벤트로 전송"""
+    async for name, value in _fan_out(calls, deadline):
+        if value is _TIMED_OUT:
+            yield f"event: timeout\ndata: {name}\n\n"
+            continue
+        yield f"event: {name}\ndata: {json.dumps(value, ensure_ascii=False)}\n\n"
+    yield "event: done\ndata: [END]\n\n"
+
 @csrf_exempt
-def explore(request):
+async def explore(request):
     """
     정보탐색 모드: GPT 답변 + 네이버 뉴스 검색 결과 통합
-    GET /api/explore?q=검색어
+    GET /api/explore?q=검색어[&stream=1]
+
+    GPT와 네이버 뉴스를 동시에 호출하고 settings.EXPLORE_DEADLINE(초)과 요청 마감 시간 중 짧은 쪽 안에 끝난 결과만 반환합니다.
+    시간 초과된 항목은 "timed_out"에 표시됩니다. stream=1이면 결과가 도착하는 대로 SSE로 보냅니다.
+    summarize=1이면 뉴스 항목마다 요약(digest)을 붙여 보냅니다 (요약까지 끝나야 news 결과가 도착).
     """
     if request.method != "GET":
         return JsonResponse({"error": "method_not_allowed"}, status=405)
     
     try:
-        # .env 강제 로드
-        from dotenv import load_dotenv, find_dotenv
-        load_dotenv(find_dotenv(), override=True, encoding="utf-8")
-        
-        # API 키 확인
-        openai_key = os.getenv("OPENAI_API_KEY")
+        # API 키 확인 (LLM은 라우터에 등록된 제공자가 하나라도 있으면 됨: OpenAI 또는 Gemini)
         naver_client_id = os.getenv("NAVER_CLIENT_ID")
         naver_client_secret = os.getenv("NAVER_CLIENT_SECRET")
         
-        if not openai_key:
+        try:
+            _get_llm()
+        except RuntimeError as cfg_err:
             return JsonResponse({
-                "error": "openai_key_not_set",
-                "detail": "OPENAI_API_KEY가 설정되지 않았습니다."
+                "error": "llm_not_configured",
+                "detail": str(cfg_err)
             }, status=503)
         
         if not naver_client_id or not naver_client_secret:
@@ -313,53 +649,41 @@ def explore(request):
         query = request.GET.get('q', '오늘 뉴스').strip()
         if not query:
             return JsonResponse({"error": "query_required", "detail": "검색어(q)가 필요합니다."}, status=400)
-        
-        # 1) OpenAI GPT 호출
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=openai_key)
-            
-            gpt_response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": f"'{query}'에 대해 간결하고 정확하게 설명해주세요."}]
-            )
-            gpt_answer = gpt_response.choices[0].message.content
-        except Exception as e:
-            gpt_answer = f"GPT 답변 생성 중 오류가 발생했습니다: {str(e)}"
-        
-        # 2) 네이버 뉴스 API 호출
-        try:
-            naver_url = "https://openapi.naver.com/v1/search/news.json"
-            headers = {
-                'X-Naver-Client-Id': naver_client_id,
-                'X-Naver-Client-Secret': naver_client_secret
-            }
-            params = {
-                'query': query,
-                'display': 5,
-                'sort': 'sim'
-            }
-            
-            news_response = requests.get(naver_url, headers=headers, params=params, timeout=10)
-            
-            if news_response.status_code == 200:
-                news_data = news_response.json()
-                news_items = news_data.get("items", [])
-            else:
-                news_items = []
-                
-        except Exception as e:
-            news_items = []
-            print(f"네이버 뉴스 API 오류: {e}")
+
+        deadline = timeout_for(float(getattr(settings, "EXPLORE_DEADLINE", 8.0)))
+        # 1) OpenAI GPT, 2) 네이버 뉴스 API 동시 호출
+        news = _explore_news(query, naver_client_id, naver_client_secret)
+        if request.GET.get("summarize") in ("1", "true"):
+            news = _with_digests(news)
+        calls = {
+            "answer": _explore_answer(query, _client_id(request)),
+            "news": news,
+        }
+
+        if request.GET.get("stream") in ("1", "true"):
+            return sse_response(_explore_events(calls, deadline))
+
+        results = {}
+        async for name, value in _fan_out(calls, deadline):
+            results[name] = value
+        timed_out = [name for name, value in results.items() if value is _TIMED_OUT]
+
+        gpt_answer = results["answer"]
+        if gpt_answer is _TIMED_OUT:
+            gpt_answer = "GPT 답변 시간이 초과되었습니다."
+        news_items = [] if results["news"] is _TIMED_OUT else results["news"]
         
         # 3) 결과 통합 반환
         return JsonResponse({
             "answer": gpt_answer,
             "news": news_items,
             "query": query,
+            "timed_out": sorted(timed_out),
             "timestamp": time.time()
         })
-        
+
+    except DeadlineExceeded as e:
+        return deadline_exceeded_response(e)
     except Exception as e:
         return JsonResponse({
             "error": "explore_failed",
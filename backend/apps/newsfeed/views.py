@@ -1,29 +1,42 @@
 import feedparser
+import requests
 from django.http import JsonResponse
 
+from apps.braille.channel import device_id_from_request, push_text
+from services.deadline import timeout_for
+
+
+def _push_headlines(request, items):
+    """디바이스 채널이 연결돼 있으면 헤드라인을 점자 페이지로 바로 전송"""
+    device_id = device_id_from_request(request)
+    for index, item in enumerate(items):
+        push_text(device_id, item.get("title", ""), kind="headline", item=index)
+
 def news_feed(request):
     """뉴스 피드 - 간단한 목업"""
-    return JsonResponse({
-        "items": [
-            {"title": "샘플 뉴스 1", "summary": "샘플 요약 1", "url": "#"},
-            {"title": "샘플 뉴스 2", "summary": "샘플 요약 2", "url": "#"}
-        ]
-    })
+    items = [
+        {"title": "샘플 뉴스 1", "summary": "샘플 요약 1", "url": "#"},
+        {"title": "샘플 뉴스 2", "summary": "샘플 요약 2", "url": "#"}
+    ]
+    _push_headlines(request, items)
+    return JsonResponse({"items": items})
 
 def news_cards(request):
     """뉴스 카드 - 간단한 목업"""
-    return JsonResponse({
-        "cards": [
-            {"title": "샘플 카드 1", "summary": "샘플 요약 1", "url": "#"},
-            {"title": "샘플 카드 2", "summary": "샘플 요약 2", "url": "#"}
-        ]
-    })
+    cards = [
+        {"title": "샘플 카드 1", "summary": "샘플 요약 1", "url": "#"},
+        {"title": "샘플 카드 2", "summary": "샘플 요약 2", "url": "#"}
+    ]
+    _push_headlines(request, cards)
+    return JsonResponse({"cards": cards})
 
 def headlines(request):
     """레거시 호환"""
     url = "https://news.google.com/rss?hl=ko&gl=KR&ceid=KR:ko"
     try:
-        d = feedparser.parse(url)
+        # feedparser는 timeout이 없어 먼저 요청 마감 시간 안에서 받아 온 뒤 파싱
+        r = requests.get(url, timeout=timeout_for(6)); r.raise_for_status()
+        d = feedparser.parse(r.content)
         items = []
         for e in d.entries[:5]:
             items.append({
@@ -31,6 +44,7 @@ def headlines(request):
                 "summary": (e.summary if hasattr(e, "summary") else "")[:160],
                 "url": e.link
             })
+        _push_headlines(request, items)
         return JsonResponse({"items": items})
     except:
         return news_feed(request)
@@ -4,6 +4,8 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from dotenv import load_dotenv
 
+from services.deadline import timeout_for
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -38,7 +40,7 @@ def search_news(request):
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = requests.get(url, headers=headers, params=params, timeout=timeout_for(10))
         response.raise_for_status()
         data = response.json()
         return JsonResponse({"ok": True, "data": data})
@@ -69,7 +71,7 @@ def news(request):
     # Google News RSS → json 변환
     url = "https://news.google.com/rss?hl=ko&gl=KR&ceid=KR:ko"
     try:
-        r = requests.get(url, timeout=6)
+        r = requests.get(url, timeout=timeout_for(6))
         r.raise_for_status()
         import xml.etree.ElementTree as ET
         root = ET.fromstring(r.text)
@@ -88,7 +90,7 @@ def weather(request):
     lat = request.GET.get("lat","37.5665"); lon = request.GET.get("lon","126.9780")
     url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
     try:
-        r = requests.get(url, timeout=6); r.raise_for_status()
+        r = requests.get(url, timeout=timeout_for(6)); r.raise_for_status()
         return JsonResponse(r.json())
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
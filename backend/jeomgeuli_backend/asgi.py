@@ -9,4 +9,15 @@ load_dotenv(BASE_DIR / ".env", encoding='utf-8')
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Django 설정 이후에 import (utils.* 가 settings를 참조)
+from apps.braille.channel import device_socket
+
+
+async def application(scope, receive, send):
+    """HTTP는 Django로, /ws/device/<id>/ WebSocket은 디바이스 채널로 전달"""
+    if scope["type"] == "websocket":
+        await device_socket(scope, receive, send)
+        return
+    await django_application(scope, receive, send)
@@ -1,8 +1,57 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
 from django.http import JsonResponse
+from django.urls import Resolver404, resolve
 from django.utils.deprecation import MiddlewareMixin
 
+from services.deadline import Deadline, DeadlineExceeded, scope
+
 class ApiNotFoundJson(MiddlewareMixin):
     def process_response(self, request, response):
         if request.path.startswith("/api/") and response.status_code == 404:
             return JsonResponse({"error": "Not Found", "path": request.path}, status=404)
         return response
+
+def deadline_exceeded_response(err: DeadlineExceeded):
+    """마감 시간 안에 돌려줄 결과가 하나도 없을 때: 504"""
+    return JsonResponse({"error": "deadline_exceeded", "detail": str(err), "budget": err.budget}, status=504)
+
+class RequestDeadline:
+    """
+    요청마다 라우트별 마감 시간(settings.REQUEST_DEADLINES[url_name], 없으면 REQUEST_DEADLINE_DEFAULT)으로
+    Deadline을 만들어 request.deadline과 services.deadline.current()에 둠 (나가는 호출은 남은 시간만 씀)
+    뷰가 처리하지 않은 DeadlineExceeded는 504 JSON으로 바꿈
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def budget_for(path: str) -> float:
+        try:
+            name = resolve(path).url_name
+        except Resolver404:
+            name = None
+        return float(settings.REQUEST_DEADLINES.get(name, settings.REQUEST_DEADLINE_DEFAULT))
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request.deadline = Deadline(self.budget_for(request.path_info))
+        with scope(request.deadline):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        request.deadline = Deadline(self.budget_for(request.path_info))
+        with scope(request.deadline):
+            return await self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, DeadlineExceeded):
+            return deadline_exceeded_response(exception)
+        return None
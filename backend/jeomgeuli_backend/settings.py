@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "jeomgeuli_backend.middleware.RequestDeadline",
     "jeomgeuli_backend.middleware.ApiNotFoundJson",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -154,4 +155,54 @@ if "CACHES" not in globals():
             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
             "LOCATION": "jeomgeuli-cache",
         }
-    }
\ No newline at end of file
+    }
+
+# chat_ask / chat_detail 응답 캐시 TTL (초, 0이면 캐시 안 함) - apps/chat/cache.py
+CHAT_CACHE_TTL = {
+    "ask": int(os.getenv("CHAT_CACHE_TTL_ASK", "600")),
+    "detail": int(os.getenv("CHAT_CACHE_TTL_DETAIL", "3600")),
+    "ai_detail": int(os.getenv("CHAT_CACHE_TTL_DETAIL", "3600")),  # ai_assistant 자세히 모드
+}
+
+# 점자 키워드 출처: llm (답변과 함께 "키워드: ..." 요청) / local (요청하지 않고 utils/keywords.py로 추출)
+CHAT_KEYWORDS_SOURCE = os.getenv("CHAT_KEYWORDS_SOURCE", "llm")
+
+# 요약(chat_ask, ai_assistant) 응답 뒤 "자세히" 답변을 백그라운드에서 미리 생성해 캐시 - services/prefetch.py
+CHAT_PREFETCH_DETAIL = os.getenv("CHAT_PREFETCH_DETAIL", "0").lower() in ("1", "true", "yes")
+# 미리 만들기가 진행 중일 때 chat_detail이 기다리는 최대 시간 (초)
+CHAT_PREFETCH_WAIT = float(os.getenv("CHAT_PREFETCH_WAIT", "15"))
+
+# 디바이스 WebSocket 채널(/ws/device/<id>/) 접속 토큰 - apps/braille/channel.py
+# ?token= 또는 X-Device-Token 헤더로 전달. 비어 있으면 DEBUG에서만 토큰 없이 접속 허용
+DEVICE_CHANNEL_TOKEN = os.getenv("DEVICE_CHANNEL_TOKEN", "")
+
+# 정보탐색(explore) GPT + 네이버 뉴스 동시 호출의 공용 마감 시간 (초) - apps/chat/views.py::explore
+EXPLORE_DEADLINE = float(os.getenv("EXPLORE_DEADLINE", "8"))
+
+# 라우트(url name)별 요청 전체 마감 시간 (초) - services/deadline.py, jeomgeuli_backend/middleware.py::RequestDeadline
+# 나가는 HTTP/LLM 호출은 고정 timeout 대신 남은 시간만 씀. 환경변수 REQUEST_DEADLINE_<URL_NAME>으로 라우트별 변경
+REQUEST_DEADLINE_DEFAULT = float(os.getenv("REQUEST_DEADLINE_DEFAULT", "30"))
+REQUEST_DEADLINES = {
+    name: float(os.getenv(f"REQUEST_DEADLINE_{name.upper()}", default))
+    for name, default in {
+        "chat_ask": "20",
+        "chat_detail": "30",
+        "news_summary": "20",
+        "naver_news": "10",
+        "explore": "10",
+        "search_news": "10",
+        "google_news": "8",
+        "weather": "8",
+    }.items()
+}
+
+# 라우트별 레이트리밋: (초당 요청 수, 순간 허용량), 클라이언트 IP 단위 - services/ratelimit.py
+RATE_LIMITS = {
+    "default": (1.0, 1),
+    "chat_ask": (float(os.getenv("RATE_LIMIT_CHAT_ASK", "1")), int(os.getenv("RATE_LIMIT_CHAT_ASK_BURST", "1"))),
+    "chat_detail": (float(os.getenv("RATE_LIMIT_CHAT_DETAIL", "1")), int(os.getenv("RATE_LIMIT_CHAT_DETAIL_BURST", "1"))),
+}
+# memory: 프로세스별 LRU / sqlite: 워커들이 로컬 SQLite 파일로 한도 공유
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", str(BASE_DIR / "ratelimit.sqlite3"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
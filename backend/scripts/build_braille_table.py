@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+라즈베리파이 브릿지용 점자 테이블 빌드 스크립트
+- utils.encode_hangul의 매핑을 Django 없이 쓸 수 있는 JSON으로 컴파일
+- 결과: raspberrypi/braille_table.json (ko_braille.json 수정 후 다시 실행)
+
+사용법:
+    python scripts/build_braille_table.py [출력 경로]
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# 현재 스크립트의 부모 디렉토리 (backend)를 Python 경로에 추가
+script_dir = Path(__file__).parent
+backend_dir = script_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+DEFAULT_OUTPUT = backend_dir.parent / "raspberrypi" / "braille_table.json"
+
+
+def main():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+    import django
+    django.setup()
+
+    from utils.encode_hangul import compile_table
+
+    output = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_OUTPUT
+    table = compile_table()
+    if not table:
+        print("❌ 점자 매핑(ko_braille.json)을 불러오지 못했습니다.")
+        sys.exit(1)
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, separators=(",", ":"))
+        f.write("\n")
+
+    print(f"✅ 점자 테이블 생성 완료: {output}")
+    print(f"   직접 매핑 문자 {len(table['chars'])}개, 버전 {table['version']}")
+
+
+if __name__ == "__main__":
+    main()
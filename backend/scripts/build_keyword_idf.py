@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+키워드 추출용 문서 빈도표 빌드 스크립트
+- 저장소에 있는 한국어 글(문서 문단, 큐레이션 답변, 학습/복습 문장)을 말뭉치로 utils.keywords.build_idf() 실행
+- 결과: data/keyword_idf.json (말뭉치나 utils/keywords.py의 조사/어미 규칙을 바꾼 뒤 다시 실행)
+
+사용법:
+    python scripts/build_keyword_idf.py [추가 텍스트 파일 ...]   # 추가 파일은 빈 줄로 나눈 문단 하나가 문서 하나
+"""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+# 현재 스크립트의 부모 디렉토리 (backend)를 Python 경로에 추가
+script_dir = Path(__file__).parent
+backend_dir = script_dir.parent
+repo_dir = backend_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils import keywords
+
+OUTPUT = keywords.IDF_PATH
+# 말뭉치: 문서는 빈 줄로 나눈 문단, JSON은 한글 문장이 든 문자열 하나가 문서 하나
+TEXT_SOURCES = [
+    "README.md", "PROJECT_STRUCTURE.md", "VOICE_CONTROL_GUIDE.md", "raspberrypi/README.md", "arduino/README.md",
+    "backend/DATA_ARCHITECTURE.md", "backend/DATA_MANAGEMENT.md",
+    "docs/API.md", "docs/DEVELOPMENT_SPEC.md", "docs/HARDWARE.md", "docs/PROJECT_REPORT.md", "docs/SCREEN_SPEC.md",
+]
+JSON_SOURCES = [
+    "backend/data/answers.json", "backend/data/lesson_sentences.json", "backend/data/lesson_words.json",
+    "backend/data/lesson_keywords.json", "backend/data/review.json",
+]
+# 한 번만 나온 단어는 빼서 표를 작게 (없는 단어와 IDF가 거의 같음)
+MIN_DF = 2
+_HANGUL_WORDS = re.compile(r"[가-힣]+")
+
+
+def paragraphs(path: Path):
+    text = path.read_text(encoding="utf-8-sig")
+    for block in re.split(r"\n\s*\n", text):
+        if len(_HANGUL_WORDS.findall(block)) >= 3:
+            yield block
+
+
+def json_strings(value):
+    if isinstance(value, str):
+        if len(_HANGUL_WORDS.findall(value)) >= 2:
+            yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from json_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from json_strings(item)
+
+
+def documents(extra):
+    for name in TEXT_SOURCES:
+        yield from paragraphs(repo_dir / name)
+    for name in JSON_SOURCES:
+        with open(repo_dir / name, "r", encoding="utf-8-sig") as f:
+            yield from json_strings(json.load(f))
+    for path in extra:
+        yield from paragraphs(Path(path))
+
+
+def main():
+    # 지금 표의 단어를 사전으로 쓰지 않고 조사/어미 규칙만으로 어간 추출 (다시 실행해도 같은 결과)
+    keywords.IDF_PATH = Path(os.devnull)
+    keywords._idf_table.cache_clear()
+    keywords.strip_particles.cache_clear()
+
+    table = keywords.build_idf(documents(sys.argv[1:]))
+    df = {word: count for word, count in table["df"].items() if count >= MIN_DF}
+    output = {
+        "_comment": "키워드 추출용 문서 빈도표 (utils/keywords.py). scripts/build_keyword_idf.py로 생성 - 직접 고치지 말 것",
+        "sources": TEXT_SOURCES + JSON_SOURCES + [Path(p).name for p in sys.argv[1:]],
+        "documents": table["documents"],
+        "df": df,
+    }
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        json.dump(output, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+
+    print(f"✅ 문서 빈도표 생성 완료: {OUTPUT}")
+    print(f"   문서 {table['documents']}개, 단어 {len(df)}개 (df >= {MIN_DF})")
+
+
+if __name__ == "__main__":
+    main()
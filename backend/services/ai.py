@@ -1,7 +1,18 @@
 # services/ai.py
 from __future__ import annotations
-from typing import Dict, List
-import os, json, re, logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+import copy, hashlib, re, logging, threading, time
+
+from services.breaker import CircuitOpen
+from services.clients import _env_int, call_outbound
+from services.deadline import bind, wait_for
+from services.json_stream import parse_json_object
+from services.router import get_router
+from services.singleflight import flight_key, group as singleflight
+from services.usage import estimate_tokens, get_usage_meter
+from utils.keywords import extract_keywords
 
 logger = logging.getLogger(__name__)
 REQUIRED_KEYS = {"summary", "bullets", "keywords"}
@@ -15,14 +26,34 @@ PROMPT = """
 JSON만 반환하세요.
 """
 
+BATCH_PROMPT = """
+아래 여러 텍스트를 각각 따로 분석해서 결과를 JSON으로 반환하세요. 각 텍스트는 "[id]" 줄로 시작합니다.
+항목마다 아래 키를 채우세요.
+- id: 텍스트 앞의 id 그대로
+- summary: 핵심을 2~4문장으로 한국어 요약
+- bullets: 초등학생도 이해할 쉬운 한국어 불릿 2~3개
+- keywords: 핵심 키워드 2~3개 (짧게)
+반드시 {"items": [{"id": ..., "summary": ..., "bullets": [...], "keywords": [...]}, ...]} 형태로,
+모든 id를 한 번씩 포함해 JSON만 반환하세요.
+"""
+
+# summarize_many 설정 (환경변수)
+BATCH_TOKEN_BUDGET = _env_int("SUMMARIZE_BATCH_TOKENS", 3000)   # 배치 하나에 넣을 입력 토큰 추정치 상한
+BATCH_MAX_ITEMS = _env_int("SUMMARIZE_BATCH_ITEMS", 10)
+BATCH_CONCURRENCY = _env_int("SUMMARIZE_CONCURRENCY", 3)        # 동시에 보낼 배치 수
+CACHE_SIZE = _env_int("SUMMARIZE_CACHE_SIZE", 1024)              # 내용 해시 → 요약 결과 (LRU)
+
+_cache: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
 def _fallback(text: str) -> Dict[str, object]:
     # Very safe deterministic fallback
     head = (text or "").strip()
     head = re.sub(r"\s+", " ", head)[:120]
     return {
-        "summary": f"'{head}...'에 대한 간단 요약입니다. 실제 환경에서는 Gemini API로 더 정확한 결과를 제공합니다.",
+        "summary": f"'{head}...'에 대한 간단 요약입니다. 실제 환경에서는 AI 모델로 더 정확한 결과를 제공합니다.",
         "bullets": ["핵심 포인트 1", "핵심 포인트 2"],
-        "keywords": ["키워드1", "키워드2"],
+        "keywords": extract_keywords(text, limit=3) or ["키워드1", "키워드2"],
     }
 
 def _coerce_schema(obj: dict) -> Dict[str, object]:
@@ -45,61 +76,69 @@ def _coerce_schema(obj: dict) -> Dict[str, object]:
 
 def _extract_json(text: str) -> dict | None:
     """
-    Accepts raw model text; strips ```json fences; extracts first {...} block.
+    Accepts raw model text; skips ```json fences / surrounding prose; returns the first {...} object.
     """
-    if not text:
-        return None
-    t = text.strip()
-    # remove code fences
-    t = re.sub(r"^```json\s*|\s*```$", "", t, flags=re.IGNORECASE)
-    # try direct json
-    try:
-        return json.loads(t)
-    except Exception:
-        pass
-    # find first JSON object
-    m = re.search(r"\{.*\}", t, flags=re.DOTALL)
-    if not m:
-        return None
-    try:
-        return json.loads(m.group(0))
-    except Exception:
-        return None
+    return parse_json_object(text)
+
+def content_key(raw: str) -> str:
+    """요약 캐시 키 (공백을 정리한 본문의 해시)"""
+    return hashlib.sha256(re.sub(r"\s+", " ", raw).strip().encode("utf-8")).hexdigest()
+
+def _cached(raw: str) -> Optional[Dict[str, object]]:
+    key = content_key(raw)
+    with _cache_lock:
+        obj = _cache.get(key)
+        if obj is None:
+            return None
+        _cache.move_to_end(key)
+    return copy.deepcopy(obj)
+
+def _remember(raw: str, obj: Dict[str, object]):
+    # fallback 결과는 넣지 않음 (LLM이 살아나면 다시 요약)
+    with _cache_lock:
+        _cache[content_key(raw)] = copy.deepcopy(obj)
+        _cache.move_to_end(content_key(raw))
+        while len(_cache) > max(0, CACHE_SIZE):
+            _cache.popitem(last=False)
 
 def summarize(text: str) -> Dict[str, object]:
     """
     Returns a dict with keys: summary (str), bullets (list[str]), keywords (list[str]).
     Never raises. Falls back on any error.
+    Concurrent calls with the same text share one in-flight LLM call; results are cached by content hash.
     """
     raw = (text or "").strip()
     if not raw:
         return {"summary": "", "bullets": [], "keywords": []}
+    cached = _cached(raw)
+    if cached is not None:
+        return cached
+    return singleflight.do(flight_key("summarize", raw), _summarize, raw)
 
-    api_key = os.getenv("GEMINI_API_KEY", "").strip()
-    if not api_key:
-        logger.warning("[AI] GEMINI_API_KEY missing → fallback")
-        return _fallback(raw)
-
-    # Lazy import to avoid ImportError at module import time
+def _generate(prompt: str, endpoint: str = "summarize") -> Optional[str]:
+    """
+    LLM 라우터(services.router) 호출 → 응답 텍스트. API 키가 하나도 없으면 None (호출 측에서 fallback).
+    CircuitOpen(모든 제공자 브레이커가 열림) 및 런타임 오류는 그대로 전달
+    """
     try:
-        import google.generativeai as genai  # type: ignore
-    except Exception as e:
-        logger.exception("[AI] google-generativeai import failed → fallback")
-        return _fallback(raw)
+        router = get_router()
+    except RuntimeError as e:
+        logger.warning("[AI] %s → fallback", e)
+        return None
+
+    # 호출당 최대 15초 (요청 마감 시간이 더 짧으면 그때까지). 제공자 선택/hedge/브레이커는 라우터가 처리
+    started = time.perf_counter()
+    text = call_outbound(wait_for(router.complete(prompt), cap=15)) or ""
+    # 엔드포인트별 토큰/지연 집계 (services.usage, 라우터는 텍스트만 돌려주므로 추정치)
+    get_usage_meter().record(endpoint, prompt, text, time.perf_counter() - started)
+    return text
 
+def _summarize(raw: str) -> Dict[str, object]:
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        prompt = f"{PROMPT}\n\n분석할 텍스트:\n{raw}"
-
-        # Request with timeout; if SDK doesn't support, ignore silently.
-        kwargs = {"request_options": {"timeout": 15}}
-        try:
-            response = model.generate_content(prompt, **kwargs)
-        except TypeError:
-            response = model.generate_content(prompt)
-
-        resp_text = getattr(response, "text", "") or ""
+        resp_text = _generate(f"{PROMPT}\n\n분석할 텍스트:\n{raw}")
+        if resp_text is None:
+            return _fallback(raw)
+
         obj = _extract_json(resp_text)
         if not isinstance(obj, dict):
             logger.warning("[AI] Could not parse JSON; using fallback")
@@ -110,9 +149,116 @@ def summarize(text: str) -> Dict[str, object]:
             logger.warning("[AI] Missing keys in response; using fallback")
             return _fallback(raw)
 
-        logger.info("[AI] Gemini processed successfully")
+        logger.info("[AI] LLM processed successfully")
+        _remember(raw, obj)
         return obj
 
+    except CircuitOpen as e:
+        logger.warning("[AI] %s → fallback", e)
+        return _fallback(raw)
     except Exception:
-        logger.exception("[AI] Gemini runtime error → fallback")
+        logger.exception("[AI] LLM runtime error → fallback")
         return _fallback(raw)
+
+def summarize_many(texts: Sequence[str]) -> List[Dict[str, object]]:
+    """
+    여러 텍스트를 한꺼번에 요약 (뉴스 다이제스트 등). 결과는 texts와 같은 순서의 summarize() 결과 목록.
+
+    - 이미 요약한 본문(내용 해시)은 캐시에서 바로 꺼내고, 같은 본문이 여러 번 있어도 한 번만 요약
+    - 나머지는 id를 붙여 한 프롬프트에 묶어 보냄. 배치는 BATCH_TOKEN_BUDGET / BATCH_MAX_ITEMS 기준으로 나눔
+    - 배치들은 최대 BATCH_CONCURRENCY개씩 동시에 호출
+    - 응답에서 빠졌거나 summary/bullets/keywords 중 빈 키가 있는 항목만 summarize()로 하나씩 다시 요청,
+      배치 호출 자체가 실패하면 fallback
+    Never raises.
+    """
+    raws = [(text or "").strip() for text in texts]
+    results: Dict[str, Dict[str, object]] = {}
+    todo: Dict[str, str] = {}  # 내용 해시 → 본문 (중복 제거, 순서 유지)
+    for raw in raws:
+        key = content_key(raw) if raw else ""
+        if not raw or key in results or key in todo:
+            continue
+        cached = _cached(raw)
+        if cached is not None:
+            results[key] = cached
+        else:
+            todo[key] = raw
+
+    batches = _split_batches(list(todo.values()))
+    if batches:
+        with ThreadPoolExecutor(max_workers=max(1, min(BATCH_CONCURRENCY, len(batches))),
+                                thread_name_prefix="summarize") as pool:
+            for batch, done in zip(batches, pool.map(bind(_summarize_batch_shared), batches)):
+                for raw, obj in zip(batch, done):
+                    results[content_key(raw)] = obj
+
+    empty = {"summary": "", "bullets": [], "keywords": []}
+    return [copy.deepcopy(results[content_key(raw)]) if raw else dict(empty) for raw in raws]
+
+def _split_batches(raws: List[str]) -> List[List[str]]:
+    """토큰 예산/항목 수 기준으로 순서대로 나눔 (예산보다 큰 텍스트는 혼자 한 배치)"""
+    budget = max(1, BATCH_TOKEN_BUDGET)
+    batches: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for raw in raws:
+        cost = estimate_tokens(raw)
+        if current and (used + cost > budget or len(current) >= max(1, BATCH_MAX_ITEMS)):
+            batches.append(current)
+            current, used = [], 0
+        current.append(raw)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def _summarize_batch_shared(batch: List[str]) -> List[Dict[str, object]]:
+    # 같은 배치가 동시에 들어오면 호출 하나를 공유
+    return singleflight.do(flight_key("summarize_many", *batch), _summarize_batch, batch)
+
+def _valid_item(item: dict) -> Optional[Dict[str, object]]:
+    """배치 응답 항목을 summarize() 스키마로 (REQUIRED_KEYS 중 하나라도 없거나 비어 있으면 None)"""
+    if not REQUIRED_KEYS <= set(item):
+        return None
+    result = _coerce_schema(item)
+    if not (result["summary"].strip() and result["bullets"] and result["keywords"]):
+        return None
+    return result
+
+def _summarize_batch(batch: List[str]) -> List[Dict[str, object]]:
+    if len(batch) == 1:
+        return [_summarize(batch[0])]
+
+    ids = [str(i + 1) for i in range(len(batch))]
+    body = "\n\n".join(f"[{item_id}]\n{raw}" for item_id, raw in zip(ids, batch))
+    try:
+        resp_text = _generate(f"{BATCH_PROMPT}\n\n분석할 텍스트:\n{body}", endpoint="summarize_many")
+    except CircuitOpen as e:
+        logger.warning("[AI] %s → fallback", e)
+        return [_fallback(raw) for raw in batch]
+    except Exception:
+        logger.exception("[AI] LLM batch error → fallback")
+        return [_fallback(raw) for raw in batch]
+    if resp_text is None:
+        return [_fallback(raw) for raw in batch]
+
+    obj = _extract_json(resp_text)
+    items = obj.get("items") if isinstance(obj, dict) else None
+    by_id: Dict[str, Dict[str, object]] = {}
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, dict) and str(item.get("id", "")).strip("[] ") in ids:
+            result = _valid_item(item)
+            if result is not None:
+                by_id.setdefault(str(item["id"]).strip("[] "), result)
+
+    out = []
+    for item_id, raw in zip(ids, batch):
+        result = by_id.get(item_id)
+        if result is None:
+            logger.warning("[AI] Batch item %s missing or incomplete → single request", item_id)
+            out.append(summarize(raw))
+            continue
+        _remember(raw, result)
+        out.append(result)
+    logger.info("[AI] LLM batch processed %d/%d items", len(by_id), len(batch))
+    return out
@@ -0,0 +1,289 @@
+"""
+자주 묻는 질문 로컬 답변 저장소 (BM25, LLM 호출 생략)
+
+질문 대부분은 날씨, 오늘 뉴스, 점자 읽는 법, 앱 사용법 같은 몇 가지 의도의 반복입니다. LLM을 부르기 전에
+큐레이션한 답변(data/answers.json)과 최근 LLM 답변 중 품질이 괜찮은 것을 BM25로 찾아, 충분히 비슷하면
+업스트림 호출 없이 바로 답합니다.
+
+    from services.answer_store import get_answer_store
+    match = get_answer_store().lookup(query)
+    if match:
+        return {"answer": match.answer, "keywords": match.keywords}
+    ...LLM 호출...
+    get_answer_store().learn(query, answer, keywords)
+
+- 색인 단위: 어절에서 조사/어미를 뗀 어간 + 3글자 이상 어간의 글자 bigram (utils.keywords), 영문/숫자 단어.
+  서술어도 색인함 ("오를까"와 "내릴까"는 다른 질문). "어때", "뭐야" 같은 말끝(FILLERS)은 뺌
+- 질문의 어간/단어(bigram 제외)가 모두 들어 있는 저장된 질문만 후보 ("블록체인 단점"은 "블록체인"에 맞지 않음)
+- 점수: BM25를 "질문 자신과 비교했을 때의 점수"로 나눈 0~1 값. 질문 쪽/저장된 질문 쪽 모두 기준으로 나눠 작은 값을 씀
+  (한쪽에만 있는 단어가 많을수록 낮아짐). min_score 이상이어야 답함
+- 학습한 답변은 기본적으로 색인어가 똑같은 질문에만 씀 (fuzzy_learned=True면 큐레이션 답변처럼 BM25로 찾음)
+- 학습한 답변은 ttl초 뒤 만료(날씨/뉴스처럼 금방 바뀌는 답변), 최대 max_learned개 (LRU)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from services.clients import _env_float, _env_int
+from utils.keywords import candidates
+
+ANSWERS_PATH = Path(__file__).resolve().parent.parent / "data" / "answers.json"
+
+K1 = 1.2
+B = 0.75
+
+_LATIN = re.compile(r"[a-z0-9]+")
+# 존댓말 "요"를 떼어 반말과 같은 색인어로 ("읽어요" → "읽어", "필요"는 그대로)
+_POLITE = re.compile(r"(?<=[어아해워줘돼써봐와져네지])요(?![가-힣])")
+# 질문 끝에 붙는 말 (의도와 상관없어 색인하지 않음)
+FILLERS = frozenset("어때 어때요 뭐야 뭐예요 뭔가요 뭘까 어떻게 어떤 해 해봐 말해줘 알려줄래 궁금해".split())
+
+
+class Match(NamedTuple):
+    id: str
+    answer: str
+    keywords: List[str]
+    score: float
+    source: str  # "curated" | "learned"
+
+
+def terms(text: str, bigrams: bool = True) -> List[str]:
+    """BM25 색인어 (어간 + 어간 bigram + 영문/숫자 단어)"""
+    text = _POLITE.sub("", unicodedata.normalize("NFC", text or "").lower())
+    out = []
+    for stem in candidates(text, predicates=True):
+        if stem in FILLERS:
+            continue
+        out.append(stem)
+        if bigrams and len(stem) >= 3:
+            out.extend(stem[i:i + 2] for i in range(len(stem) - 1))
+    out.extend(_LATIN.findall(text))
+    return out
+
+
+def _learned_id(question: str) -> str:
+    """학습 답변 id: 색인어 집합이 같은 질문은 같은 id ("오늘 날씨 알려줘" = "오늘 날씨는 어때?")"""
+    normalized = " ".join(sorted(set(terms(question, bigrams=False))))
+    return "learned:" + hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def good_answer(answer: str) -> bool:
+    """학습할 만한 LLM 답변인지 (불릿 두 줄 이상, 오류/개발 모드 답변 제외)"""
+    lines = [line for line in (answer or "").splitlines() if line.strip()]
+    return len(lines) >= 2 and "개발 모드" not in answer and "오류" not in lines[0]
+
+
+class _Doc:
+    __slots__ = ("entry_id", "tf", "length")
+
+    def __init__(self, entry_id: str, tf: Counter):
+        self.entry_id = entry_id
+        self.tf = tf
+        self.length = sum(tf.values())
+
+
+class _Entry:
+    __slots__ = ("id", "answer", "keywords", "source", "expires", "doc_ids")
+
+    def __init__(self, entry_id: str, answer: str, keywords: List[str], source: str, expires: Optional[float]):
+        self.id = entry_id
+        self.answer = answer
+        self.keywords = keywords
+        self.source = source
+        self.expires = expires
+        self.doc_ids: List[int] = []
+
+
+class AnswerStore:
+    def __init__(self, entries: Iterable[dict] = (), min_score: float = 0.8, learned_ttl: float = 1800,
+                 max_learned: int = 500, fuzzy_learned: bool = False, clock: Callable[[], float] = time.monotonic):
+        self.min_score = float(min_score)
+        self.fuzzy_learned = bool(fuzzy_learned)
+        self.learned_ttl = float(learned_ttl)
+        self.max_learned = max(0, int(max_learned))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._learned: "OrderedDict[str, None]" = OrderedDict()  # 학습한 항목 id (LRU 순서)
+        self._docs: Dict[int, _Doc] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}  # 색인어 → {문서: tf}
+        self._total_length = 0
+        self._next_doc = 0
+        self.hits = 0
+        self.misses = 0
+        for entry in entries:
+            self._add(str(entry["id"]), entry.get("questions") or [], entry.get("answer", ""),
+                      list(entry.get("keywords") or []), "curated", None)
+
+    # --- 색인 ---
+
+    def _add(self, entry_id: str, questions: List[str], answer: str, keywords: List[str], source: str,
+             expires: Optional[float]):
+        # lock 안에서 호출 (생성자 제외)
+        if entry_id in self._entries:
+            self._remove(entry_id)
+        entry = self._entries[entry_id] = _Entry(entry_id, answer, keywords, source, expires)
+        for question in questions:
+            tf = Counter(terms(question))
+            if not tf:
+                continue
+            doc_id = self._next_doc
+            self._next_doc += 1
+            doc = self._docs[doc_id] = _Doc(entry_id, tf)
+            self._total_length += doc.length
+            for term, count in tf.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+            entry.doc_ids.append(doc_id)
+
+    def _remove(self, entry_id: str):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        self._learned.pop(entry_id, None)
+        for doc_id in entry.doc_ids:
+            doc = self._docs.pop(doc_id)
+            self._total_length -= doc.length
+            for term in doc.tf:
+                postings = self._postings[term]
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    # --- 점수 ---
+
+    def _idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._docs) - df + 0.5) / (df + 0.5))
+
+    def _bm25(self, query: Counter, tf: Counter, length: int, avgdl: float) -> float:
+        score = 0.0
+        for term in query:
+            count = tf.get(term, 0)
+            if count:
+                norm = count + K1 * (1 - B + B * length / avgdl)
+                score += self._idf(term) * count * (K1 + 1) / norm
+        return score
+
+    def _confidence(self, query: Counter, doc: _Doc, avgdl: float) -> float:
+        score = self._bm25(query, doc.tf, doc.length, avgdl)
+        if score <= 0:
+            return 0.0
+        self_query = self._bm25(query, query, sum(query.values()), avgdl)
+        self_doc = self._bm25(doc.tf, doc.tf, doc.length, avgdl)
+        return min(1.0, score / self_query, score / self_doc)
+
+    def search(self, query: str) -> Optional[Match]:
+        """질문의 어간/단어를 모두 담은 답변 중 가장 비슷한 것 (점수와 상관없이, 없으면 None)"""
+        tf = Counter(terms(query))
+        if not tf:
+            return None
+        required = set(terms(query, bigrams=False))
+        with self._lock:
+            now = self._clock()
+            expired = [entry_id for entry_id in self._learned if self._entries[entry_id].expires <= now]
+            for entry_id in expired:
+                self._remove(entry_id)
+            if not self.fuzzy_learned:
+                entry = self._entries.get(_learned_id(query))
+                if entry is not None:
+                    self._learned.move_to_end(entry.id)
+                    return Match(entry.id, entry.answer, list(entry.keywords), 1.0, entry.source)
+            if not self._docs:
+                return None
+            avgdl = self._total_length / len(self._docs)
+            scores: Dict[int, float] = {}
+            for term in tf:
+                for doc_id in self._postings.get(term, ()):
+                    doc = self._docs[doc_id]
+                    if doc_id not in scores and required.issubset(doc.tf):
+                        scores[doc_id] = self._confidence(tf, doc, avgdl)
+            if not scores:
+                return None
+            doc_id = max(scores, key=lambda d: (scores[d], -d))
+            entry = self._entries[self._docs[doc_id].entry_id]
+            if entry.id in self._learned:
+                self._learned.move_to_end(entry.id)
+            return Match(entry.id, entry.answer, list(entry.keywords), round(scores[doc_id], 3), entry.source)
+
+    def lookup(self, query: str) -> Optional[Match]:
+        """min_score 이상으로 맞는 답변, 없으면 None"""
+        match = self.search(query)
+        if match is None or match.score < self.min_score:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return match
+
+    # --- 학습 ---
+
+    def learn(self, question: str, answer: str, keywords: Optional[List[str]] = None) -> bool:
+        """LLM 답변을 저장 (품질이 낮거나 학습이 꺼져 있으면 False)"""
+        if self.max_learned <= 0 or self.learned_ttl <= 0 or not good_answer(answer) or not terms(question):
+            return False
+        entry_id = _learned_id(question)
+        with self._lock:
+            # 정확히 맞추기 모드에서는 BM25 색인에 넣지 않음 (id로만 찾음)
+            self._add(entry_id, [question] if self.fuzzy_learned else [], answer.strip(), list(keywords or [])[:3],
+                      "learned", self._clock() + self.learned_ttl)
+            self._learned[entry_id] = None
+            while len(self._learned) > self.max_learned:
+                self._remove(next(iter(self._learned)))
+        return True
+
+    def clear_learned(self):
+        with self._lock:
+            for entry_id in list(self._learned):
+                self._remove(entry_id)
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            learned = len(self._learned)
+            curated = len(self._entries) - learned
+        return {"curated": curated, "learned": learned, "hits": self.hits, "misses": self.misses,
+                "min_score": self.min_score, "fuzzy_learned": self.fuzzy_learned}
+
+
+def load_answers(path: Path = ANSWERS_PATH) -> List[dict]:
+    """큐레이션 답변 목록 (파일이 없거나 깨졌으면 빈 목록)"""
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            return list(json.load(f).get("answers", []))
+    except (OSError, ValueError) as e:
+        print(f"[AnswerStore] {path} 읽기 실패: {e}")
+        return []
+
+
+_store: Optional[AnswerStore] = None
+_lock = threading.Lock()
+
+
+def get_answer_store() -> Optional[AnswerStore]:
+    """
+    프로세스 공용 답변 저장소 (ANSWER_STORE_ENABLED=0이면 None)
+
+    설정 (환경변수): ANSWER_STORE_MIN_SCORE (0~1, 기본 0.8), ANSWER_STORE_TTL (학습 답변 유지 초, 기본 1800, 0이면 학습 안 함),
+    ANSWER_STORE_MAX_LEARNED (기본 500), ANSWER_STORE_FUZZY_LEARNED (1이면 학습 답변도 BM25로 찾음, 기본 0)
+    """
+    global _store
+    if _env_int("ANSWER_STORE_ENABLED", 1) <= 0:
+        return None
+    with _lock:
+        if _store is None:
+            _store = AnswerStore(
+                load_answers(),
+                min_score=_env_float("ANSWER_STORE_MIN_SCORE", 0.8),
+                learned_ttl=_env_float("ANSWER_STORE_TTL", 1800),
+                max_learned=_env_int("ANSWER_STORE_MAX_LEARNED", 500),
+                fuzzy_learned=_env_int("ANSWER_STORE_FUZZY_LEARNED", 0) > 0,
+            )
+        return _store
@@ -0,0 +1,224 @@
+"""
+LLM 제공자별 서킷 브레이커
+
+제공자가 장애/지연 상태일 때 요청마다 타임아웃을 다 기다리지 않도록, 최근 호출 결과로 상태를 판단해
+열린(OPEN) 동안은 호출하지 않고 바로 CircuitOpen을 던집니다. 호출 측은 캐시/폴백 응답으로 즉시 넘어갑니다.
+
+    CLOSED     정상. 최근 window개 호출 중 실패(느린 호출 포함) 비율이 failure_rate 이상이면 OPEN
+    OPEN       open_seconds 동안 호출 차단 → 지나면 HALF_OPEN
+    HALF_OPEN  시험 호출 하나만 허용. 성공하면 CLOSED, 실패하면 다시 OPEN
+
+    from services.breaker import CircuitOpen, get_breaker
+    try:
+        with get_breaker("gemini").guard():
+            response = model.generate_content(prompt)
+    except CircuitOpen:
+        return fallback
+
+설정 (환경변수, 모든 제공자 공통):
+    LLM_BREAKER_WINDOW        판단에 쓰는 최근 호출 수 (기본 20)
+    LLM_BREAKER_MIN_CALLS     이 수보다 적게 호출됐으면 열지 않음 (기본 5)
+    LLM_BREAKER_FAILURE_RATE  OPEN 전환 실패 비율 (기본 0.5)
+    LLM_BREAKER_SLOW_CALL_SEC 이보다 오래 걸린 성공 호출도 실패로 셈 (기본 10)
+    LLM_BREAKER_OPEN_SEC      OPEN 유지 시간 (기본 30)
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator
+
+from services.clients import _env_float, _env_int
+
+logger = logging.getLogger(__name__)
+
+# hedge에서 나중 요청에 추월당해 취소될 때의 취소 메시지 (task.cancel(OVERTAKEN), services.router)
+OVERTAKEN = "overtaken"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(RuntimeError):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} 서킷 브레이커 열림 ({retry_after:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, window: int = 20, min_calls: int = 5, failure_rate: float = 0.5,
+                 slow_call_seconds: float = 10.0, open_seconds: float = 30.0):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque(maxlen=window)  # True = 실패(또는 느림)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False  # HALF_OPEN 시험 호출 진행 중
+        self.rejected = 0
+
+    # --- 상태 (lock 안에서 호출) ---
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+        logger.warning("[CircuitBreaker] %s OPEN (%.0f초)", self.name, self.open_seconds)
+
+    def _retry_after(self) -> float:
+        if self._state == OPEN:
+            return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+        return 1.0  # HALF_OPEN 시험 호출 진행 중
+
+    # --- 공개 API ---
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def available(self) -> bool:
+        """지금 호출을 시도할 수 있는지 (상태를 바꾸지 않음)"""
+        with self._lock:
+            state = self._current_state()
+            return state == CLOSED or (state == HALF_OPEN and not self._probing)
+
+    def before_call(self):
+        """호출 허가 (OPEN이면 CircuitOpen). 허가된 호출은 반드시 결과를 기록"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            raise CircuitOpen(self.name, self._retry_after())
+
+    def record(self, seconds: float, failed: bool):
+        with self._lock:
+            failed = failed or seconds >= self.slow_call_seconds
+            if self._state == HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self._state = CLOSED
+                    self._probing = False
+                    self._outcomes.clear()
+                    logger.info("[CircuitBreaker] %s CLOSED", self.name)
+                return
+            self._outcomes.append(failed)
+            if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._open()
+
+    def abandon(self):
+        """취소된 호출 (클라이언트 연결 끊김 등): 결과로 치지 않고 시험 호출 자리만 반납"""
+        with self._lock:
+            self._probing = False
+
+    def cancelled(self, error: BaseException, seconds: float):
+        """
+        취소된 호출 처리: hedge에서 추월당한 호출(OVERTAKEN)이 이미 slow_call_seconds를 넘겼으면 실제 걸린 시간으로
+        느린 호출 기록, 그 밖의 취소는 abandon()
+        (조금 느릴 뿐인 정상 제공자가 hedge에 질 때마다 느린 호출로 세면 브레이커가 열림.
+        추월당한 호출의 지연 시간은 라우터가 censored 표본으로 따로 기록)
+        """
+        overtaken = isinstance(error, asyncio.CancelledError) and error.args and error.args[0] == OVERTAKEN
+        if overtaken and seconds >= self.slow_call_seconds:
+            self.record(seconds, failed=False)
+        else:
+            self.abandon()
+
+    @contextlib.contextmanager
+    def guard(self):
+        """with 블록의 호출 시간/예외를 기록 (async 코드에서도 await를 감싸 사용 가능)"""
+        self.before_call()
+        started = time.monotonic()
+        try:
+            yield self
+        except asyncio.CancelledError as e:
+            self.cancelled(e, time.monotonic() - started)
+            raise
+        except BaseException:
+            self.record(time.monotonic() - started, failed=True)
+            raise
+        self.record(time.monotonic() - started, failed=False)
+
+    def guard_stream(self, start: Callable[[], Iterable]) -> Iterator:
+        """
+        스트리밍 호출용 guard (동기): start()가 돌려준 스트림을 그대로 내보내며 첫 조각에서 성공으로 기록
+        (긴 답변 스트림이 느린 호출로 집계되지 않도록)
+        """
+        self.before_call()
+        started = time.monotonic()
+        pending = True
+        try:
+            for chunk in start():
+                if pending:
+                    self.record(time.monotonic() - started, failed=False)
+                    pending = False
+                yield chunk
+        except GeneratorExit:
+            if pending:
+                self.abandon()
+            raise
+        except BaseException:
+            if pending:
+                self.record(time.monotonic() - started, failed=True)
+            raise
+        if pending:
+            self.record(time.monotonic() - started, failed=False)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            state = self._current_state()
+            return {
+                "state": state,
+                "failure_rate": round(sum(self._outcomes) / len(self._outcomes), 2) if self._outcomes else 0.0,
+                "calls": len(self._outcomes),
+                "rejected": self.rejected,
+                "retry_after": round(self._retry_after(), 1) if state != CLOSED else 0.0,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """제공자 이름별 공용 브레이커 (동기/비동기 호출 경로가 같은 상태를 공유)"""
+    with _lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                window=_env_int("LLM_BREAKER_WINDOW", 20),
+                min_calls=_env_int("LLM_BREAKER_MIN_CALLS", 5),
+                failure_rate=_env_float("LLM_BREAKER_FAILURE_RATE", 0.5),
+                slow_call_seconds=_env_float("LLM_BREAKER_SLOW_CALL_SEC", 10.0),
+                open_seconds=_env_float("LLM_BREAKER_OPEN_SEC", 30.0),
+            )
+        return breaker
+
+
+def breaker_stats() -> Dict[str, Dict[str, object]]:
+    with _lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.stats() for b in breakers}
@@ -0,0 +1,352 @@
+"""
+프로세스 공용 LLM/외부 API 클라이언트 레지스트리
+
+요청마다 .env를 다시 읽고 클라이언트를 새로 만들면 HTTP keep-alive가 버려져
+매 요청이 TLS 핸드셰이크부터 다시 시작합니다. 여기서는 제공자별 클라이언트를
+프로세스당 한 번만 만들고(연결 풀 포함) 모든 요청이 재사용합니다.
+
+비동기 클라이언트(AsyncOpenAI, httpx.AsyncClient)는 연결 풀이 이벤트 루프에 묶입니다. WSGI(runserver,
+scripts/run_local.py)에서는 async 뷰마다 async_to_sync가 새 루프를 만들므로, 나가는 비동기 호출은 모두
+프로세스당 하나인 전용 루프(백그라운드 스레드)에서 실행하고 클라이언트도 그 루프에 하나씩만 둡니다.
+
+    answer = await run_outbound(get_async_http_client().get(url))           # 코루틴을 전용 루프에서 실행
+    async for chunk in stream_outbound(lambda: client.chat.completions...):  # async iterator도 전용 루프에서
+    answer = call_outbound(get_router().complete(prompt))                   # 동기 코드에서 (스레드를 막고 기다림)
+
+설정 변경(.env 수정, 키 교체)은 명시적으로 반영합니다:
+    - reload_config() 호출
+    - 또는 프로세스에 SIGHUP (install_reload_signal()이 등록된 경우)
+
+풀 설정 (환경변수):
+    LLM_POOL_MAX_CONNECTIONS   제공자별 최대 연결 수 (기본 20)
+    LLM_POOL_MAX_KEEPALIVE     유지할 유휴 연결 수 (기본 10)
+    LLM_POOL_KEEPALIVE_EXPIRY  유휴 연결 유지 시간(초) (기본 60)
+    LLM_TIMEOUT                요청 타임아웃(초) (기본 30)
+    LLM_MAX_RETRIES            SDK 내부 재시도 횟수 (기본 2)
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_clients: Dict[str, object] = {}
+_lock = threading.Lock()
+# 이름 → 비동기 클라이언트 (모두 _io_loop에서만 사용)
+_async_clients: Dict[str, object] = {}
+# 나가는 비동기 호출 전용 이벤트 루프 (get_io_loop()에서 처음 쓸 때 시작)
+_io_loop: Optional[asyncio.AbstractEventLoop] = None
+# (API 키, 모델명, 시스템 프롬프트, 안전 설정, 생성 설정) → GenerativeModel
+_gemini_models: Dict[tuple, object] = {}
+_gemini_key: Optional[str] = None  # 마지막으로 genai.configure()에 넘긴 키
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _httpx_options() -> dict:
+    import httpx
+
+    timeout = _env_float("LLM_TIMEOUT", 30.0)
+    return {
+        "limits": httpx.Limits(
+            max_connections=_env_int("LLM_POOL_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=_env_int("LLM_POOL_MAX_KEEPALIVE", 10),
+            keepalive_expiry=_env_float("LLM_POOL_KEEPALIVE_EXPIRY", 60.0),
+        ),
+        "timeout": httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+    }
+
+
+def _build_openai():
+    try:
+        from openai import DefaultHttpxClient, OpenAI
+    except Exception as e:
+        raise RuntimeError(f"OpenAI SDK(v1+) 필요: {e}")
+
+    key = _openai_key()
+    logger.info("[clients] OpenAI 클라이언트 생성 (key prefix: %s)", key[:10])
+    return OpenAI(
+        api_key=key,
+        http_client=DefaultHttpxClient(**_httpx_options()),
+        max_retries=_env_int("LLM_MAX_RETRIES", 2),
+    )
+
+
+def _openai_key() -> str:
+    key = os.getenv("OPENAI_API_KEY")
+    if not key:
+        raise RuntimeError("OPENAI_API_KEY 미설정")
+    return key
+
+
+def _build_async_openai():
+    try:
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+    except Exception as e:
+        raise RuntimeError(f"OpenAI SDK(v1+) 필요: {e}")
+
+    return AsyncOpenAI(
+        api_key=_openai_key(),
+        http_client=DefaultAsyncHttpxClient(**_httpx_options()),
+        max_retries=_env_int("LLM_MAX_RETRIES", 2),
+    )
+
+
+def _build_async_http():
+    import httpx
+
+    return httpx.AsyncClient(**_httpx_options())
+
+
+def _build_router():
+    from services.router import build_router
+
+    return build_router()
+
+
+_BUILDERS: Dict[str, Callable[[], object]] = {
+    "openai": _build_openai,
+    "router": _build_router,  # services.router (지연 시간 기반 LLM 제공자 선택)
+}
+
+_ASYNC_BUILDERS: Dict[str, Callable[[], object]] = {
+    "openai": _build_async_openai,
+    "http": _build_async_http,
+}
+
+
+def get_client(name: str):
+    """
+    제공자 클라이언트 반환 (프로세스당 한 번 생성)
+
+    생성 실패(키 미설정 등)는 캐시하지 않으므로, 설정 후 reload_config() 없이도 다음 호출에서 다시 시도합니다.
+    """
+    client = _clients.get(name)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(name)
+        if client is None:
+            client = _BUILDERS[name]()
+            _clients[name] = client
+    return client
+
+
+def get_openai_client():
+    """공용 OpenAI 클라이언트 (키 미설정 시 RuntimeError)"""
+    return get_client("openai")
+
+
+def get_gemini_model(model_name: str, api_key: str, system_instruction: Optional[str] = None,
+                     safety_settings: Optional[dict] = None, generation_config: Optional[dict] = None):
+    """
+    설정이 같은 Gemini GenerativeModel은 한 번만 만들어 재사용
+
+    GenerativeModel은 대화 상태를 갖지 않으므로(start_chat()이 요청별 ChatSession 생성) 스레드 간에 공유해도 안전합니다.
+    genai.configure()는 프로세스 전역 설정이라 키가 바뀔 때만 다시 호출합니다.
+    """
+    global _gemini_key
+    key = (api_key, model_name, system_instruction,
+           json.dumps(safety_settings, sort_keys=True), json.dumps(generation_config, sort_keys=True))
+    model = _gemini_models.get(key)
+    if model is not None:
+        return model
+    with _lock:
+        model = _gemini_models.get(key)
+        if model is None:
+            import google.generativeai as genai
+
+            if _gemini_key != api_key:
+                genai.configure(api_key=api_key)
+                _gemini_key = api_key
+            options = {
+                "system_instruction": system_instruction,
+                "safety_settings": safety_settings,
+                "generation_config": generation_config,
+            }
+            model = genai.GenerativeModel(model_name, **{k: v for k, v in options.items() if v is not None})
+            _gemini_models[key] = model
+            logger.info("[clients] Gemini 모델 생성: %s", model_name)
+    return model
+
+
+def _close_all(clients):
+    for client in clients:
+        close = getattr(client, "close", None)
+        if close is None:
+            continue
+        try:
+            close()
+        except Exception:
+            logger.exception("[clients] 클라이언트 종료 실패")
+
+
+def get_io_loop() -> asyncio.AbstractEventLoop:
+    """나가는 비동기 호출 전용 이벤트 루프 (프로세스당 하나, 데몬 스레드에서 계속 실행)"""
+    global _io_loop
+    with _lock:
+        if _io_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="outbound-io", daemon=True).start()
+            _io_loop = loop
+        return _io_loop
+
+
+async def run_outbound(coro: Awaitable[Any]) -> Any:
+    """
+    코루틴을 전용 루프에서 실행하고 결과를 기다림 (요청 루프가 매번 바뀌어도 연결 풀을 재사용)
+
+    기다리던 쪽이 취소되면 전용 루프의 작업도 취소됩니다. 요청의 contextvars(마감 시간 등)는 그대로 넘어갑니다.
+    """
+    loop = get_io_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def call_outbound(coro: Awaitable[Any]) -> Any:
+    """
+    동기 코드(스레드)에서 코루틴을 전용 루프에서 실행하고 끝날 때까지 기다림 (예: 동기 함수에서 라우터 호출)
+
+    요청의 contextvars(마감 시간 등)는 그대로 넘어갑니다. 이벤트 루프 안에서 부르면 루프를 막으므로 RuntimeError
+    (async 코드는 run_outbound를 await)
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run_coroutine_threadsafe(coro, get_io_loop()).result()
+    if asyncio.iscoroutine(coro):
+        coro.close()
+    raise RuntimeError("call_outbound()는 이벤트 루프 밖에서만 호출할 수 있습니다 (async 코드는 run_outbound)")
+
+
+async def stream_outbound(factory: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+    """factory()가 만드는 async iterator를 전용 루프에서 만들고 한 조각씩 받아 옴 (끝나거나 중단되면 전용 루프에서 닫음)"""
+    async def start():
+        return factory().__aiter__()
+
+    async def step(iterator):
+        return await iterator.__anext__()
+
+    async def close(iterator):
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    iterator = await run_outbound(start())
+    try:
+        while True:
+            try:
+                chunk = await run_outbound(step(iterator))
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        await run_outbound(close(iterator))
+
+
+def get_async_client(name: str):
+    """
+    전용 루프용 비동기 클라이언트 반환 (프로세스당 한 번 생성). 호출은 run_outbound / stream_outbound 안에서만
+    """
+    with _lock:
+        client = _async_clients.get(name)
+        if client is None:
+            client = _async_clients[name] = _ASYNC_BUILDERS[name]()
+    return client
+
+
+def get_async_openai_client():
+    """공용 AsyncOpenAI 클라이언트 (전용 루프에서 사용, 키 미설정 시 RuntimeError)"""
+    return get_async_client("openai")
+
+
+def get_async_http_client():
+    """공용 httpx.AsyncClient (네이버 API 등 외부 HTTP 호출용, 전용 루프에서 사용)"""
+    return get_async_client("http")
+
+
+def _schedule_aclose(client, grace: float):
+    async def aclose():
+        await asyncio.sleep(grace)
+        try:
+            # httpx.AsyncClient.aclose() / AsyncOpenAI.close()
+            close = getattr(client, "aclose", None) or client.close
+            await close()
+        except Exception:
+            logger.exception("[clients] 비동기 클라이언트 종료 실패")
+
+    asyncio.ensure_future(aclose())
+
+
+def close_clients(grace: float = 0.0):
+    """
+    레지스트리를 비우고 기존 클라이언트의 연결 풀 닫기
+
+    grace초 뒤에 닫으므로 진행 중인 요청은 기존 클라이언트로 끝까지 처리됩니다.
+    """
+    global _gemini_key
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        async_clients = list(_async_clients.values())
+        _async_clients.clear()
+        loop = _io_loop
+        # Gemini 모델은 닫을 연결이 없으므로 버리기만 함 (다음 호출에서 새 키로 configure)
+        _gemini_models.clear()
+        _gemini_key = None
+    for client in async_clients:
+        # 비동기 클라이언트는 전용 루프에서 닫아야 함
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(_schedule_aclose, client, grace)
+    if not clients:
+        return
+    if grace > 0:
+        timer = threading.Timer(grace, _close_all, args=(clients,))
+        timer.daemon = True
+        timer.start()
+    else:
+        _close_all(clients)
+
+
+def reload_config():
+    """.env를 다시 읽고(기존 값 덮어씀) 클라이언트를 다음 요청에서 새로 생성"""
+    from dotenv import load_dotenv
+
+    for path in (BACKEND_DIR / ".env", BACKEND_DIR.parent / ".env"):
+        if path.exists():
+            load_dotenv(path, override=True, encoding="utf-8")
+    close_clients(grace=_env_float("LLM_TIMEOUT", 30.0))
+    logger.info("[clients] 설정 다시 읽음, 클라이언트 초기화")
+
+
+def install_reload_signal() -> bool:
+    """SIGHUP 수신 시 reload_config() (메인 스레드/POSIX에서만 가능)"""
+    try:
+        # 핸들러 안에서 lock을 잡지 않도록 별도 스레드에서 처리
+        signal.signal(signal.SIGHUP, lambda _signum, _frame: threading.Thread(
+            target=reload_config, name="clients-reload", daemon=True).start())
+        return True
+    except (AttributeError, ValueError):
+        return False
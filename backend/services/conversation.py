@@ -0,0 +1,215 @@
+"""
+서버 측 대화 기억 (세션별 토큰 예산 + 오래된 대화 요약)
+
+음성 대화가 길어질수록 history 전체를 매번 프롬프트에 넣으면 프롬프트와 지연 시간이 계속 늘어납니다.
+세션마다 최근 대화만 원문으로 두고, 토큰 예산을 넘으면 오래된 대화를 "지금까지의 요약" 하나로 접습니다.
+
+    from services.conversation import get_conversation_store
+    store = get_conversation_store()
+    history = store.history(session_id)          # [요약 턴 2개] + 최근 턴들
+    ... LLM 호출 ...
+    store.append(session_id, query, reply)       # 예산을 넘으면 요약으로 압축 (공용 저장소는 백그라운드에서)
+
+- 세션당 토큰(추정치)이 token_budget을 넘으면 최근 keep_turns개를 뺀 앞쪽 턴을 summarizer로 요약에 합침
+- 요약(LLM 호출일 수 있음)은 background가 있으면 거기서 실행 → 답변은 요약을 기다리지 않고 바로 돌아감
+  get_conversation_store()는 prefetch 작업 풀(services.prefetch)을 씀. 자리가 없으면 다음 append에서 다시 시도
+- 요약도 summary_tokens를 넘지 않도록 자름 → 턴당 프롬프트 크기가 대략 일정
+- 마지막 사용 후 ttl초가 지난 세션은 만료, 세션 수가 max_sessions를 넘으면 가장 오래 안 쓴 세션부터 삭제 (LRU)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from services.clients import _env_int
+from services.prefetch import get_prefetcher
+from services.singleflight import flight_key
+from services.usage import estimate_tokens
+
+# (이전 요약, 접을 턴 목록) → 새 요약
+Summarizer = Callable[[str, List[Dict[str, str]]], str]
+# (세션 id, 압축 함수) → 압축 함수를 백그라운드에서 실행
+Background = Callable[[str, Callable[[], None]], object]
+
+SUMMARY_PREFIX = "(지금까지의 대화 요약) "
+SUMMARY_ACK = "네, 앞의 대화 내용을 기억하고 이어서 답하겠습니다."
+
+
+def local_summary(summary: str, turns: List[Dict[str, str]], limit: int = 400) -> str:
+    """LLM 없이 만드는 요약: 이전 요약 + 접을 턴의 첫 문장들, limit글자에서 앞부분을 버림"""
+    parts = [summary] if summary else []
+    for turn in turns:
+        speaker = "사용자" if turn.get("role") == "user" else "도우미"
+        first = (turn.get("content") or "").strip().split("\n", 1)[0][:80]
+        if first:
+            parts.append(f"{speaker}: {first}")
+    text = " / ".join(parts)
+    return text[-limit:]
+
+
+class _Session:
+    __slots__ = ("summary", "turns", "tokens", "touched", "compacting")
+
+    def __init__(self, now: float):
+        self.summary = ""
+        self.turns: List[Dict[str, str]] = []
+        self.tokens = 0
+        self.touched = now
+        self.compacting = False
+
+
+class ConversationStore:
+    def __init__(self, token_budget: int = 1500, keep_turns: int = 4, summary_tokens: int = 300,
+                 max_sessions: int = 1000, ttl: float = 1800, summarizer: Optional[Summarizer] = None,
+                 background: Optional[Background] = None, clock: Callable[[], float] = time.monotonic):
+        self.token_budget = max(1, int(token_budget))
+        self.keep_turns = max(0, int(keep_turns))
+        self.summary_tokens = max(1, int(summary_tokens))
+        self.max_sessions = max(1, int(max_sessions))
+        self.ttl = float(ttl)
+        self.summarizer = summarizer or local_summary
+        self.background = background  # None이면 append 안에서 바로 압축
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self.compactions = 0
+        self.expired = 0
+
+    def _get(self, session_id: str, create: bool) -> Optional[_Session]:
+        # lock 안에서 호출
+        now = self._clock()
+        session = self._sessions.get(session_id)
+        if session is not None and self.ttl > 0 and now - session.touched > self.ttl:
+            del self._sessions[session_id]
+            self.expired += 1
+            session = None
+        if session is None:
+            if not create:
+                return None
+            session = self._sessions[session_id] = _Session(now)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        session.touched = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def has(self, session_id: str) -> bool:
+        with self._lock:
+            return self._get(session_id, create=False) is not None
+
+    def history(self, session_id: str) -> List[Dict[str, str]]:
+        """LLM에 넘길 대화 이력 (요약이 있으면 맨 앞에 사용자/도우미 턴 한 쌍으로)"""
+        with self._lock:
+            session = self._get(session_id, create=False)
+            if session is None:
+                return []
+            head = []
+            if session.summary:
+                head = [{"role": "user", "content": SUMMARY_PREFIX + session.summary},
+                        {"role": "assistant", "content": SUMMARY_ACK}]
+            return head + [dict(turn) for turn in session.turns]
+
+    def seed(self, session_id: str, turns: List[Dict[str, str]]):
+        """클라이언트가 보낸 이력으로 새 세션 시작 (이미 있는 세션이면 무시)"""
+        with self._lock:
+            if self._get(session_id, create=False) is not None:
+                return
+            session = self._get(session_id, create=True)
+            for turn in turns:
+                self._add(session, turn.get("role", "user"), turn.get("content", ""))
+        self._schedule(session_id)
+
+    def append(self, session_id: str, query: str, reply: str):
+        """질문/답변 한 쌍 기록, 예산을 넘으면 오래된 턴을 요약으로 압축"""
+        with self._lock:
+            session = self._get(session_id, create=True)
+            self._add(session, "user", query)
+            self._add(session, "assistant", reply)
+        self._schedule(session_id)
+
+    def _add(self, session: _Session, role: str, content: str):
+        role = "user" if role == "user" else "assistant"
+        session.turns.append({"role": role, "content": content or ""})
+        session.tokens += estimate_tokens(content or "")
+
+    def _schedule(self, session_id: str):
+        """예산을 넘었으면 압축 (background가 있으면 거기로 넘기고 바로 돌아옴)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.compacting or session.tokens <= self.token_budget:
+                return
+        if self.background is None:
+            self._compact(session_id)
+        else:
+            self.background(session_id, lambda: self._compact(session_id))
+
+    def _compact(self, session_id: str):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.compacting or session.tokens <= self.token_budget:
+                return
+            count = len(session.turns) - self.keep_turns
+            count -= count % 2  # 사용자/도우미 쌍 단위로 접음
+            if count <= 0:
+                return
+            old, summary = session.turns[:count], session.summary
+            session.compacting = True
+
+        # 요약(LLM 호출일 수 있음)은 lock 밖에서
+        try:
+            summary = self.summarizer(summary, old)
+        except Exception as e:
+            print(f"[Conversation] 요약 실패, 간단 요약 사용: {e}")
+            summary = local_summary(summary, old)
+        limit = self.summary_tokens * 2  # estimate_tokens의 역 (2글자 ≈ 1토큰)
+        summary = (summary or "").strip()[-limit:]
+
+        with self._lock:
+            session.compacting = False
+            # 요약하는 동안 뒤에 턴이 더 붙었을 수 있으므로 앞쪽 count개만 교체
+            del session.turns[:count]
+            session.summary = summary
+            session.tokens = sum(estimate_tokens(turn["content"]) for turn in session.turns)
+            self.compactions += 1
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            sessions = len(self._sessions)
+        return {"sessions": sessions, "compactions": self.compactions, "expired": self.expired}
+
+
+_store: Optional[ConversationStore] = None
+_lock = threading.Lock()
+
+
+def _compact_in_prefetch_pool(session_id: str, compact: Callable[[], None]) -> bool:
+    # 같은 세션의 압축이 이미 예약돼 있으면 submit()이 False (중복 없음)
+    return get_prefetcher().submit(flight_key("conversation_compact", session_id), session_id, compact)
+
+
+def get_conversation_store(summarizer: Optional[Summarizer] = None) -> ConversationStore:
+    """
+    프로세스 공용 대화 저장소 (summarizer는 처음 만들 때만 반영)
+
+    설정 (환경변수): CHAT_MEMORY_TOKEN_BUDGET (기본 1500), CHAT_MEMORY_KEEP_TURNS (기본 4),
+    CHAT_MEMORY_SUMMARY_TOKENS (기본 300), CHAT_MEMORY_MAX_SESSIONS (기본 1000), CHAT_MEMORY_TTL (초, 기본 1800)
+    """
+    global _store
+    with _lock:
+        if _store is None:
+            _store = ConversationStore(
+                token_budget=_env_int("CHAT_MEMORY_TOKEN_BUDGET", 1500),
+                keep_turns=_env_int("CHAT_MEMORY_KEEP_TURNS", 4),
+                summary_tokens=_env_int("CHAT_MEMORY_SUMMARY_TOKENS", 300),
+                max_sessions=_env_int("CHAT_MEMORY_MAX_SESSIONS", 1000),
+                ttl=_env_int("CHAT_MEMORY_TTL", 1800),
+                summarizer=summarizer,
+                background=_compact_in_prefetch_pool,
+            )
+        return _store
@@ -0,0 +1,102 @@
+"""
+요청 단위 마감 시간(deadline) 전파
+
+요청이 들어오면 미들웨어(jeomgeuli_backend.middleware.RequestDeadline)가 라우트별 예산(settings.REQUEST_DEADLINES)으로
+Deadline을 만들어 request.deadline과 현재 컨텍스트에 둡니다. 나가는 HTTP/LLM 호출은 고정 timeout 대신
+"남은 시간"을 쓰므로, 호출이 몇 번 이어지든 요청 전체 지연 시간이 예산을 넘지 않습니다.
+
+    from services.deadline import timeout_for, wait_for
+
+    requests.get(url, timeout=timeout_for(6))            # min(6초, 남은 시간), 남은 시간이 없으면 DeadlineExceeded
+    answer = await wait_for(llm.complete(prompt))        # 남은 시간 안에 끝나지 않으면 취소 + DeadlineExceeded
+
+- 마감이 없는 컨텍스트(관리 명령, 백그라운드 작업, 테스트)에서는 주어진 기본값을 그대로 씀
+- 스트리밍 응답의 본문은 미들웨어가 끝난 뒤 생성되므로 request.deadline을 직접 넘겨 씀
+- 예산이 다 떨어지면 엔드포인트는 그때까지의 부분 결과를 돌려주고, 돌려줄 것이 없으면 504
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """요청 마감 시간 초과"""
+
+    def __init__(self, budget: float):
+        super().__init__(f"요청 처리 시간({budget:.1f}초)을 넘었습니다.")
+        self.budget = budget
+
+
+class Deadline:
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.budget = max(0.0, float(seconds))
+        self._clock = clock
+        self.expires_at = clock() + self.budget
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """다음 호출에 쓸 timeout (cap과 남은 시간 중 작은 값). 남은 시간이 없으면 DeadlineExceeded"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(self.budget)
+        return remaining if cap is None else min(cap, remaining)
+
+    def __repr__(self):
+        return f"<Deadline {self.remaining():.2f}s/{self.budget:.2f}s>"
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def scope(deadline: Optional[Deadline]):
+    """with 블록 안에서 current()가 deadline을 돌려줌 (미들웨어, 백그라운드 작업)"""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def bind(fn: Callable[..., T]) -> Callable[..., T]:
+    """호출한 쪽의 현재 마감 시간 안에서 fn을 실행하는 함수 (스레드 풀은 컨텍스트를 이어받지 않음)"""
+    deadline = current()
+
+    def run(*args, **kwargs):
+        with scope(deadline):
+            return fn(*args, **kwargs)
+    return run
+
+
+def timeout_for(default: float, deadline: Optional[Deadline] = None) -> float:
+    """나가는 호출의 timeout: 마감이 있으면 min(default, 남은 시간), 없으면 default"""
+    deadline = deadline or current()
+    return default if deadline is None else deadline.timeout(default)
+
+
+async def wait_for(awaitable: Awaitable[T], cap: Optional[float] = None, deadline: Optional[Deadline] = None) -> T:
+    """남은 시간(과 cap) 안에 끝나지 않으면 취소하고 DeadlineExceeded (마감도 cap도 없으면 그냥 await)"""
+    deadline = deadline or current()
+    if deadline is None and cap is None:
+        return await awaitable
+    timeout = cap if deadline is None else deadline.timeout(cap)
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(deadline.budget if deadline is not None else timeout) from None
@@ -0,0 +1,213 @@
+"""
+LLM 응답용 증분 JSON 파서
+
+생성 중인 응답 조각을 feed()로 넣으면 값이 닫히는 즉시 (경로, 값) 이벤트를 돌려줍니다.
+응답 전체를 기다렸다가 json.loads → 실패 시 정규식으로 다시 찾는 대신, 텍스트를 앞에서부터 한 번만 훑습니다.
+
+    parser = StreamingJsonParser()
+    for chunk in stream:
+        for path, value in parser.feed(chunk):
+            if path == ("simple_tts",):        # detail.sections보다 먼저 도착
+                ...
+            elif path[:1] == ("keywords",) and len(path) == 2:   # 배열 항목 하나
+                ...
+    data = parser.close()
+
+- 첫 '{' 앞의 텍스트(```json 펜스, 설명 문장)는 건너뛰고, 첫 최상위 객체가 닫히면 뒤의 텍스트는 무시
+- 문자열 밖의 // 주석, 마지막 항목 뒤 쉼표 허용 (프롬프트 스키마 예시를 그대로 흉내 낸 응답 대비)
+- 경로는 키/인덱스 튜플: ("detail", "sections", 0, "heading"). 최상위 객체 자체는 ()
+- 잘못된 JSON이면 json.JSONDecodeError
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+Path = Tuple[Any, ...]
+Event = Tuple[Path, Any]
+
+_STRING_END = re.compile(r'["\\]')
+_LITERAL = re.compile(r"[-+.\w]+")  # 숫자 / true / false / null (구분자까지 통째로)
+_WHITESPACE = " \t\r\n"
+
+# 기대하는 다음 토큰
+_START, _KEY, _COLON, _VALUE, _COMMA, _DONE = range(6)
+
+
+class StreamingJsonParser:
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._scan = 0  # 닫는 따옴표를 찾다 멈춘 위치 (긴 문자열을 처음부터 다시 훑지 않도록)
+        self._stack: List[Tuple[Any, Path]] = []  # (dict | list, 경로)
+        self._key: Optional[str] = None
+        self._expect = _START
+        self.value: Optional[dict] = None
+
+    @property
+    def done(self) -> bool:
+        return self._expect == _DONE
+
+    def feed(self, chunk: str) -> List[Event]:
+        events: List[Event] = []
+        if self.done or not chunk:
+            return events
+        self._buf += chunk
+        while not self.done and self._step(events):
+            pass
+        # 처리한 앞부분은 버림
+        self._scan -= self._pos
+        self._buf, self._pos = self._buf[self._pos:], 0
+        return events
+
+    def close(self) -> dict:
+        """응답이 끝났을 때 호출. 완성된 최상위 객체를 반환 (없으면 JSONDecodeError)"""
+        if not self.done:
+            raise json.JSONDecodeError("응답이 JSON 객체 중간에 끝남", self._buf, self._pos)
+        return self.value
+
+    # --- 내부 ---
+
+    def _error(self, message: str):
+        raise json.JSONDecodeError(message, self._buf, self._pos)
+
+    def _skip(self) -> bool:
+        """공백/주석 건너뛰기. 다음 토큰이 버퍼에 있으면 True"""
+        buf = self._buf
+        while self._pos < len(buf):
+            char = buf[self._pos]
+            if char in _WHITESPACE:
+                self._pos += 1
+            elif buf.startswith("//", self._pos):
+                end = buf.find("\n", self._pos)
+                if end < 0:
+                    return False
+                self._pos = end + 1
+            elif char == "/" and self._pos + 1 == len(buf):
+                return False
+            else:
+                return True
+        return False
+
+    def _step(self, events: List[Event]) -> bool:
+        if self._expect == _START:
+            start = self._buf.find("{", self._pos)
+            if start < 0:
+                self._pos = len(self._buf)
+                return False
+            self._pos = start + 1
+            self._stack.append(({}, ()))
+            self._expect = _KEY
+            return True
+
+        if not self._skip():
+            return False
+        char = self._buf[self._pos]
+        container, path = self._stack[-1]
+
+        if self._expect == _KEY:
+            if char == "}":
+                self._pos += 1
+                return self._complete(events, *self._stack.pop())
+            if char != '"':
+                self._error("객체 키가 와야 함")
+            key = self._string()
+            if key is None:
+                return False
+            self._key = key
+            self._expect = _COLON
+            return True
+
+        if self._expect == _COLON:
+            if char != ":":
+                self._error("':'가 와야 함")
+            self._pos += 1
+            self._expect = _VALUE
+            return True
+
+        if self._expect == _COMMA:
+            if char == ",":
+                self._pos += 1
+                self._expect = _KEY if isinstance(container, dict) else _VALUE
+                return True
+            if char == ("}" if isinstance(container, dict) else "]"):
+                self._pos += 1
+                return self._complete(events, *self._stack.pop())
+            self._error("',' 또는 닫는 괄호가 와야 함")
+
+        # _VALUE
+        child = path + ((self._key,) if isinstance(container, dict) else (len(container),))
+        if char == "{":
+            self._pos += 1
+            self._stack.append(({}, child))
+            self._expect = _KEY
+            return True
+        if char == "[":
+            self._pos += 1
+            self._stack.append(([], child))
+            self._expect = _VALUE
+            return True
+        if char == "]" and isinstance(container, list):  # 빈 배열 / 마지막 쉼표
+            self._pos += 1
+            return self._complete(events, *self._stack.pop())
+        if char == '"':
+            value = self._string()
+            if value is None:
+                return False
+            return self._complete(events, value, child)
+        match = _LITERAL.match(self._buf, self._pos)
+        if match is None:
+            self._error("값이 와야 함")
+        if match.end() == len(self._buf):
+            return False  # 숫자/리터럴이 조각 경계에서 잘렸을 수 있음 (최상위는 객체라 다음 조각이 반드시 옴)
+        self._pos = match.end()
+        try:
+            value = json.loads(match.group())
+        except ValueError:
+            self._error("잘못된 값")
+        return self._complete(events, value, child)
+
+    def _string(self) -> Optional[str]:
+        """self._pos의 문자열 토큰을 디코드. 아직 닫히지 않았으면 None"""
+        scan = max(self._scan, self._pos + 1)
+        while True:
+            match = _STRING_END.search(self._buf, scan)
+            if match is None:
+                self._scan = len(self._buf)
+                return None
+            if match.group() == "\\":
+                if match.end() >= len(self._buf):
+                    self._scan = match.start()
+                    return None
+                scan = match.end() + 1
+                continue
+            end = match.end()
+            value = json.loads(self._buf[self._pos:end])
+            self._pos = self._scan = end
+            return value
+
+    def _complete(self, events: List[Event], value: Any, path: Path) -> bool:
+        events.append((path, value))
+        if not self._stack:
+            self.value = value
+            self._expect = _DONE
+            return False
+        container, _ = self._stack[-1]
+        if isinstance(container, dict):
+            container[path[-1]] = value
+        else:
+            container.append(value)
+        self._expect = _COMMA
+        return True
+
+
+def parse_json_object(text: str) -> Optional[dict]:
+    """완성된 응답 텍스트에서 첫 JSON 객체 (펜스/앞뒤 설명 허용). 없거나 깨졌으면 None"""
+    parser = StreamingJsonParser()
+    try:
+        parser.feed(text or "")
+        return parser.close()
+    except json.JSONDecodeError:
+        return None
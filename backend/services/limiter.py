@@ -0,0 +1,320 @@
+"""
+LLM 호출 동시성 제한기 (토큰 버킷 + 최대 동시 호출 수)
+
+제공자 쿼터에 맞춰 초당 rate개(순간 burst개까지)의 호출을 허용하고, 동시에 진행 중인 호출은 max_in_flight개로 제한합니다.
+자리가 없으면 대기열에서 기다리며, 대기열은 클라이언트(IP 등)별 라운드로빈으로 처리해 한 사용자가 몰아서 보내도
+다른 사용자가 밀리지 않습니다.
+
+    from services.limiter import Limiter, Saturated, get_limiter, llm_slot
+    limiter = Limiter(rate=2, burst=4, max_in_flight=4)   # 또는 프로세스 공용 LLM 제한기 get_limiter()
+
+    with limiter.acquire(client=ip):          # 스레드(동기 뷰)
+        call_llm()
+
+    async with limiter.acquire_async(client=ip):   # 이벤트 루프(async 뷰)
+        await acall_llm()
+
+    async with llm_slot(client=ip):           # 공용 제한기 + 요청 마감 시간 (마감으로 못 기다리면 DeadlineExceeded)
+        await acall_llm()
+
+- 대기열(max_waiters, 클라이언트당 max_waiters_per_client)이 가득 차면 기다리지 않고 바로 Saturated
+- max_wait초 안에 자리를 못 받아도 Saturated
+- Saturated.retry_after: 다시 시도해 볼 만한 시간(초), 429 응답의 Retry-After에 사용
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+from services.deadline import Deadline, DeadlineExceeded, current, timeout_for
+
+
+class Saturated(RuntimeError):
+    """대기열이 가득 찼거나 대기 시간이 초과됨"""
+
+    def __init__(self, retry_after: float, reason: str = "queue_full"):
+        super().__init__(f"LLM 호출 대기열 포화({reason}), {retry_after:.1f}초 후 다시 시도")
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(True)
+
+
+class _Waiter:
+    __slots__ = ("client", "granted", "event", "loop", "future")
+
+    def __init__(self, client: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.client = client
+        self.granted = False
+        self.loop = loop
+        # 스레드 대기자는 Event, 이벤트 루프 대기자는 Future로 깨움
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def wake(self):
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+class Limiter:
+    """토큰 버킷 + max-in-flight 제한기 (스레드/이벤트 루프 모두에서 사용 가능)"""
+
+    def __init__(self, rate: float, burst: float = 1, max_in_flight: int = 4, max_waiters: int = 32,
+                 max_waiters_per_client: int = 4, max_wait: float = 10.0):
+        self.rate = float(rate)  # 초당 허용 호출 수 (0 이하면 동시 호출 수만 제한)
+        self.burst = max(1.0, float(burst))
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_waiters = max(0, int(max_waiters))
+        self.max_waiters_per_client = max(1, int(max_waiters_per_client))
+        self.max_wait = float(max_wait)
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._in_flight = 0
+        # 클라이언트 → 대기자 (맨 앞 클라이언트부터 한 명씩 배정 후 맨 뒤로)
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._waiting = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls, prefix: str, default_rate: float = 1.0) -> "Limiter":
+        """
+        환경변수로 생성: {prefix}_RATE_PER_SEC, {prefix}_BURST, {prefix}_MAX_IN_FLIGHT,
+        {prefix}_MAX_WAITERS, {prefix}_MAX_WAITERS_PER_CLIENT, {prefix}_MAX_WAIT_SEC
+        """
+        def env(name, default):
+            try:
+                return float(os.getenv(f"{prefix}_{name}", default))
+            except ValueError:
+                return float(default)
+
+        return cls(
+            rate=env("RATE_PER_SEC", default_rate),
+            burst=env("BURST", 2),
+            max_in_flight=int(env("MAX_IN_FLIGHT", 4)),
+            max_waiters=int(env("MAX_WAITERS", 32)),
+            max_waiters_per_client=int(env("MAX_WAITERS_PER_CLIENT", 4)),
+            max_wait=env("MAX_WAIT_SEC", 10),
+        )
+
+    # --- 내부 상태 (모두 lock 안에서 호출) ---
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def _can_admit(self) -> bool:
+        return self._in_flight < self.max_in_flight and (self.rate <= 0 or self._tokens >= 1)
+
+    def _take(self):
+        if self.rate > 0:
+            self._tokens -= 1
+        self._in_flight += 1
+
+    def _next_token_in(self) -> float:
+        if self.rate <= 0 or self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _retry_after(self) -> float:
+        if self.rate > 0:
+            # 앞선 대기자가 모두 토큰을 쓰고 난 뒤 내 차례가 오는 시간
+            wait = (self._waiting + 1 - self._tokens) / self.rate
+        else:
+            wait = 1.0
+        return round(max(0.1, wait), 1)
+
+    def _dispatch(self):
+        """대기열 앞(클라이언트 라운드로빈)부터 자리 배정"""
+        self._refill()
+        while self._queues and self._can_admit():
+            client, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            del self._queues[client]
+            if queue:
+                self._queues[client] = queue  # 다음 클라이언트 차례
+            self._waiting -= 1
+            self._take()
+            waiter.granted = True
+            waiter.wake()
+
+    def _idle_timeout(self) -> Optional[float]:
+        """다음 토큰이 생길 때까지 (슬롯이 비기를 기다리는 중이면 None: release가 깨움)"""
+        if self._in_flight >= self.max_in_flight:
+            return None
+        return self._next_token_in()
+
+    def _enqueue(self, client: str, loop=None) -> Optional[_Waiter]:
+        """바로 자리가 있으면 None(배정 완료), 없으면 대기자 등록"""
+        with self._lock:
+            self._refill()
+            if not self._queues and self._can_admit():
+                self._take()
+                return None
+            queue = self._queues.get(client)
+            if self._waiting >= self.max_waiters or (queue and len(queue) >= self.max_waiters_per_client):
+                self.rejected += 1
+                raise Saturated(self._retry_after())
+            waiter = _Waiter(client, loop)
+            self._queues.setdefault(client, deque()).append(waiter)
+            self._waiting += 1
+            return waiter
+
+    def _poll(self, waiter: _Waiter, deadline: float) -> Optional[float]:
+        """배정됐으면 None, 아니면 다시 확인할 때까지 기다릴 시간"""
+        with self._lock:
+            self._dispatch()
+            if waiter.granted:
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._remove(waiter)
+                self.rejected += 1
+                raise Saturated(self._retry_after(), "timeout")
+            idle = self._idle_timeout()
+            return remaining if idle is None else min(idle, remaining)
+
+    def _remove(self, waiter: _Waiter):
+        queue = self._queues.get(waiter.client)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self._waiting -= 1
+            if not queue:
+                del self._queues[waiter.client]
+
+    def _cancel(self, waiter: _Waiter):
+        """대기 중 취소: 이미 배정된 자리는 반납"""
+        with self._lock:
+            if waiter.granted:
+                self._in_flight -= 1
+                self._dispatch()
+            else:
+                self._remove(waiter)
+
+    # --- 공개 API ---
+
+    def release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def acquire_slot(self, client: str = "default", timeout: Optional[float] = None):
+        """자리를 받을 때까지 스레드 대기 (반드시 release() 호출)"""
+        waiter = self._enqueue(client)
+        if waiter is None:
+            return
+        deadline = time.monotonic() + (self.max_wait if timeout is None else timeout)
+        try:
+            while True:
+                delay = self._poll(waiter, deadline)
+                if delay is None:
+                    return
+                waiter.event.wait(delay)
+        except BaseException as e:
+            if not isinstance(e, Saturated):
+                self._cancel(waiter)
+            raise
+
+    async def acquire_slot_async(self, client: str = "default", timeout: Optional[float] = None):
+        """자리를 받을 때까지 이벤트 루프에서 대기 (반드시 release() 호출)"""
+        waiter = self._enqueue(client, asyncio.get_running_loop())
+        if waiter is None:
+            return
+        deadline = time.monotonic() + (self.max_wait if timeout is None else timeout)
+        try:
+            while True:
+                delay = self._poll(waiter, deadline)
+                if delay is None:
+                    return
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException as e:
+            if not isinstance(e, Saturated):
+                self._cancel(waiter)
+            raise
+
+    @contextlib.contextmanager
+    def acquire(self, client: str = "default", timeout: Optional[float] = None):
+        self.acquire_slot(client, timeout)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    @contextlib.asynccontextmanager
+    async def acquire_async(self, client: str = "default", timeout: Optional[float] = None):
+        await self.acquire_slot_async(client, timeout)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def reset(self):
+        """토큰을 가득 채우고 거절 수 초기화 (진행 중인 호출/대기자는 그대로)"""
+        with self._lock:
+            self._tokens = self.burst
+            self._stamp = time.monotonic()
+            self.rejected = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            self._refill()
+            return {
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "tokens": round(self._tokens, 2),
+                "rejected": self.rejected,
+            }
+
+
+_shared: Optional[Limiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_limiter() -> Limiter:
+    """
+    프로세스 공용 LLM 호출 제한기 (async 뷰, ai_assistant, apps.chat.llm의 모든 LLM 호출이 공유)
+
+    LLM_* 환경변수로 설정. LLM_RATE_PER_SEC 미설정 시 LLM_MIN_GAP_SEC(호출 최소 간격, 기본 0.8초) 기준으로 초당 호출 수 결정
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Limiter.from_env("LLM", default_rate=1 / max(float(os.getenv("LLM_MIN_GAP_SEC", "0.8")), 0.01))
+        return _shared
+
+
+@contextlib.asynccontextmanager
+async def llm_slot(client: str = "default", deadline: Optional[Deadline] = None):
+    """
+    공용 제한기에서 요청 마감 시간 안에 자리 받기 (async 뷰의 LLM 호출용)
+
+    마감 시간 때문에 못 기다린 경우는 Saturated가 아니라 DeadlineExceeded (429가 아니라 504)
+    """
+    limiter = get_limiter()
+    deadline = deadline or current()
+    try:
+        await limiter.acquire_slot_async(client, timeout=timeout_for(limiter.max_wait, deadline))
+    except Saturated:
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded(deadline.budget) from None
+        raise
+    try:
+        yield limiter
+    finally:
+        limiter.release()
@@ -0,0 +1,145 @@
+"""
+추측 실행(speculative prefetch) 작업 풀
+
+요약 응답을 보낸 직후 "자세히" 답변을 미리 만들어 응답 캐시에 넣어 두는 것처럼, 사용자가 곧 요청할 가능성이 높은
+작업을 백그라운드에서 실행합니다. 추측 작업이므로 자리가 없으면 기다리지 않고 버립니다.
+
+    from services.prefetch import get_prefetcher
+    get_prefetcher().submit(key, user, agenerate_detail, topic)   # 코루틴 함수 또는 일반 함수
+
+    # 같은 작업이 진행 중이면 LLM을 다시 부르지 말고 끝나기를 기다린 뒤 캐시 확인
+    await get_prefetcher().wait_async(key, timeout=10)
+
+- 작업은 전용 이벤트 루프 스레드에서 실행 (일반 함수는 그 루프의 스레드 풀에서). 요청 루프가 끝나도 계속됨
+- 동시에 실행되는 작업은 max_running개, 대기 포함 max_pending개까지. 넘치면 submit()이 False
+- 사용자(디바이스/IP)당 대기 포함 per_user개까지
+- 같은 key의 작업이 이미 있으면 새로 만들지 않음
+- 요청의 마감 시간(services.deadline)은 이어받지 않음 (응답을 보낸 뒤에도 끝까지 실행)
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+from services.clients import _env_int
+from services.deadline import scope as deadline_scope
+
+
+class _Job:
+    __slots__ = ("user", "done")
+
+    def __init__(self, user: str):
+        self.user = user
+        self.done = threading.Event()
+
+
+class Prefetcher:
+    def __init__(self, max_running: int = 2, max_pending: int = 8, per_user: int = 1):
+        self.max_running = max(1, int(max_running))
+        self.max_pending = max(self.max_running, int(max_pending))
+        self.per_user = max(1, int(per_user))
+
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, _Job] = {}
+        self._per_user: Counter = Counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.started = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        # lock 안에서 호출
+        if self._loop is None or self._loop.is_closed():
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                self._slots = asyncio.Semaphore(self.max_running)
+                ready.set()
+                loop.run_forever()
+
+            threading.Thread(target=run, name="prefetch", daemon=True).start()
+            ready.wait()
+            self._loop = loop
+        return self._loop
+
+    def submit(self, key: str, user: str, fn: Callable, *args) -> bool:
+        """작업 예약 (중복/한도 초과면 False)"""
+        with self._lock:
+            if key in self._jobs:
+                return False
+            if len(self._jobs) >= self.max_pending or self._per_user[user] >= self.per_user:
+                self.dropped += 1
+                return False
+            job = self._jobs[key] = _Job(user)
+            self._per_user[user] += 1
+            self.started += 1
+            loop = self._ensure_loop()
+        asyncio.run_coroutine_threadsafe(self._run(key, job, fn, args), loop)
+        return True
+
+    async def _run(self, key: str, job: _Job, fn: Callable, args: tuple):
+        try:
+            async with self._slots:
+                with deadline_scope(None):
+                    if asyncio.iscoroutinefunction(fn):
+                        await fn(*args)
+                    else:
+                        await asyncio.to_thread(fn, *args)
+        except Exception as e:
+            self.failed += 1
+            print(f"[Prefetch] {key} 실패: {e}")
+        finally:
+            with self._lock:
+                self._jobs.pop(key, None)
+                self._per_user[job.user] -= 1
+                if self._per_user[job.user] <= 0:
+                    del self._per_user[job.user]
+            job.done.set()
+
+    def pending(self, key: str) -> bool:
+        with self._lock:
+            return key in self._jobs
+
+    def wait(self, key: str, timeout: float) -> bool:
+        """key 작업이 있으면 끝날 때까지 대기. 작업이 없었거나 시간 안에 끝났으면 True"""
+        with self._lock:
+            job = self._jobs.get(key)
+        return job is None or job.done.wait(timeout)
+
+    async def wait_async(self, key: str, timeout: float) -> bool:
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None:
+            return True
+        return await asyncio.to_thread(job.done.wait, timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pending = len(self._jobs)
+        return {"pending": pending, "started": self.started, "dropped": self.dropped, "failed": self.failed}
+
+
+_prefetcher: Optional[Prefetcher] = None
+_lock = threading.Lock()
+
+
+def get_prefetcher() -> Prefetcher:
+    """
+    프로세스 공용 작업 풀
+
+    설정 (환경변수): PREFETCH_MAX_RUNNING (기본 2), PREFETCH_MAX_PENDING (기본 8), PREFETCH_PER_USER (기본 1)
+    """
+    global _prefetcher
+    with _lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher(
+                max_running=_env_int("PREFETCH_MAX_RUNNING", 2),
+                max_pending=_env_int("PREFETCH_MAX_PENDING", 8),
+                per_user=_env_int("PREFETCH_PER_USER", 1),
+            )
+        return _prefetcher
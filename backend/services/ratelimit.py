@@ -0,0 +1,201 @@
+"""
+요청 레이트리밋 (클라이언트별 토큰 버킷, 라우트별 정책)
+
+클라이언트(IP)마다 초당 rate개, 순간 burst개까지 요청을 허용합니다. 버킷 저장소는 크기가 제한되어 있어
+많은 IP가 한 번씩만 들어와도(스캔) 메모리/파일이 계속 커지지 않습니다.
+
+    from services.ratelimit import get_rate_limiter
+    decision = get_rate_limiter().check("chat_ask", ip)          # async 뷰에서는 await ....acheck(...)
+    if not decision.allowed:
+        return 429 (Retry-After: decision.retry_after)
+
+저장소 (settings.RATE_LIMIT_BACKEND):
+    memory  프로세스 내 LRU (기본). 최근에 쓴 max_keys개 버킷만 유지
+    sqlite  로컬 SQLite 파일을 워커들이 공유 (파일 잠금을 기다릴 수 있어 acheck()는 스레드에서 실행). PRUNE_EVERY번 호출마다 다시 가득 찬(만료된) 버킷을 삭제하고,
+            그래도 max_keys를 넘으면 오래된 것부터 삭제 (정리 사이에는 최대 max_keys + PRUNE_EVERY개)
+
+정책: settings.RATE_LIMITS = {"라우트": (rate, burst), ...}, 없는 라우트는 "default"
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+DEFAULT_POLICY = (1.0, 1)  # 기존 _ok_rate와 같은 IP당 1초에 1회
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    retry_after: float  # 거부됐을 때 다음 토큰까지 남은 시간 (초)
+    remaining: int
+
+
+def _take(tokens: float, stamp: float, rate: float, burst: float, now: float) -> Tuple[float, Decision]:
+    """버킷을 now 시점으로 채운 뒤 토큰 하나 사용 → (남은 토큰, 판정)"""
+    tokens = min(burst, tokens + max(0.0, now - stamp) * rate)
+    if tokens >= 1:
+        tokens -= 1
+        return tokens, Decision(True, 0.0, int(tokens))
+    return tokens, Decision(False, (1 - tokens) / rate if rate > 0 else 60.0, 0)
+
+
+def _full_at(tokens: float, rate: float, burst: float, now: float) -> float:
+    """버킷이 다시 가득 차는 시각 (이후에는 버킷이 없는 것과 같으므로 지워도 됨)"""
+    return now + (burst - tokens) / rate if rate > 0 else now + 3600
+
+
+class MemoryStore:
+    """프로세스 내 버킷 (LRU, 최대 max_keys개)"""
+
+    BLOCKING = False  # 이벤트 루프에서 바로 호출해도 됨
+
+    def __init__(self, max_keys: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max(1, int(max_keys))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # 키 → (토큰, 갱신 시각)
+
+    def take(self, key: str, rate: float, burst: float) -> Decision:
+        with self._lock:
+            now = self._clock()
+            tokens, stamp = self._buckets.pop(key, (burst, now))
+            tokens, decision = _take(tokens, stamp, rate, burst, now)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return decision
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteStore:
+    """
+    워커 간 공유 버킷 (로컬 SQLite 파일)
+
+    BEGIN IMMEDIATE 트랜잭션으로 읽기-계산-쓰기를 묶어 여러 프로세스가 같은 버킷을 동시에 갱신해도 안전합니다.
+    """
+
+    PRUNE_EVERY = 256  # 이 횟수마다 만료 버킷 삭제 + 최대 개수 유지
+    BLOCKING = True  # BEGIN IMMEDIATE가 다른 워커의 잠금을 최대 5초 기다림 → 이벤트 루프 밖에서
+
+    def __init__(self, path: str, max_keys: int = 10000, clock: Callable[[], float] = time.time):
+        self.path = str(path)
+        self.max_keys = max(1, int(max_keys))
+        self._clock = clock  # 프로세스 간 공유하므로 벽시계 시간
+        self._local = threading.local()  # 스레드별 연결
+        self._lock = threading.Lock()  # _calls
+        self._calls = 0
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS rate_buckets ("
+                     "key TEXT PRIMARY KEY, tokens REAL NOT NULL, stamp REAL NOT NULL, full_at REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS rate_buckets_full_at ON rate_buckets (full_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, rate: float, burst: float) -> Decision:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = self._clock()
+            row = conn.execute("SELECT tokens, stamp FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            tokens, stamp = row if row else (burst, now)
+            tokens, decision = _take(tokens, stamp, rate, burst, now)
+            conn.execute("INSERT OR REPLACE INTO rate_buckets (key, tokens, stamp, full_at) VALUES (?, ?, ?, ?)",
+                         (key, tokens, now, _full_at(tokens, rate, burst, now)))
+            with self._lock:
+                self._calls += 1
+                prune = self._calls % self.PRUNE_EVERY == 0
+            if prune:
+                self._prune(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return decision
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM rate_buckets WHERE full_at <= ?", (now,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM rate_buckets").fetchone()
+        if count > self.max_keys:
+            conn.execute("DELETE FROM rate_buckets WHERE key IN "
+                         "(SELECT key FROM rate_buckets ORDER BY stamp LIMIT ?)", (count - self.max_keys,))
+
+    def __len__(self) -> int:
+        (count,) = self._conn().execute("SELECT COUNT(*) FROM rate_buckets").fetchone()
+        return count
+
+    def clear(self):
+        self._conn().execute("DELETE FROM rate_buckets")
+
+
+class RateLimiter:
+    def __init__(self, store, policies: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.store = store
+        self.policies = dict(policies or {})
+        self._lock = threading.Lock()  # rejected
+        self.rejected = 0
+
+    def policy(self, route: str) -> Tuple[float, float]:
+        return self.policies.get(route) or self.policies.get("default") or DEFAULT_POLICY
+
+    def check(self, route: str, client: str) -> Decision:
+        rate, burst = self.policy(route)
+        decision = self.store.take(f"{route}:{client}", float(rate), max(1.0, float(burst)))
+        if not decision.allowed:
+            with self._lock:
+                self.rejected += 1
+        return decision
+
+    async def acheck(self, route: str, client: str) -> Decision:
+        """async 뷰용 check (블로킹 저장소는 스레드에서 실행해 다른 요청의 코루틴을 멈추지 않음)"""
+        if getattr(self.store, "BLOCKING", False):
+            return await asyncio.to_thread(self.check, route, client)
+        return self.check(route, client)
+
+    def reset(self):
+        self.store.clear()
+        with self._lock:
+            self.rejected = 0
+
+    def stats(self) -> Dict[str, object]:
+        return {"backend": type(self.store).__name__, "buckets": len(self.store), "rejected": self.rejected}
+
+
+_limiter: Optional[RateLimiter] = None
+_lock = threading.Lock()
+
+
+def build_rate_limiter() -> RateLimiter:
+    from django.conf import settings
+
+    max_keys = getattr(settings, "RATE_LIMIT_MAX_KEYS", 10000)
+    if getattr(settings, "RATE_LIMIT_BACKEND", "memory") == "sqlite":
+        store = SQLiteStore(settings.RATE_LIMIT_SQLITE_PATH, max_keys=max_keys)
+    else:
+        store = MemoryStore(max_keys=max_keys)
+    return RateLimiter(store, getattr(settings, "RATE_LIMITS", None))
+
+
+def get_rate_limiter() -> RateLimiter:
+    """프로세스 공용 레이트리미터 (settings 기준으로 한 번 생성)"""
+    global _limiter
+    with _lock:
+        if _limiter is None:
+            _limiter = build_rate_limiter()
+        return _limiter
@@ -0,0 +1,373 @@
+"""
+LLM 제공자 라우터 (지연 시간 기반 선택 + hedged request)
+
+제공자(OpenAI, Gemini)별 응답 시간을 EWMA와 최근 p95로 추적해 가장 빠른 정상 제공자에게 먼저 보내고,
+그 제공자가 자기 p95를 넘겨도 응답이 없으면 다음 제공자에게 같은 요청을 하나 더 보냅니다(hedge).
+먼저 성공한 응답을 쓰고 나머지 호출은 취소합니다. 실패하면 기다리지 않고 바로 다음 제공자로 넘어갑니다.
+서킷 브레이커(services.breaker)가 열린 제공자는 건너뛰고, 모두 열려 있으면 호출 없이 바로 CircuitOpen을 던집니다.
+
+    from services.router import get_router
+    answer = await get_router().complete(prompt)
+    async for delta in get_router().stream(prompt):   # 첫 조각까지만 hedge
+        ...
+    answer = await get_router().complete(prompt, system=system_prompt)  # 고정 지시문은 system으로 (Gemini 캐시)
+
+제공자는 API 키가 설정된 것만 등록됩니다 (OPENAI_API_KEY, GEMINI_API_KEY 또는 GOOGLE_API_KEY).
+모델: OPENAI_MODEL (기본 gpt-4o-mini), GEMINI_MODEL (기본 gemini-1.5-flash)
+제공자 호출 timeout은 LLM_TIMEOUT초, 요청 마감 시간(services.deadline)이 있으면 남은 시간까지
+hedge에 추월당해 취소된 제공자는 그때까지 걸린 시간을 하한값(censored) 샘플로 기록 (느려지면 순위가 내려감)
+hedge 대기: 샘플이 LLM_HEDGE_MIN_SAMPLES개 미만이면 LLM_HEDGE_DELAY초(기본 2), 이후에는 p95 (최소 LLM_HEDGE_MIN_DELAY초)
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from services.breaker import OVERTAKEN, CircuitBreaker, CircuitOpen, get_breaker
+from services.clients import (_env_float, _env_int, get_async_openai_client, get_client, get_gemini_model,
+                              run_outbound, stream_outbound)
+from services.deadline import timeout_for
+
+
+class AllProvidersFailed(RuntimeError):
+    pass
+
+
+class LatencyStats:
+    """제공자별 성공 응답 시간 EWMA / p95, 실패 수 (여러 스레드/루프에서 갱신)"""
+
+    def __init__(self, alpha: float = 0.2, window: int = 100):
+        self.alpha = alpha
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.ewma: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.censored = 0
+
+    def _add(self, seconds: float):
+        # lock 안에서 호출
+        self._samples.append(seconds)
+        self.ewma = seconds if self.ewma is None else self.alpha * seconds + (1 - self.alpha) * self.ewma
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._add(seconds)
+            self.successes += 1
+
+    def record_censored(self, seconds: float):
+        """끝나기 전에 취소된 호출: 적어도 seconds 걸렸다는 하한값을 샘플로 넣음 (성공 수는 세지 않음)"""
+        with self._lock:
+            self._add(seconds)
+            self.censored += 1
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+
+    @property
+    def samples(self) -> int:
+        return len(self._samples)
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def snapshot(self) -> Dict[str, object]:
+        p95 = self.p95()
+        return {
+            "ewma_ms": round(self.ewma * 1000) if self.ewma is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+            "samples": self.samples,
+            "successes": self.successes,
+            "failures": self.failures,
+            "censored": self.censored,
+        }
+
+
+class Provider:
+    def __init__(self, name: str, call: Callable[..., Awaitable[str]], model: Optional[str] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 stream: Optional[Callable[..., AsyncIterator[str]]] = None):
+        self.name = name
+        self.call = call  # async (prompt[, system]) -> 답변 텍스트
+        self.stream = stream  # (prompt[, system]) -> 텍스트 조각 async iterator (없으면 call 결과를 한 번에)
+        self.model = model
+        self.stats = LatencyStats()  # 전체 응답 시간
+        self.first_token = LatencyStats()  # 스트리밍 첫 조각까지 시간
+        self.breaker = breaker or CircuitBreaker(name)
+
+    def _args(self, prompt: str, system: Optional[str]) -> tuple:
+        # system이 없으면 예전처럼 (prompt)만 넘김
+        return (prompt,) if system is None else (prompt, system)
+
+    async def guarded_call(self, prompt: str, system: Optional[str] = None) -> str:
+        with self.breaker.guard():
+            return await self.call(*self._args(prompt, system))
+
+    async def guarded_stream(self, prompt: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        브레이커는 첫 조각까지만 판단 (긴 답변이 느린 호출로 집계되지 않도록)
+        """
+        self.breaker.before_call()
+        started = time.monotonic()
+        pending = True  # 브레이커에 아직 결과를 기록하지 않음
+        try:
+            if self.stream is None:
+                chunks = [await self.call(*self._args(prompt, system))]
+            else:
+                chunks = self.stream(*self._args(prompt, system))
+            async for chunk in _aiter(chunks):
+                if pending:
+                    self.breaker.record(time.monotonic() - started, failed=False)
+                    pending = False
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit) as e:
+            if pending:
+                self.breaker.cancelled(e, time.monotonic() - started)
+            raise
+        except BaseException:
+            if pending:
+                self.breaker.record(time.monotonic() - started, failed=True)
+            raise
+        if pending:
+            self.breaker.record(time.monotonic() - started, failed=False)
+
+
+async def _aiter(chunks):
+    if hasattr(chunks, "__aiter__"):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+class Router:
+    def __init__(self, providers: List[Provider], hedge_delay: float = 2.0, min_hedge_delay: float = 0.2,
+                 min_samples: int = 5):
+        self.providers = list(providers)
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.hedged = 0  # hedge 요청을 보낸 횟수
+
+    def ranked(self) -> List[Provider]:
+        """브레이커가 닫힌 제공자 중 EWMA가 낮은 순 (측정 전 제공자는 등록 순서대로 측정된 제공자 뒤에)"""
+        def key(item):
+            index, provider = item
+            ewma = provider.stats.ewma
+            return (ewma is None, ewma or 0.0, index)
+        available = [(i, p) for i, p in enumerate(self.providers) if p.breaker.available()]
+        return [p for _, p in sorted(available, key=key)]
+
+    def hedge_delay_for(self, provider: Provider, first_token: bool = False) -> float:
+        stats = provider.first_token if first_token else provider.stats
+        p95 = stats.p95()
+        if p95 is None or stats.samples < self.min_samples:
+            return self.hedge_delay
+        return max(self.min_hedge_delay, p95)
+
+    async def _race(self, start, first_token: bool = False):
+        """
+        start(provider) → (awaitable, handle)를 가장 빠른 제공자부터 실행하고,
+        p95를 넘기면 다음 제공자로 hedge, 실패하면 바로 다음 제공자로.
+        먼저 성공한 (provider, 결과, handle, 시작 시각) 반환, 나머지는 취소
+        """
+        if not self.providers:
+            raise AllProvidersFailed("사용 가능한 LLM 제공자가 없습니다")
+        queue = self.ranked()
+        if not queue:
+            # 모든 제공자의 브레이커가 열림 → 타임아웃을 기다리지 않고 바로 폴백
+            retry_after = min(p.breaker.stats()["retry_after"] for p in self.providers)
+            raise CircuitOpen("llm", retry_after)
+        loop = asyncio.get_running_loop()
+        running: Dict[asyncio.Future, tuple] = {}
+        errors: List[str] = []
+        hedge_at = 0.0
+        won_at = None  # 이긴 요청을 보낸 시각
+
+        def launch():
+            nonlocal hedge_at
+            provider = queue.pop(0)
+            started = loop.time()
+            awaitable, handle = start(provider)
+            running[asyncio.ensure_future(awaitable)] = (provider, handle, started)
+            hedge_at = started + self.hedge_delay_for(provider, first_token)
+
+        launch()
+        try:
+            while running:
+                timeout = max(0.0, hedge_at - loop.time()) if queue else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # 현재 제공자가 p95를 넘김 → 다음 제공자에게도 요청
+                    self.hedged += 1
+                    launch()
+                    continue
+                for task in done:
+                    provider, handle, started = running.pop(task)
+                    error = None if task.cancelled() else task.exception()
+                    if not task.cancelled() and error is None:
+                        won_at = started
+                        return provider, task.result(), handle, started
+                    if not isinstance(error, CircuitOpen):
+                        provider.stats.failure()
+                    errors.append(f"{provider.name}: {error or 'cancelled'}")
+                if queue and not running:
+                    launch()  # 실패하면 hedge 시간을 기다리지 않고 바로 다음 제공자
+        finally:
+            now = loop.time()
+            for task, (provider, _, started) in running.items():
+                if won_at is not None and started < won_at:
+                    # 나중에 보낸 hedge에 추월당함: 적어도 지금까지 걸렸다는 하한값으로 기록
+                    # (기록하지 않으면 오류 없이 느려진 제공자가 예전 EWMA로 계속 1순위)
+                    provider.stats.record_censored(now - started)
+                    if first_token:
+                        provider.first_token.record_censored(now - started)
+                    # 브레이커는 이미 slow_call_seconds를 넘긴 경우에만 느린 호출로 (services.breaker.OVERTAKEN)
+                    task.cancel(OVERTAKEN)
+                else:
+                    task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        raise AllProvidersFailed("; ".join(errors))
+
+    async def complete(self, prompt: str, system: Optional[str] = None) -> str:
+        """
+        가장 빠른 제공자부터 호출, p95를 넘기면 다음 제공자로 hedge. 먼저 성공한 답변 반환
+        system: 요청마다 같은 지시문 (OpenAI는 system 메시지, Gemini는 system_instruction)
+        """
+        provider, answer, _, started = await self._race(lambda p: (p.guarded_call(prompt, system), None))
+        provider.stats.record(asyncio.get_running_loop().time() - started)
+        return answer
+
+    async def stream(self, prompt: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        답변을 조각(delta) 단위로 전달. hedge/failover는 첫 조각이 올 때까지만 (이후에는 그 제공자로 확정)
+        """
+        def start(provider):
+            chunks = provider.guarded_stream(prompt, system)
+            return chunks.__anext__(), chunks
+
+        provider, first, chunks, started = await self._race(start, first_token=True)
+        loop = asyncio.get_running_loop()
+        provider.first_token.record(loop.time() - started)
+        try:
+            yield first
+            async for chunk in chunks:
+                yield chunk
+            provider.stats.record(loop.time() - started)
+        finally:
+            await chunks.aclose()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "hedged": self.hedged,
+            "providers": {p.name: {"model": p.model, **p.stats.snapshot(), "breaker": p.breaker.stats()}
+                          for p in self.providers},
+        }
+
+
+def _openai_provider() -> Provider:
+    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    timeout = _env_float("LLM_TIMEOUT", 30.0)
+
+    def _messages(prompt: str, system: Optional[str]) -> List[dict]:
+        messages = [{"role": "system", "content": system}] if system else []
+        return messages + [{"role": "user", "content": prompt}]
+
+    async def _call(prompt: str, system: Optional[str], seconds: float) -> str:
+        resp = await get_async_openai_client().chat.completions.create(
+            model=model,
+            messages=_messages(prompt, system),
+            timeout=seconds,
+        )
+        return resp.choices[0].message.content
+
+    async def _stream(prompt: str, system: Optional[str], seconds: float) -> AsyncIterator[str]:
+        chunks = await get_async_openai_client().chat.completions.create(
+            model=model,
+            messages=_messages(prompt, system),
+            stream=True,
+            timeout=seconds,
+        )
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    # 클라이언트 연결 풀은 전용 루프에 있으므로 호출도 전용 루프에서 (services.clients.run_outbound)
+    async def call(prompt: str, system: Optional[str] = None) -> str:
+        return await run_outbound(_call(prompt, system, timeout_for(timeout)))
+
+    def stream(prompt: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        seconds = timeout_for(timeout)
+        return stream_outbound(lambda: _stream(prompt, system, seconds))
+
+    return Provider("openai", call, model, get_breaker("openai"), stream)
+
+
+def _gemini_provider(api_key: str) -> Provider:
+    model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    timeout = _env_float("LLM_TIMEOUT", 30.0)
+
+    async def _call(prompt: str, system: Optional[str], seconds: float) -> str:
+        model = get_gemini_model(model_name, api_key, system_instruction=system)
+        resp = await model.generate_content_async(prompt, request_options={"timeout": seconds})
+        return resp.text
+
+    async def _stream(prompt: str, system: Optional[str], seconds: float) -> AsyncIterator[str]:
+        model = get_gemini_model(model_name, api_key, system_instruction=system)
+        chunks = await model.generate_content_async(prompt, stream=True, request_options={"timeout": seconds})
+        async for chunk in chunks:
+            try:
+                text = chunk.text
+            except ValueError:  # 안전 필터 등으로 텍스트가 없는 조각
+                continue
+            if text:
+                yield text
+
+    # grpc.aio 채널도 루프에 묶이므로 전용 루프에서
+    async def call(prompt: str, system: Optional[str] = None) -> str:
+        return await run_outbound(_call(prompt, system, timeout_for(timeout)))
+
+    def stream(prompt: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        seconds = timeout_for(timeout)
+        return stream_outbound(lambda: _stream(prompt, system, seconds))
+
+    return Provider("gemini", call, model_name, get_breaker("gemini"), stream)
+
+
+def build_router() -> Router:
+    """API 키가 설정된 제공자로 라우터 생성 (하나도 없으면 RuntimeError)"""
+    providers = []
+    if os.getenv("OPENAI_API_KEY"):
+        providers.append(_openai_provider())
+    gemini_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+    if gemini_key:
+        try:
+            import google.generativeai  # noqa: F401
+            providers.append(_gemini_provider(gemini_key))
+        except ImportError:
+            pass
+    if not providers:
+        raise RuntimeError("LLM API 키 미설정 (OPENAI_API_KEY 또는 GEMINI_API_KEY)")
+    return Router(
+        providers,
+        hedge_delay=_env_float("LLM_HEDGE_DELAY", 2.0),
+        min_hedge_delay=_env_float("LLM_HEDGE_MIN_DELAY", 0.2),
+        min_samples=_env_int("LLM_HEDGE_MIN_SAMPLES", 5),
+    )
+
+
+def get_router() -> Router:
+    """프로세스 공용 라우터 (services.clients 레지스트리에 보관, reload_config() 시 새로 생성)"""
+    return get_client("router")
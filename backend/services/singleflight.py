@@ -0,0 +1,136 @@
+"""
+동일 LLM 요청 single-flight
+
+교실에서 여러 학습자가 같은 질문을 동시에 보내면, 첫 요청(leader)만 실제로 OpenAI/Gemini를 호출하고
+나머지는 그 호출이 끝나기를 기다렸다가 같은 결과를 받습니다. (결과 캐시가 아니라 진행 중인 호출만 공유)
+
+    from services.singleflight import flight_key, group
+    result = group.do(flight_key("chat_ask", query), call_llm, query)
+
+    # async 뷰
+    result = await group.do_async(flight_key("chat_ask", query), acall_llm, query)
+
+- leader가 예외를 던지면 기다리던 요청들도 같은 예외를 받습니다.
+- do_async는 이벤트 루프가 달라도 공유합니다 (WSGI에서는 async 뷰마다 async_to_sync가 새 루프를 만듦).
+- leader의 요청이 취소되거나 마감 시간(services.deadline)을 넘으면 기다리던 요청 중 하나가 새 leader가 되어
+  다시 호출합니다. 기다리는 요청은 각자 자기 마감 시간까지만 기다립니다 (남은 시간이 많은 요청은 504를 받지 않음).
+- 공유 결과는 요청마다 deepcopy해서 돌려주므로 호출 측에서 수정해도 서로 영향이 없습니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import copy
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from services.deadline import DeadlineExceeded, wait_for
+
+
+def flight_key(namespace: str, *parts: Any) -> str:
+    """호출 식별 키 (인자를 JSON 직렬화해 해시)"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return f"{namespace}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class _LeaderCancelled(Exception):
+    """leader의 요청이 취소되거나 마감 시간을 넘음 (기다리던 요청은 새 leader를 뽑아 다시 시도)"""
+
+
+class SingleFlight:
+    """키별로 진행 중인 호출 하나를 공유"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # 루프 사이에서 기다릴 수 있도록 concurrent.futures.Future (결과는 각 루프로 전달됨)
+        self._async_calls: Dict[Hashable, concurrent.futures.Future] = {}
+        self.shared = 0  # 다른 요청의 결과를 받아 간 횟수
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return copy.deepcopy(call.result) if call.waiters else call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        while True:
+            with self._lock:
+                future = self._async_calls.get(key)
+                leader = future is None
+                if leader:
+                    future = self._async_calls[key] = concurrent.futures.Future()
+                else:
+                    self.shared += 1
+            if leader:
+                break
+            try:
+                # shield: 기다리던 요청이 취소되거나 자기 마감 시간을 넘어도 leader의 호출은 계속됨
+                return copy.deepcopy(await wait_for(asyncio.shield(asyncio.wrap_future(future))))
+            except _LeaderCancelled:
+                continue
+
+        try:
+            result = await fn(*args, **kwargs)
+        except (asyncio.CancelledError, DeadlineExceeded):
+            # leader 요청의 사정 (다른 요청은 아직 시간이 남았을 수 있음)
+            self._settle(key, future, error=_LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return copy.deepcopy(result)
+
+    def _settle(self, key: Hashable, future: concurrent.futures.Future, result: Any = None,
+                error: BaseException | None = None):
+        # 자리를 먼저 비워야 다시 시도하는 요청이 새 leader가 됨
+        with self._lock:
+            if self._async_calls.get(key) is future:
+                del self._async_calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
+
+
+# 프로세스 공용 그룹 (apps.chat.views, apps.chat.llm, services.ai, apps.chat.ai_assistant)
+group = SingleFlight()
@@ -0,0 +1,107 @@
+"""
+LLM 호출 토큰/지연 시간 집계 (엔드포인트별)
+
+어느 엔드포인트가 토큰(비용)과 시간을 쓰는지 보기 위해 호출마다 입력/출력 토큰과 걸린 시간을 기록합니다.
+제공자가 사용량을 알려주면(Gemini usage_metadata, OpenAI usage) 그 값을, 없으면 글자 수 추정치를 씁니다.
+
+    from services.usage import get_usage_meter
+    started = time.perf_counter()
+    response = model.generate_content(prompt)
+    get_usage_meter().record("ai_assistant.summary", prompt, response.text,
+                             time.perf_counter() - started, response=response)
+
+    get_usage_meter().stats()   # {"ai_assistant.summary": {"calls": 3, "tokens_in": ..., ...}, ...}
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """입력 토큰 수 대략치 (한국어는 대략 2글자당 1토큰)"""
+    return len(text) // 2 + 1
+
+
+def _usage_from_response(response) -> Optional[Tuple[int, int, int]]:
+    """제공자 응답의 (입력, 출력, 캐시된 입력) 토큰 수. 없으면 None"""
+    meta = getattr(response, "usage_metadata", None)  # Gemini
+    if meta is not None and getattr(meta, "prompt_token_count", None) is not None:
+        return (int(meta.prompt_token_count or 0), int(getattr(meta, "candidates_token_count", 0) or 0),
+                int(getattr(meta, "cached_content_token_count", 0) or 0))
+    usage = getattr(response, "usage", None)  # OpenAI
+    if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        return (int(usage.prompt_tokens or 0), int(getattr(usage, "completion_tokens", 0) or 0),
+                int(getattr(details, "cached_tokens", 0) or 0))
+    return None
+
+
+class _Endpoint:
+    __slots__ = ("calls", "tokens_in", "tokens_out", "cached", "estimated", "seconds", "latencies")
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.cached = 0
+        self.estimated = 0
+        self.seconds = 0.0
+        self.latencies: deque = deque(maxlen=window)
+
+
+class UsageMeter:
+    def __init__(self, window: int = 100):
+        self.window = window
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _Endpoint] = {}
+
+    def record(self, endpoint: str, prompt: str, text: str, seconds: float, response=None):
+        """호출 하나 기록 (response에 사용량이 있으면 그 값, 없으면 prompt/text 길이로 추정)"""
+        usage = _usage_from_response(response) if response is not None else None
+        estimated = usage is None
+        if estimated:
+            usage = (estimate_tokens(prompt or ""), estimate_tokens(text or ""), 0)
+        tokens_in, tokens_out, cached = usage
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = _Endpoint(self.window)
+            entry.calls += 1
+            entry.tokens_in += tokens_in
+            entry.tokens_out += tokens_out
+            entry.cached += cached
+            entry.estimated += estimated
+            entry.seconds += seconds
+            entry.latencies.append(seconds)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            out = {}
+            for name, entry in self._endpoints.items():
+                latencies = sorted(entry.latencies)
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                out[name] = {
+                    "calls": entry.calls,
+                    "tokens_in": entry.tokens_in,
+                    "tokens_out": entry.tokens_out,
+                    "cached_tokens": entry.cached,
+                    "estimated_calls": entry.estimated,  # 제공자 사용량 없이 추정한 호출 수
+                    "avg_tokens_in": round(entry.tokens_in / entry.calls, 1),
+                    "avg_latency_ms": round(entry.seconds / entry.calls * 1000, 1),
+                    "p95_latency_ms": round(p95 * 1000, 1),
+                }
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+_meter = UsageMeter()
+
+
+def get_usage_meter() -> UsageMeter:
+    """프로세스 공용 집계기"""
+    return _meter
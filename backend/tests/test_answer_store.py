@@ -0,0 +1,103 @@
+"""
+로컬 답변 저장소(services.answer_store, chat_ask / ai_assistant 우회) 테스트
+"""
+import asyncio
+import json
+import unittest
+from unittest import mock
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.test import AsyncClient, RequestFactory
+
+from apps.chat import ai_assistant, views
+from services.answer_store import AnswerStore, get_answer_store, load_answers
+from services.limiter import get_limiter
+from services.ratelimit import get_rate_limiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAnswerStore(unittest.TestCase):
+
+    def test_curated_answers_match_paraphrases_only(self):
+        store = AnswerStore(load_answers())
+        self.assertEqual(store.lookup("점자 어떻게 읽어?").id, "braille_basics")
+        self.assertEqual(store.lookup("음성 명령 알려줘").id, "voice_commands")
+        for query in ("자세히 알려줘", "블록체인 설명해줘", "점자 프린터 추천해줘", "다음"):
+            self.assertIsNone(store.lookup(query), query)
+        self.assertEqual(store.stats()["hits"], 2)
+
+    def test_learned_answers_expire_and_are_bounded(self):
+        clock = Clock()
+        store = AnswerStore(learned_ttl=60, max_learned=1, clock=clock)
+        self.assertFalse(store.learn("오늘 날씨", "맑아요"))  # 한 줄짜리 답변은 학습하지 않음
+        self.assertTrue(store.learn("오늘 날씨 알려줘", "• 맑아요\n• 낮 20도", ["날씨"]))
+        match = store.lookup("오늘 날씨는 어때?")
+        self.assertEqual((match.source, match.keywords), ("learned", ["날씨"]))
+        self.assertIsNone(store.lookup("내일 날씨 알려줘"))
+
+        store.learn("오늘 뉴스 알려줘", "• 뉴스 1\n• 뉴스 2")
+        self.assertIsNone(store.lookup("오늘 날씨"))  # max_learned=1 → 먼저 학습한 답변 삭제
+        clock.now = 61
+        self.assertIsNone(store.search("오늘 뉴스"))
+        self.assertEqual(store.stats()["learned"], 0)
+
+    def test_learned_answers_need_the_same_question(self):
+        answer = "• 첫 줄\n• 둘째 줄"
+        for fuzzy in (False, True):
+            store = AnswerStore(fuzzy_learned=fuzzy)
+            store.learn("비트코인 가격이 내릴까", answer)
+            store.learn("블록체인이 뭐야", answer)
+            # 서술어가 다르거나 질문에 없는 단어가 있으면 다른 질문
+            self.assertIsNone(store.lookup("비트코인 가격이 오를까"), fuzzy)
+            self.assertIsNone(store.lookup("블록체인 단점이 뭐야"), fuzzy)
+            self.assertEqual(store.lookup("블록체인은 뭐예요?").score, 1.0)
+
+
+class TestLocalAnswers(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_rate_limiter().reset()
+        get_limiter().reset()
+        get_answer_store().clear_learned()
+
+    def post(self, path, payload):
+        async def run():
+            return await AsyncClient().post(path, data=json.dumps(payload), content_type="application/json")
+        return asyncio.run(run())
+
+    def test_frequent_questions_skip_the_llm(self):
+        with mock.patch.object(views, "_get_llm", side_effect=AssertionError("LLM 호출됨")):
+            response = self.post("/api/chat/ask/", {"query": "점자는 어떻게 읽어요?"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Answer-Store"], "curated")
+        self.assertEqual(response.json()["keywords"], ["점자", "점", "칸"])
+
+        with mock.patch.object(ai_assistant, "_get_llm", side_effect=AssertionError("모델 호출됨")):
+            request = RequestFactory().post("/", data=json.dumps({"q": "음성 명령 알려줘", "format": "ai_assistant"}),
+                                            content_type="application/json")
+            response = asyncio.run(ai_assistant.ai_assistant_view(request))
+        data = json.loads(response.content)
+        self.assertEqual(data["meta"]["source"], "answer_store:curated")
+        self.assertEqual(len(data["bullets"]), 3)
+        self.assertEqual(data["keywords"], ["음성", "명령", "로고"])
+
+
+if __name__ == '__main__':
+    unittest.main()
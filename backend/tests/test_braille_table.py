@@ -0,0 +1,53 @@
+"""
+라즈베리파이 로컬 인코더(braille_table.json) 테스트
+"""
+import json
+import unittest
+import sys
+import os
+
+# 프로젝트 루트와 raspberrypi 디렉토리를 Python 경로에 추가
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PI_DIR = os.path.abspath(os.path.join(BACKEND_DIR, '..', 'raspberrypi'))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, PI_DIR)
+
+from utils.encode_hangul import compile_table, encode_char, text_to_packets
+from braille_encoder import BrailleTable, TABLE_PATH, packets_to_bytes
+
+
+class TestBrailleTable(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = BrailleTable.load()
+
+    def test_table_is_up_to_date(self):
+        """커밋된 braille_table.json이 ko_braille.json과 일치하는지 (scripts/build_braille_table.py 재실행 필요 여부)"""
+        with open(TABLE_PATH, "r", encoding="utf-8") as f:
+            committed = json.load(f)
+        self.assertEqual(committed, json.loads(json.dumps(compile_table(), ensure_ascii=False)))
+
+    def test_all_syllables_match_backend(self):
+        """완성형 한글 11172자 전체가 backend 인코더와 동일한지"""
+        for code in range(0xAC00, 0xD7A4):
+            ch = chr(code)
+            self.assertEqual(self.table.encode_char(ch), encode_char(ch), ch)
+
+    def test_jamo_and_punctuation_match_backend(self):
+        """자모/구두점/알 수 없는 문자"""
+        for ch in list(self.table.chars) + list("aZ09~"):
+            self.assertEqual(self.table.encode_char(ch), encode_char(ch), ch)
+
+    def test_text_to_packets(self):
+        """문장 단위 인코딩"""
+        text = "안녕하세요, 점글이입니다!"
+        self.assertEqual(self.table.text_to_packets(text), text_to_packets(text))
+
+    def test_packets_to_bytes(self):
+        """Serial 바이트열은 CMD, PATTERN 순서"""
+        self.assertEqual(packets_to_bytes([(0x80, 0x08), (0x81, 0x23)]), bytes([0x80, 0x08, 0x81, 0x23]))
+
+
+if __name__ == '__main__':
+    unittest.main()
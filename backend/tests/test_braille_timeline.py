@@ -0,0 +1,64 @@
+"""
+점자 재생 타임라인(utils.braille_timeline) 테스트
+"""
+import json
+import unittest
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.test import Client
+from django.core.cache import cache
+
+from utils.braille_timeline import _cache_key, build_timeline, contraction_weight, get_timeline
+from utils.encode_hangul import text_to_pages
+
+
+class TestBrailleTimeline(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_frames_follow_encoded_pages(self):
+        timeline = build_timeline("학교에 갑니다.")
+        self.assertEqual([f["packets"] for f in timeline["frames"]],
+                         [[list(p) for p in page] for page in text_to_pages("학교에 갑니다.")])
+        self.assertEqual(timeline["frames"][-1]["text"], "다.")
+        # at_ms는 앞 프레임 dwell의 누적
+        at = 0
+        for frame in timeline["frames"]:
+            self.assertEqual(frame["at_ms"], at)
+            at += frame["dwell_ms"]
+        self.assertEqual(timeline["total_ms"], at)
+
+    def test_dwell_scales_with_density_and_profile(self):
+        sparse = build_timeline("ㄱ")["frames"][0]["dwell_ms"]
+        dense = build_timeline("각")["frames"][0]["dwell_ms"]
+        self.assertGreater(dense, sparse)
+        self.assertGreater(build_timeline("각", "slow")["total_ms"], build_timeline("각", "fast")["total_ms"])
+        self.assertGreater(contraction_weight("까"), contraction_weight("가"))
+
+    def test_timeline_is_cached(self):
+        first = get_timeline("가나다")
+        self.assertEqual(cache.get(_cache_key("가나다", "normal", 3)), first)
+        self.assertEqual(get_timeline("가나다"), first)
+
+    def test_endpoint(self):
+        client = Client()
+        response = client.post("/api/braille/timeline/", data=json.dumps({"text": "가나", "profile": "fast"}),
+                               content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["profile"], "fast")
+        response = client.post("/api/braille/timeline/", data=json.dumps({"text": "가", "profile": "warp"}),
+                               content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+chat_ask / chat_detail 응답 캐시(apps.chat.cache) 테스트
+"""
+import json
+import unittest
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.test import Client
+
+from apps.chat import cache as response_cache
+
+
+class TestChatCache(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_normalize_query(self):
+        self.assertEqual(response_cache.normalize_query("  오늘   뉴스?! "), "오늘 뉴스")
+        # NFD로 들어온 한글도 같은 키
+        import unicodedata
+        self.assertEqual(response_cache.cache_key("ask", unicodedata.normalize("NFD", "날씨 알려줘")),
+                         response_cache.cache_key("ask", "날씨, 알려줘."))
+        self.assertNotEqual(response_cache.cache_key("ask", "날씨"), response_cache.cache_key("detail", "날씨"))
+        # 기호는 질문의 일부
+        keys = {response_cache.normalize_query(q) for q in ("C++ 배우기", "C# 배우기", "C 배우기")}
+        self.assertEqual(keys, {"c++ 배우기", "c# 배우기", "c 배우기"})
+        self.assertEqual(response_cache.normalize_query("#뉴스 10°C 이상?"), "뉴스 10°c 이상")
+
+    def test_hit_skips_llm_and_rate_limit(self):
+        response_cache.set_cached("ask", "오늘 뉴스", {"answer": "• 뉴스", "keywords": ["뉴스"]})
+        client = Client()
+        for _ in range(3):  # 레이트리밋(1초) 안에 반복해도 캐시 응답
+            response = client.post("/api/chat/ask/", data=json.dumps({"query": "오늘  뉴스!"}),
+                                   content_type="application/json")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["X-Cache"], "HIT")
+            self.assertEqual(response.json()["keywords"], ["뉴스"])
+        self.assertEqual(response_cache.stats()["ask"]["hits"], 3)
+
+    def test_async_views_stay_csrf_exempt(self):
+        from asgiref.sync import iscoroutinefunction
+        from apps.chat import views
+
+        self.assertTrue(iscoroutinefunction(views.chat_ask))
+        response_cache.set_cached("detail", "블록체인", {"answer": "설명", "keywords": [], "mode": "detail"})
+        response = Client(enforce_csrf_checks=True).post(
+            "/api/chat/detail/", data=json.dumps({"topic": "블록체인"}), content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_miss_is_counted(self):
+        self.assertIsNone(response_cache.get_cached("detail", "블록체인"))
+        stats = response_cache.stats()["detail"]
+        self.assertEqual((stats["hits"], stats["misses"]), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
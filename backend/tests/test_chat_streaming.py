@@ -0,0 +1,123 @@
+"""
+채팅 SSE 스트리밍(apps.chat.streaming, chat_ask stream 모드) 테스트
+"""
+import asyncio
+import json
+import unittest
+from unittest import mock
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.test import AsyncClient
+
+from apps.chat import views
+from services.answer_store import get_answer_store
+from services.limiter import get_limiter
+from services.ratelimit import get_rate_limiter
+from apps.chat.streaming import AnswerLineParser
+from utils.encode_hangul import text_to_pages
+
+ANSWER = "• 오늘은 맑아요\n• 낮 기온은 20도\n\n키워드: 날씨, 맑음, 기온"
+
+
+def chunks(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class FakeLLM:
+    def __init__(self, text):
+        self.text = text
+
+    async def stream(self, prompt):
+        for chunk in chunks(self.text):
+            yield chunk
+
+
+class TestParsers(unittest.TestCase):
+
+    def test_bullets_are_emitted_as_lines_complete(self):
+        parser = AnswerLineParser()
+        events = []
+        # 첫 줄이 끝나면 바로 첫 불릿
+        self.assertEqual(parser.feed("• 오늘은 맑아요\n• 낮"), [("bullet", {"index": 0, "text": "오늘은 맑아요"})])
+        parser = AnswerLineParser()
+        for chunk in chunks(ANSWER):
+            events.extend(parser.feed(chunk))
+        events.extend(parser.close())
+        self.assertEqual(events, [
+            ("bullet", {"index": 0, "text": "오늘은 맑아요"}),
+            ("bullet", {"index": 1, "text": "낮 기온은 20도"}),
+            ("keyword", {"index": 0, "word": "날씨"}),
+            ("keyword", {"index": 1, "word": "맑음"}),
+            ("keyword", {"index": 2, "word": "기온"}),
+            ("keywords", {"keywords": ["날씨", "맑음", "기온"]}),
+        ])
+        self.assertEqual(parser.answer, "• 오늘은 맑아요\n• 낮 기온은 20도")
+
+    def test_keywords_are_emitted_one_by_one(self):
+        # 줄이 끝나기 전에도 완성된 키워드부터
+        parser = AnswerLineParser()
+        self.assertEqual(parser.feed("키워드: 날씨, 맑"), [("keyword", {"index": 0, "word": "날씨"})])
+        self.assertEqual(parser.feed("음, 기"), [("keyword", {"index": 1, "word": "맑음"})])
+
+
+class TestChatAskStream(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_rate_limiter().reset()
+        get_limiter().reset()
+        get_answer_store().clear_learned()
+
+    def post(self):
+        async def run():
+            response = await AsyncClient().post("/api/chat/ask/", data=json.dumps({"query": "날씨", "stream": True}),
+                                                content_type="application/json")
+            body = b"".join([chunk async for chunk in response.streaming_content]).decode("utf-8")
+            return response, body
+        return asyncio.run(run())
+
+    def test_stream_events_and_cache(self):
+        with mock.patch.object(views, "_get_llm", return_value=FakeLLM(ANSWER)):
+            response, body = self.post()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = parse_sse(body)
+        self.assertEqual([name for name, _ in events],
+                         ["bullet", "bullet", "braille", "braille", "braille", "keywords", "done"])
+        self.assertEqual(events[2][1]["word"], "날씨")
+        self.assertEqual(events[2][1]["pages"], [[list(p) for p in page] for page in text_to_pages("날씨", 3)])
+        self.assertEqual(events[-1][1], {"answer": "• 오늘은 맑아요\n• 낮 기온은 20도",
+                                         "keywords": ["날씨", "맑음", "기온"]})
+
+        # 같은 질문은 캐시에서 같은 이벤트로
+        response, body = self.post()
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(parse_sse(body), events)
+
+    def test_keywords_fall_back_to_local_extraction(self):
+        # LLM이 키워드 줄을 주지 않으면(CHAT_KEYWORDS_SOURCE=local 포함) 답변에서 추출
+        with mock.patch.object(views, "_get_llm", return_value=FakeLLM("• 정부가 물가 대책을 발표했어요\n• 물가 안정이 목표예요")):
+            _, body = self.post()
+        events = parse_sse(body)
+        self.assertEqual([name for name, _ in events][-3:], ["braille", "keywords", "done"])
+        self.assertEqual(events[-1][1]["keywords"], ["물가", "날씨", "정부"])  # 질문("날씨") 가중
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+서킷 브레이커(services.breaker) 테스트
+"""
+import asyncio
+import time
+import unittest
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from services.router import Provider, Router
+
+
+def fail(breaker):
+    try:
+        with breaker.guard():
+            raise TimeoutError("deadline")
+    except TimeoutError:
+        pass
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_on_error_rate_and_rejects_fast(self):
+        breaker = CircuitBreaker("gemini", window=10, min_calls=4, failure_rate=0.5, open_seconds=30)
+        for _ in range(2):
+            with breaker.guard():
+                pass
+        fail(breaker)
+        self.assertEqual(breaker.state, CLOSED)
+        fail(breaker)  # 4개 중 2개 실패
+        self.assertEqual(breaker.state, OPEN)
+
+        started = time.perf_counter()
+        with self.assertRaises(CircuitOpen) as ctx:
+            with breaker.guard():
+                self.fail("열린 동안은 호출하지 않아야 함")
+        self.assertLess(time.perf_counter() - started, 0.001)
+        self.assertGreater(ctx.exception.retry_after, 29)
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker("openai", min_calls=2, slow_call_seconds=0.01)
+        for _ in range(2):
+            breaker.record(0.5, failed=False)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_half_open_allows_one_probe(self):
+        breaker = CircuitBreaker("gemini", min_calls=1, open_seconds=0.05)
+        fail(breaker)
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.before_call()
+        self.assertFalse(breaker.available())  # 시험 호출 진행 중에는 다른 요청 차단
+        breaker.record(0.1, failed=False)
+        self.assertEqual(breaker.state, CLOSED)
+
+        fail(breaker)
+        time.sleep(0.06)
+        fail(breaker)  # 시험 호출 실패 → 다시 OPEN
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_router_skips_open_provider_and_fails_fast_when_all_open(self):
+        calls = []
+
+        async def answer(prompt):
+            calls.append(prompt)
+            return "ok"
+
+        down = Provider("down", answer, breaker=CircuitBreaker("down", min_calls=1))
+        up = Provider("up", answer, breaker=CircuitBreaker("up", min_calls=1))
+        fail(down.breaker)
+        router = Router([down, up])
+        self.assertEqual([p.name for p in router.ranked()], ["up"])
+        self.assertEqual(asyncio.run(router.complete("q")), "ok")
+
+        fail(up.breaker)
+        with self.assertRaises(CircuitOpen):
+            asyncio.run(router.complete("q"))
+        self.assertEqual(len(calls), 1)
+
+
+    def test_overtaken_hedge_loser_counts_only_when_really_slow(self):
+        async def slow(prompt):
+            await asyncio.sleep(1.0)
+            return "slow"
+
+        async def fast(prompt):
+            return "fast"
+
+        for slow_call_seconds, state, calls in ((5, CLOSED, 0), (0.01, OPEN, 1)):
+            primary = Provider("primary", slow, breaker=CircuitBreaker("primary", min_calls=1,
+                                                                       slow_call_seconds=slow_call_seconds))
+            router = Router([primary, Provider("backup", fast)], hedge_delay=0.05)
+            self.assertEqual(asyncio.run(router.complete("q")), "fast")
+            # hedge에 졌다고 느린 호출은 아님: 실제 걸린 시간이 slow_call_seconds를 넘었을 때만 기록
+            self.assertEqual(primary.breaker.state, state)
+            self.assertEqual(primary.breaker.stats()["calls"], calls)
+
+if __name__ == '__main__':
+    unittest.main()
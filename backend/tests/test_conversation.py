@@ -0,0 +1,112 @@
+"""
+서버 측 대화 기억(services.conversation) 테스트
+"""
+import unittest
+import sys
+import os
+from unittest import mock
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from apps.chat import llm
+from services.conversation import SUMMARY_PREFIX, ConversationStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestConversationStore(unittest.TestCase):
+
+    def test_old_turns_fold_into_summary_within_budget(self):
+        calls = []
+
+        def summarizer(summary, turns):
+            calls.append(len(turns))
+            return f"{summary}+{len(turns)}"
+
+        store = ConversationStore(token_budget=100, keep_turns=2, summary_tokens=20, summarizer=summarizer)
+        for i in range(50):
+            store.append("s1", f"질문 {i} " + "가" * 40, f"답변 {i} " + "나" * 40)
+            history = store.history("s1")
+            self.assertLessEqual(len(history), 2 + 4)  # 요약 한 쌍 + 최근 턴 (예산 안)
+
+        self.assertTrue(history[0]["content"].startswith(SUMMARY_PREFIX))
+        self.assertEqual(history[0]["role"], "user")
+        self.assertEqual(history[-1]["content"], "답변 49 " + "나" * 40)
+        self.assertTrue(all(count % 2 == 0 for count in calls))
+        self.assertLessEqual(len(history[0]["content"]), len(SUMMARY_PREFIX) + 40)
+
+    def test_summarizer_failure_uses_local_summary(self):
+        def broken(summary, turns):
+            raise RuntimeError("down")
+
+        store = ConversationStore(token_budget=10, keep_turns=0, summarizer=broken)
+        store.append("s1", "블록체인이 뭐야", "분산 장부 기술입니다")
+        self.assertIn("사용자: 블록체인이 뭐야", store.history("s1")[0]["content"])
+
+    def test_background_compaction_does_not_delay_append(self):
+        jobs = []
+        store = ConversationStore(token_budget=10, keep_turns=0, background=lambda session_id, fn: jobs.append(fn))
+        store.append("s1", "블록체인이 뭐야", "분산 장부 기술입니다")
+        # append는 요약을 기다리지 않음
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(store.stats()["compactions"], 0)
+        self.assertEqual(store.history("s1")[0]["content"], "블록체인이 뭐야")
+
+        jobs.pop()()
+        self.assertEqual(store.stats()["compactions"], 1)
+        self.assertTrue(store.history("s1")[0]["content"].startswith(SUMMARY_PREFIX))
+
+    def test_ttl_and_lru(self):
+        clock = Clock()
+        store = ConversationStore(max_sessions=2, ttl=60, clock=clock)
+        store.seed("a", [{"role": "user", "content": "안녕"}, {"role": "assistant", "content": "안녕하세요"}])
+        store.append("b", "질문", "답변")
+        clock.now = 30
+        self.assertTrue(store.has("a"))   # a 사용 → b가 가장 오래됨
+        store.append("c", "질문", "답변")
+        self.assertFalse(store.has("b"))
+        self.assertEqual(len(store.history("a")), 2)
+
+        clock.now = 200
+        self.assertEqual(store.history("a"), [])
+        self.assertEqual(store.stats()["expired"], 1)
+
+
+class FakeRouter:
+    providers = []
+
+    def __init__(self):
+        self.calls = []
+
+    def ranked(self):
+        return [object()]
+
+    async def complete(self, prompt, system=None):
+        self.calls.append((system, prompt))
+        return " 답변 "
+
+
+class TestRoutedReplies(unittest.TestCase):
+
+    def test_reply_and_summary_go_through_router(self):
+        router = FakeRouter()
+        history = [{"role": "user", "content": "블록체인이 뭐야"}, {"role": "assistant", "content": "분산 장부"}]
+        with mock.patch.object(llm, "_get_llm", return_value=router):
+            self.assertEqual(llm._generate_reply("장점은?", history), "답변")
+            self.assertEqual(llm.summarize_turns("", history), "답변")
+        (system, prompt), (summary_system, summary_prompt) = router.calls
+        self.assertEqual(system, llm.SYSTEM_PROMPT)
+        self.assertEqual(prompt, "이전 대화:\n사용자: 블록체인이 뭐야\n도우미: 분산 장부\n\n사용자: 장점은?")
+        self.assertEqual(summary_system, llm.SUMMARY_PROMPT)
+        self.assertIn("도우미: 분산 장부", summary_prompt)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+요청 마감 시간(services.deadline, RequestDeadline 미들웨어) 테스트
+"""
+import asyncio
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.test import AsyncClient, override_settings
+
+from apps.chat import cache as response_cache
+from apps.chat import views
+from services.answer_store import get_answer_store
+from services.deadline import Deadline, DeadlineExceeded, bind, current, scope, timeout_for
+from services.limiter import get_limiter
+from services.ratelimit import get_rate_limiter
+
+KEYS = {"OPENAI_API_KEY": "sk-test", "NAVER_CLIENT_ID": "id", "NAVER_CLIENT_SECRET": "secret"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowLLM:
+    """첫 줄은 바로, 나머지는 delay초 뒤에"""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def complete(self, prompt):
+        await asyncio.sleep(self.delay)
+        return "• 늦은 답변\n• 두 번째 줄"
+
+    async def stream(self, prompt):
+        yield "• 오늘은 맑아요\n"
+        await asyncio.sleep(self.delay)
+        yield "• 낮 기온은 20도\n"
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_timeout_is_capped_by_remaining_budget(self):
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+        self.assertEqual(timeout_for(6, deadline), 6)
+        clock.now += 7
+        self.assertEqual(timeout_for(6, deadline), 3)
+        clock.now += 3
+        self.assertTrue(deadline.expired)
+        with self.assertRaises(DeadlineExceeded):
+            timeout_for(6, deadline)
+
+    def test_no_deadline_uses_default(self):
+        self.assertIsNone(current())
+        self.assertEqual(timeout_for(6), 6)
+
+    def test_bind_carries_deadline_into_threads(self):
+        seen = []
+        with scope(Deadline(5)) as deadline:
+            worker = bind(lambda: seen.append(current()))
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(seen, [deadline])
+
+
+@mock.patch.dict(os.environ, KEYS)
+class TestRequestDeadline(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_rate_limiter().reset()
+        get_limiter().reset()
+        get_answer_store().clear_learned()
+
+    def post(self, body):
+        async def run():
+            response = await AsyncClient().post("/api/chat/ask/", data=json.dumps(body), content_type="application/json")
+            if response.streaming:
+                return response, b"".join([chunk async for chunk in response.streaming_content]).decode("utf-8")
+            return response, response.content.decode("utf-8")
+        return asyncio.run(run())
+
+    @override_settings(REQUEST_DEADLINES={"chat_ask": 0.1})
+    def test_llm_call_is_cut_at_route_deadline(self):
+        started = time.monotonic()
+        with mock.patch.object(views, "_get_llm", return_value=SlowLLM(1.0)):
+            response, body = self.post({"query": "느린 질문"})
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(json.loads(body)["error"], "deadline_exceeded")
+
+    @override_settings(REQUEST_DEADLINES={"chat_ask": 0.1})
+    def test_stream_returns_partial_answer(self):
+        with mock.patch.object(views, "_get_llm", return_value=SlowLLM(1.0)):
+            _, body = self.post({"query": "느린 질문", "stream": True})
+        done = json.loads(body.strip().split("\n\n")[-1].split("data: ", 1)[1])
+        self.assertEqual(done["answer"], "• 오늘은 맑아요")
+        self.assertTrue(done["partial"])
+        # 잘린 답변은 캐시하지 않음
+        self.assertIsNone(response_cache.get_cached("ask", "느린 질문"))
+
+    @override_settings(REQUEST_DEADLINES={"explore": 0.1})
+    def test_explore_fan_out_uses_route_deadline(self):
+        async def slow_answer(query, client="default"):
+            await asyncio.sleep(0.3)
+            return "늦은 설명"
+
+        async def fast_news(query, client_id, client_secret):
+            return [{"title": "뉴스"}]
+
+        with mock.patch.object(views, "_explore_answer", slow_answer), \
+                mock.patch.object(views, "_explore_news", fast_news):
+            data = asyncio.run(AsyncClient().get("/api/chat/explore/?q=날씨")).json()
+        self.assertEqual(data["news"], [{"title": "뉴스"}])
+        self.assertEqual(data["timed_out"], ["answer"])
+
+
+if __name__ == '__main__':
+    unittest.main()
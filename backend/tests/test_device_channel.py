@@ -0,0 +1,146 @@
+"""
+디바이스 WebSocket 채널(apps.braille.channel) 테스트
+ASGI application에 websocket scope를 직접 넣어 검증
+"""
+import asyncio
+import json
+import threading
+import unittest
+import sys
+import os
+from unittest import mock
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.test import RequestFactory, override_settings
+
+from apps.braille import channel
+from apps.newsfeed.views import news_feed
+from utils.encode_hangul import text_to_pages
+
+
+class WebSocketClient:
+    """ASGI websocket 대화 상대"""
+
+    def __init__(self, path, query_string=b""):
+        self.scope = {"type": "websocket", "path": path, "query_string": query_string, "headers": []}
+        self.inbox = asyncio.Queue()
+        self.outbox = asyncio.Queue()
+
+    async def receive(self):
+        return await self.inbox.get()
+
+    async def send(self, event):
+        await self.outbox.put(event)
+
+    async def next_event(self):
+        return await asyncio.wait_for(self.outbox.get(), 2.0)
+
+    async def next_message(self):
+        event = await self.next_event()
+        return json.loads(event["text"])
+
+
+class TestDeviceChannel(unittest.TestCase):
+
+    def run_session(self, path, body, query_string=b""):
+        from jeomgeuli_backend.asgi import application
+
+        async def main():
+            client = WebSocketClient(path, query_string)
+            await client.inbox.put({"type": "websocket.connect"})
+            task = asyncio.create_task(application(client.scope, client.receive, client.send))
+            try:
+                return await body(client)
+            finally:
+                await client.inbox.put({"type": "websocket.disconnect"})
+                await asyncio.wait_for(task, 2.0)
+
+        return asyncio.run(main())
+
+    def test_text_to_pages_keeps_syllables_together(self):
+        pages = text_to_pages("각 가나.")
+        self.assertTrue(all(len(page) <= 3 for page in pages))
+        self.assertEqual([p for page in pages for p in page],
+                         [p for page in text_to_pages("각 가나.", cells=100) for p in page])
+
+    def test_push_from_view_thread_reaches_socket_per_page(self):
+        async def body(client):
+            self.assertEqual((await client.next_event())["type"], "websocket.accept")
+            request = RequestFactory().get("/api/newsfeed/", HTTP_X_DEVICE_ID="pi-1")
+            # 동기 뷰는 다른 스레드에서 실행됨
+            await asyncio.get_running_loop().run_in_executor(None, news_feed, request)
+            first = await client.next_message()
+            expected = text_to_pages("샘플 뉴스 1")
+            self.assertEqual(first["kind"], "headline")
+            self.assertEqual(first["total"], len(expected))
+            self.assertEqual(first["packets"], [list(p) for p in expected[0]])
+
+        self.run_session("/ws/device/pi-1/", body)
+        self.assertNotIn("pi-1", channel.connected_devices())
+
+    def test_lesson_step_request(self):
+        async def body(client):
+            await client.next_event()
+            await client.inbox.put({"type": "websocket.receive",
+                                    "text": json.dumps({"type": "lesson", "mode": "chars", "index": 0})})
+            message = await client.next_message()
+            self.assertEqual(message["kind"], "lesson")
+            self.assertEqual(message["text"], channel.lesson_text("chars", 0))
+
+        self.run_session("/ws/device/pi-2/", body)
+
+    def test_push_without_session_is_noop(self):
+        self.assertEqual(channel.push_text("nobody", "가나"), 0)
+
+    def test_unknown_path_is_rejected(self):
+        async def body(client):
+            event = await client.next_event()
+            self.assertEqual(event["type"], "websocket.close")
+
+        self.run_session("/ws/other/", body)
+
+    def test_timeline_is_computed_off_the_event_loop(self):
+        threads = []
+
+        def fake_timeline(text, profile):
+            threads.append(threading.current_thread())
+            return {"text": text}
+
+        async def body(client):
+            await client.next_event()
+            await client.inbox.put({"type": "websocket.receive", "text": json.dumps({"type": "timeline", "text": "가"})})
+            self.assertEqual(await client.next_message(), {"type": "timeline", "text": "가"})
+
+        with mock.patch("utils.braille_timeline.get_timeline", fake_timeline):
+            self.run_session("/ws/device/pi-3/", body)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    @override_settings(DEVICE_CHANNEL_TOKEN="secret")
+    def test_token_is_required(self):
+        async def rejected(client):
+            event = await client.next_event()
+            self.assertEqual((event["type"], event.get("code")), ("websocket.close", 4401))
+
+        async def accepted(client):
+            self.assertEqual((await client.next_event())["type"], "websocket.accept")
+
+        self.run_session("/ws/device/pi-4/", rejected)
+        self.run_session("/ws/device/pi-4/", rejected, query_string=b"token=wrong")
+        self.run_session("/ws/device/pi-4/", accepted, query_string=b"token=secret")
+
+    @override_settings(DEVICE_CHANNEL_TOKEN="", DEBUG=False)
+    def test_unconfigured_token_is_rejected_outside_debug(self):
+        async def rejected(client):
+            self.assertEqual((await client.next_event()).get("code"), 4401)
+
+        self.run_session("/ws/device/pi-5/", rejected)
+
+
+if __name__ == '__main__':
+    unittest.main()
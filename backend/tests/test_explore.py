@@ -0,0 +1,104 @@
+"""
+정보탐색(explore) 동시 호출 테스트
+"""
+import asyncio
+import unittest
+from unittest import mock
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.test import AsyncClient, override_settings
+
+from apps.chat import views
+
+KEYS = {"OPENAI_API_KEY": "sk-test", "NAVER_CLIENT_ID": "id", "NAVER_CLIENT_SECRET": "secret"}
+
+
+async def slow_answer(query, client="default"):
+    await asyncio.sleep(0.3)
+    return f"{query} 설명"
+
+
+async def fast_news(query, client_id, client_secret):
+    await asyncio.sleep(0.05)
+    return [{"title": "뉴스"}]
+
+
+@mock.patch.dict(os.environ, KEYS)
+@mock.patch.object(views, "_explore_news", fast_news)
+@mock.patch.object(views, "_explore_answer", slow_answer)
+class TestExploreFanOut(unittest.TestCase):
+
+    def get(self, path):
+        return asyncio.run(AsyncClient().get(path))
+
+    @override_settings(EXPLORE_DEADLINE=2)
+    def test_calls_run_in_parallel(self):
+        # 두 호출이 서로 시작되기를 기다림: 차례로 실행하면 둘 다 마감 시간에 걸림 (경과 시간은 재지 않음)
+        started = {"answer": asyncio.Event(), "news": asyncio.Event()}
+
+        async def answer(query, client="default"):
+            started["answer"].set()
+            await started["news"].wait()
+            return f"{query} 설명"
+
+        async def news(query, client_id, client_secret):
+            started["news"].set()
+            await started["answer"].wait()
+            return [{"title": "뉴스"}]
+
+        with mock.patch.object(views, "_explore_answer", answer), mock.patch.object(views, "_explore_news", news):
+            data = self.get("/api/chat/explore/?q=날씨").json()
+        self.assertEqual(data["answer"], "날씨 설명")
+        self.assertEqual(data["news"], [{"title": "뉴스"}])
+        self.assertEqual(data["timed_out"], [])
+
+    @override_settings(EXPLORE_DEADLINE=0.1)
+    def test_deadline_returns_partial_result(self):
+        data = self.get("/api/chat/explore/?q=날씨").json()
+        self.assertEqual(data["news"], [{"title": "뉴스"}])
+        self.assertEqual(data["timed_out"], ["answer"])
+
+    def test_stream_sends_news_first(self):
+        async def collect():
+            response = await AsyncClient().get("/api/chat/explore/?q=날씨&stream=1")
+            return [chunk async for chunk in response.streaming_content]
+
+        body = b"".join(asyncio.run(collect())).decode("utf-8")
+        events = [line[len("event: "):] for line in body.splitlines() if line.startswith("event: ")]
+        self.assertEqual(events, ["news", "answer", "done"])
+
+    def test_news_items_are_summarized_in_one_batch(self):
+        async def news(query, client_id, client_secret):
+            return [{"title": "<b>날씨</b> 맑음", "description": "&quot;기온&quot; 상승"}, {"title": "비 소식"}]
+
+        def summarize_many(texts):
+            calls.append(texts)
+            return [{"summary": text, "bullets": [], "keywords": []} for text in texts]
+
+        calls = []
+        with mock.patch.object(views, "_explore_news", news), mock.patch.object(views, "summarize_many", summarize_many):
+            data = self.get("/api/chat/explore/?q=날씨&summarize=1").json()
+        self.assertEqual(calls, [['날씨 맑음\n"기온" 상승', "비 소식"]])
+        self.assertEqual(data["news"][0]["digest"]["summary"], '날씨 맑음\n"기온" 상승')
+
+    def test_any_llm_provider_is_enough(self):
+        # OpenAI 키 없이 Gemini만 설정돼 있어도 라우터가 있으면 동작
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": ""}), mock.patch.object(views, "_get_llm"):
+            response = self.get("/api/chat/explore/?q=날씨")
+        self.assertEqual(response.status_code, 200)
+
+        with mock.patch.object(views, "_get_llm", side_effect=RuntimeError("LLM API 키 미설정")):
+            response = self.get("/api/chat/explore/?q=날씨")
+        self.assertEqual((response.status_code, response.json()["error"]), (503, "llm_not_configured"))
+
+
+if __name__ == '__main__':
+    unittest.main()
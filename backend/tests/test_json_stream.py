@@ -0,0 +1,55 @@
+"""
+증분 JSON 파서(services.json_stream) 테스트
+"""
+import json
+import unittest
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.json_stream import StreamingJsonParser, parse_json_object
+
+RESPONSE = {
+    "mode": "detail",
+    "simple_tts": '쉬운 "말" 한 줄',
+    "keywords": ["경제", "물가"],
+    "detail": {"title": "물가", "sections": [{"heading": "배경", "text": "설명"}]},
+    "score": -1.5e3,
+    "meta": {"ok": True, "note": None},
+}
+
+
+class TestStreamingJsonParser(unittest.TestCase):
+
+    def test_fields_are_emitted_as_they_close(self):
+        parser = StreamingJsonParser()
+        self.assertEqual(parser.feed('```json\n{"mode": "detail", "simple_tts": "쉬운 \\"말'), [(("mode",), "detail")])
+        self.assertEqual(parser.feed('\\" 한 줄", "keywords": ["경제", "물'),
+                         [(("simple_tts",), '쉬운 "말" 한 줄'), (("keywords", 0), "경제")])
+        self.assertEqual(parser.feed('가"], "detail": {"sections": ['),
+                         [(("keywords", 1), "물가"), (("keywords",), ["경제", "물가"])])
+        self.assertFalse(parser.done)
+
+    def test_any_chunking_gives_the_same_object(self):
+        text = "다음은 결과입니다.\n```json\n" + json.dumps(RESPONSE, ensure_ascii=False, indent=2) + "\n```\n참고: {\"x\": 1}"
+        for size in (1, 2, 3, 7, len(text)):
+            parser = StreamingJsonParser()
+            for i in range(0, len(text), size):
+                parser.feed(text[i:i + size])
+            self.assertEqual(parser.close(), RESPONSE)
+
+    def test_tolerates_schema_comments_and_trailing_commas(self):
+        text = '{\n "bullets": ["a", "b",],  // summary일 때만\n "keywords": ["c"],\n}'
+        self.assertEqual(parse_json_object(text), {"bullets": ["a", "b"], "keywords": ["c"]})
+
+    def test_first_object_wins_and_bad_input_is_none(self):
+        self.assertEqual(parse_json_object('{"a": 1} 그리고 {"b": 2}'), {"a": 1})
+        self.assertIsNone(parse_json_object('{"a": [1, 2'))
+        self.assertIsNone(parse_json_object("JSON 없음"))
+        self.assertIsNone(parse_json_object('{"a" 1}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+로컬 키워드 추출(utils.keywords) 테스트
+"""
+import unittest
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.keywords import build_idf, candidates, extract_keywords, strip_particles
+
+
+class TestKeywords(unittest.TestCase):
+
+    def test_strip_particles(self):
+        cases = {
+            "정부가": "정부", "물가는": "물가", "발표했다": "발표", "학생들에게": "학생",
+            "경제적인": "경제", "돈으로": "돈",
+            # 한 글자 조사처럼 보이는 명사 끝 글자는 남김
+            "국가": "국가", "블록체인은": "블록체인",
+            # 받침 없는 말 뒤의 "이"는 조사가 아님
+            "디스플레이": "디스플레이", "디스플레이가": "디스플레이", "어린이": "어린이", "고양이가": "고양이",
+        }
+        for word, stem in cases.items():
+            self.assertEqual(strip_particles(word), stem, word)
+
+    def test_ranks_topic_nouns_deterministically(self):
+        text = "물가가 오르면서 정부가 대책을 발표했다. 정부는 물가 안정을 위해 금리를 조정할 계획이다."
+        self.assertEqual(extract_keywords(text), ["물가", "정부", "대책"])
+        self.assertEqual(extract_keywords(text), extract_keywords(text))
+        # 흔한 단어/요청어는 제외, 질문 단어는 가중 (두 단어의 순서는 문서 빈도표에 따름)
+        self.assertCountEqual(extract_keywords("오늘 날씨 알려줘"), ["날씨", "오늘"])
+        boosted = extract_keywords("낮 기온은 20도, 저녁 기온은 15도", boost="내일 날씨")
+        self.assertEqual(boosted[0], "기온")
+        self.assertIn("날씨", boosted)
+        self.assertEqual(extract_keywords(""), [])
+
+    def test_skips_predicates(self):
+        self.assertIn("디스플레이", extract_keywords("점자 디스플레이 사용법을 알려주세요"))
+        for text, verb in (("기후 변화가 농업에 영향을 미치는 이유", "미치"),
+                           ("아이들이 공원에서 놀았다", "놀았다"), ("영향을 미친다", "미친다")):
+            self.assertNotIn(verb, candidates(text), text)
+        # 관형형 "-는", 연결 어미 "-고", 질문 말끝
+        self.assertEqual(extract_keywords("점자를 배우는 방법"), ["방법", "점자"])
+        self.assertNotIn("맑고", extract_keywords("서울의 날씨는 맑고 낮 기온은 20도입니다"))
+        self.assertEqual(extract_keywords("인공지능이 뭐야"), ["인공지능"])
+        self.assertEqual(candidates("광고 창고 참고 좋은 쉽게 먹고"), ["광고", "창고", "참고"])
+
+    def test_build_idf(self):
+        table = build_idf(["정부가 발표했다", "정부는 물가를"])
+        self.assertEqual(table["documents"], 2)
+        self.assertEqual(table["df"]["정부"], 2)
+        self.assertEqual(table["df"]["물가"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
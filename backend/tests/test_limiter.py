@@ -0,0 +1,146 @@
+"""
+LLM 호출 제한기(services.limiter) 테스트
+"""
+import asyncio
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.test import AsyncClient
+
+from apps.chat import views
+from services.answer_store import get_answer_store
+from services.limiter import Limiter, Saturated
+from services.ratelimit import get_rate_limiter
+
+
+class TestLimiter(unittest.TestCase):
+
+    def test_full_queue_rejects_fast_with_retry_after(self):
+        limiter = Limiter(rate=20, burst=1, max_in_flight=1, max_waiters=1)
+        limiter.acquire_slot("a")
+        waiter = threading.Thread(target=limiter.acquire_slot, args=("b", 2))
+        waiter.start()
+        time.sleep(0.05)
+
+        started = time.monotonic()
+        with self.assertRaises(Saturated) as ctx:
+            limiter.acquire_slot("c")
+        self.assertLess(time.monotonic() - started, 0.05)
+        self.assertGreater(ctx.exception.retry_after, 0)
+        self.assertEqual(limiter.stats()["rejected"], 1)
+        limiter.release()
+        waiter.join(2)
+
+    def test_wait_timeout(self):
+        limiter = Limiter(rate=0, max_in_flight=1)
+        limiter.acquire_slot()
+        with self.assertRaises(Saturated) as ctx:
+            limiter.acquire_slot(timeout=0.05)
+        self.assertEqual(ctx.exception.reason, "timeout")
+        self.assertEqual(limiter.stats()["waiting"], 0)
+
+    def test_clients_take_turns(self):
+        limiter = Limiter(rate=0, max_in_flight=1, max_waiters_per_client=8)
+        order = []
+
+        async def call(client):
+            async with limiter.acquire_async(client):
+                order.append(client)
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await limiter.acquire_slot_async("busy")
+            # a가 먼저 3개를 줄 세워도 b는 a의 두 번째 호출보다 먼저 처리
+            tasks = [asyncio.ensure_future(call(c)) for c in ("a", "a", "a", "b")]
+            await asyncio.sleep(0.01)
+            limiter.release()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        self.assertEqual(order, ["a", "b", "a", "a"])
+
+    def test_token_bucket_spaces_calls(self):
+        limiter = Limiter(rate=20, burst=1, max_in_flight=10)
+        started = time.monotonic()
+        for _ in range(3):
+            with limiter.acquire():
+                pass
+        # 첫 호출은 즉시, 나머지 2개는 0.05초 간격
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+
+class EchoLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, prompt):
+        self.calls += 1
+        return "• 답변"
+
+    async def stream(self, prompt):
+        self.calls += 1
+        yield "• 답변\n"
+
+
+class TestChatViewsUseLimiter(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_rate_limiter().reset()
+        get_answer_store().clear_learned()
+        # 자리 하나를 다른 요청이 쥐고 있고 대기열도 없음
+        self.limiter = Limiter(rate=0, max_in_flight=1, max_waiters=0)
+        self.limiter.acquire_slot("busy")
+        self.addCleanup(self.limiter.release)
+        patcher = mock.patch("services.limiter.get_limiter", return_value=self.limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, body):
+        async def request():
+            response = await AsyncClient().post("/api/chat/ask/", data=json.dumps(body), content_type="application/json")
+            if response.streaming:
+                return response, b"".join([chunk async for chunk in response.streaming_content]).decode("utf-8")
+            return response, response.content.decode("utf-8")
+        return asyncio.run(request())
+
+    def test_saturated_limiter_returns_429_without_llm_call(self):
+        llm = EchoLLM()
+        with mock.patch.object(views, "_get_llm", return_value=llm):
+            response, _ = self.post({"query": "제한기 테스트 질문"})
+            self.assertEqual(response.status_code, 429)
+            self.assertIn("Retry-After", response)
+
+            get_rate_limiter().reset()  # 라우트 레이트리밋이 아니라 제한기 때문에 막히는지 확인
+            _, body = self.post({"query": "제한기 테스트 질문", "stream": True})
+            self.assertIn("event: error", body)
+            self.assertIn("too_many_requests", body)
+        self.assertEqual(llm.calls, 0)
+        self.assertEqual(self.limiter.stats()["rejected"], 2)
+
+    def test_call_holds_a_slot_until_done(self):
+        self.limiter.release()
+        self.addCleanup(self.limiter.acquire_slot)  # setUp의 cleanup(release)과 짝
+        llm = EchoLLM()
+        with mock.patch.object(views, "_get_llm", return_value=llm):
+            response, _ = self.post({"query": "제한기 통과 질문"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(llm.calls, 1)
+        self.assertEqual(self.limiter.stats()["in_flight"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+공용 LLM 클라이언트 레지스트리(services.clients) 테스트
+"""
+import asyncio
+import os
+import unittest
+import sys
+from unittest import mock
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import clients
+from services.deadline import Deadline, current, scope
+
+try:
+    import google.generativeai  # noqa: F401
+    HAS_GENAI = True
+except ImportError:
+    HAS_GENAI = False
+
+
+class TestClientRegistry(unittest.TestCase):
+
+    def setUp(self):
+        clients.close_clients()
+        self.addCleanup(clients.close_clients)
+
+    def test_client_is_built_once_and_reused(self):
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test", "LLM_POOL_MAX_CONNECTIONS": "7"}):
+            first = clients.get_openai_client()
+            self.assertIs(clients.get_openai_client(), first)
+
+    def test_missing_key_is_not_cached(self):
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": ""}):
+            with self.assertRaises(RuntimeError):
+                clients.get_openai_client()
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}):
+            self.assertIsNotNone(clients.get_openai_client())
+
+    def test_reload_is_explicit(self):
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-old"}):
+            old = clients.get_openai_client()
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-new"}):
+            # 환경이 바뀌어도 reload 전까지는 같은 클라이언트
+            self.assertIs(clients.get_openai_client(), old)
+            clients.close_clients()
+            new = clients.get_openai_client()
+            self.assertIsNot(new, old)
+            self.assertEqual(new.api_key, "sk-new")
+
+    def test_async_clients_are_shared_across_request_loops(self):
+        # WSGI에서는 요청마다 이벤트 루프가 새로 생김: 클라이언트와 실행 루프는 그대로여야 함
+        async def request():
+            async def on_io_loop():
+                return asyncio.get_running_loop()
+            return clients.get_async_http_client(), await clients.run_outbound(on_io_loop())
+
+        first, second = asyncio.run(request()), asyncio.run(request())
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], clients.get_io_loop())
+        self.assertIs(second[1], clients.get_io_loop())
+
+    def test_stream_outbound_runs_iterator_on_io_loop(self):
+        async def chunks():
+            for i in range(3):
+                yield i, asyncio.get_running_loop()
+
+        async def collect():
+            return [item async for item in clients.stream_outbound(chunks)]
+
+        items = asyncio.run(collect())
+        self.assertEqual([i for i, _ in items], [0, 1, 2])
+        self.assertTrue(all(loop is clients.get_io_loop() for _, loop in items))
+
+    def test_call_outbound_runs_sync_callers_on_io_loop(self):
+        async def on_io_loop():
+            return asyncio.get_running_loop(), current()
+
+        with scope(Deadline(5)) as deadline:
+            loop, seen = clients.call_outbound(on_io_loop())
+        self.assertIs(loop, clients.get_io_loop())
+        self.assertIs(seen, deadline)  # 요청 마감 시간이 그대로 넘어감
+
+        async def inside_event_loop():
+            clients.call_outbound(on_io_loop())
+
+        # 이벤트 루프를 막지 않도록 async 코드에서는 거부
+        with self.assertRaises(RuntimeError):
+            asyncio.run(inside_event_loop())
+
+    @unittest.skipUnless(HAS_GENAI, "google-generativeai 미설치")
+    def test_gemini_model_is_cached_per_config(self):
+        model = clients.get_gemini_model("gemini-1.5-flash", "key", generation_config={"temperature": 0.7})
+        self.assertIs(clients.get_gemini_model("gemini-1.5-flash", "key", generation_config={"temperature": 0.7}), model)
+        self.assertIsNot(clients.get_gemini_model("gemini-1.5-flash", "key", generation_config={"temperature": 0.2}), model)
+
+
+if __name__ == '__main__':
+    unittest.main()
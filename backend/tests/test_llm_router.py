@@ -0,0 +1,158 @@
+"""
+LLM 라우터(services.router) 테스트 - 로컬 OpenAI 호환 스텁 서버 사용
+"""
+import asyncio
+import json
+import threading
+import time
+import unittest
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from openai import AsyncOpenAI
+
+from services.router import AllProvidersFailed, Provider, Router
+
+
+def start_stub(name, delay=0.0, status=200):
+    """/v1/chat/completions에 delay초 뒤 name을 답하는 스텁 서버"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(delay)
+            body = json.dumps({
+                "id": "stub", "object": "chat.completion", "created": 0, "model": name,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": name}}],
+            }).encode()
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # hedge에서 진 요청은 클라이언트가 먼저 끊음
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    return server
+
+
+def stub_provider(name, server):
+    async def call(prompt):
+        client = AsyncOpenAI(base_url=f"http://127.0.0.1:{server.server_port}/v1", api_key="test", max_retries=0)
+        try:
+            resp = await client.chat.completions.create(model=name, messages=[{"role": "user", "content": prompt}])
+            return resp.choices[0].message.content
+        finally:
+            await client.close()
+    return Provider(name, call, name)
+
+
+class TestRouter(unittest.TestCase):
+
+    def stub(self, name, **kwargs):
+        server = start_stub(name, **kwargs)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return stub_provider(name, server)
+
+    def test_hedge_to_second_provider_when_first_is_slow(self):
+        router = Router([self.stub("slow", delay=1.0), self.stub("fast", delay=0.05)], hedge_delay=0.1)
+        started = time.monotonic()
+        self.assertEqual(asyncio.run(router.complete("안녕")), "fast")
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual(router.hedged, 1)
+        # 측정된 제공자가 다음부터 먼저
+        self.assertEqual([p.name for p in router.ranked()], ["fast", "slow"])
+
+    def test_failure_fails_over_immediately(self):
+        router = Router([self.stub("broken", status=500), self.stub("ok")], hedge_delay=5)
+        started = time.monotonic()
+        self.assertEqual(asyncio.run(router.complete("안녕")), "ok")
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(router.hedged, 0)
+        self.assertEqual(router.providers[0].stats.failures, 1)
+
+    def test_all_failed(self):
+        router = Router([self.stub("a", status=500), self.stub("b", status=503)])
+        with self.assertRaises(AllProvidersFailed):
+            asyncio.run(router.complete("안녕"))
+
+    def test_stream_hedges_on_first_token(self):
+        async def slow_stream(prompt):
+            await asyncio.sleep(1.0)
+            yield "느림"
+
+        async def fast_stream(prompt):
+            for part in ("빠", "름"):
+                await asyncio.sleep(0.02)
+                yield part
+
+        router = Router([Provider("slow", None, stream=slow_stream), Provider("fast", None, stream=fast_stream)],
+                        hedge_delay=0.1)
+
+        async def collect():
+            return [chunk async for chunk in router.stream("안녕")]
+
+        started = time.monotonic()
+        self.assertEqual(asyncio.run(collect()), ["빠", "름"])
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(router.providers[1].first_token.samples, 1)
+
+    def test_system_prompt_is_passed_only_when_given(self):
+        calls = []
+
+        async def call(prompt, system="(없음)"):
+            calls.append((prompt, system))
+            return "답변"
+
+        router = Router([Provider("p", call)])
+        asyncio.run(router.complete("질문"))
+        asyncio.run(router.complete("질문", system="지시문"))
+        self.assertEqual(calls, [("질문", "(없음)"), ("질문", "지시문")])
+
+    def test_degraded_primary_loses_its_rank(self):
+        # 예전에는 빨랐지만 지금은 오류 없이 느린 제공자: 추월당한 시간이 기록돼 순위가 내려감
+        async def degraded(prompt):
+            await asyncio.sleep(2.0)
+            return "a"
+
+        async def healthy(prompt):
+            await asyncio.sleep(0.05)
+            return "b"
+
+        a, b = Provider("a", degraded), Provider("b", healthy)
+        for _ in range(5):
+            a.stats.record(0.01)
+            b.stats.record(0.05)
+        router = Router([a, b], min_hedge_delay=0.1)
+
+        async def main():
+            return [await router.complete("안녕") for _ in range(5)]
+
+        self.assertEqual(asyncio.run(main()), ["b"] * 5)
+        self.assertEqual([p.name for p in router.ranked()], ["b", "a"])
+        self.assertLessEqual(router.hedged, 2)  # 처음 몇 번만 a에 먼저 보냄 (예전에는 5번 모두)
+        self.assertEqual(a.stats.censored, router.hedged)
+        self.assertGreater(a.stats.ewma, b.stats.ewma)
+
+    def test_hedge_delay_follows_p95(self):
+        provider = Provider("p", None)
+        router = Router([provider], hedge_delay=2.0, min_samples=5)
+        for seconds in (0.1, 0.1, 0.2, 0.3, 0.5):
+            provider.stats.record(seconds)
+        self.assertEqual(router.hedge_delay_for(provider), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
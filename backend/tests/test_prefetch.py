@@ -0,0 +1,115 @@
+"""
+"자세히" 미리 만들기(services.prefetch, chat_ask → chat_detail) 테스트
+"""
+import asyncio
+import json
+import threading
+import unittest
+from unittest import mock
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.test import AsyncClient, override_settings
+
+from django.test import RequestFactory
+
+from apps.chat import ai_assistant, views
+from apps.chat import cache as response_cache
+from services.answer_store import get_answer_store
+from services.prefetch import Prefetcher, get_prefetcher
+from services.limiter import get_limiter
+from services.ratelimit import get_rate_limiter
+from services.singleflight import flight_key
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def complete(self, prompt):
+        self.prompts.append(prompt)
+        if "자세하고" in prompt:
+            return "블록체인은 거래 기록을 여러 컴퓨터가 나눠 보관하는 기술입니다.\n\n키워드: 블록, 거래, 기록"
+        return "• 분산 장부 기술\n\n키워드: 블록, 장부, 기술"
+
+
+class TestPrefetcher(unittest.TestCase):
+
+    def test_limits_per_user_global_and_duplicates(self):
+        gate = threading.Event()
+        prefetcher = Prefetcher(max_running=1, max_pending=2, per_user=1)
+        self.assertTrue(prefetcher.submit("a", "user1", gate.wait, 5))
+        self.assertFalse(prefetcher.submit("a", "user2", gate.wait, 5))  # 같은 작업 진행 중
+        self.assertFalse(prefetcher.submit("b", "user1", gate.wait, 5))  # 사용자당 1개
+        self.assertTrue(prefetcher.submit("c", "user2", gate.wait, 5))   # 실행 1 + 대기 1
+        self.assertFalse(prefetcher.submit("d", "user3", gate.wait, 5))  # 전체 한도
+        self.assertEqual(prefetcher.stats()["dropped"], 2)
+
+        gate.set()
+        self.assertTrue(prefetcher.wait("a", 2) and prefetcher.wait("c", 2))
+        self.assertFalse(prefetcher.pending("a"))
+        self.assertTrue(prefetcher.submit("b", "user1", gate.wait, 5))
+
+
+class TestDetailPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_rate_limiter().reset()
+        get_limiter().reset()
+        get_answer_store().clear_learned()
+        overridden = override_settings(CHAT_PREFETCH_DETAIL=True)
+        overridden.enable()
+        self.addCleanup(overridden.disable)
+
+    def post(self, path, payload):
+        async def run():
+            return await AsyncClient().post(path, data=json.dumps(payload), content_type="application/json")
+        return asyncio.run(run())
+
+    def test_detail_is_ready_after_summary(self):
+        llm = FakeLLM()
+        with mock.patch.object(views, "_get_llm", return_value=llm):
+            response = self.post("/api/chat/ask/", {"query": "블록체인"})
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(get_prefetcher().wait(views._prefetch_key("블록체인"), 5))
+
+            response = self.post("/api/chat/detail/", {"topic": "블록체인"})
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.json()["keywords"], ["블록", "거래", "기록"])
+        self.assertEqual(len(llm.prompts), 2)  # 요약 1 + 미리 만든 자세히 1
+
+    def test_streamed_ai_detail_waits_for_prefetch(self):
+        gate = threading.Event()
+        detail = {"ok": True, "mode": "detail", "keywords": ["블록", "거래"], "bullets": ["분산 장부"],
+                  "simple_tts": "블록체인은 분산 장부입니다."}
+
+        def prefetch():
+            gate.wait(5)
+            response_cache.set_cached("ai_detail", "블록체인", detail)
+
+        key = flight_key("prefetch_ai_detail", response_cache.normalize_query("블록체인"))
+        self.assertTrue(get_prefetcher().submit(key, "user1", prefetch))
+        body = {"q": "자세히", "mode": "detail", "topic": "블록체인", "format": "ai_assistant", "stream": True}
+        request = RequestFactory().post("/", data=json.dumps(body), content_type="application/json")
+        threading.Timer(0.05, gate.set).start()
+        async def run():
+            response = await ai_assistant.ai_assistant_view(request)
+            return b"".join([chunk async for chunk in response.streaming_content]).decode("utf-8")
+
+        with mock.patch.object(ai_assistant, "_get_llm", side_effect=AssertionError("모델 호출됨")):
+            events = asyncio.run(run())
+        done = json.loads(events.strip().split("\n\n")[-1].split("data: ", 1)[1])
+        self.assertEqual(done, detail)
+
+
+if __name__ == '__main__':
+    unittest.main()
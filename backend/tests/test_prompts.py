@@ -0,0 +1,99 @@
+"""
+AI 어시스턴트 프롬프트 분리(apps.chat.prompts) / 토큰 집계(services.usage) 테스트
+"""
+import asyncio
+import json
+import unittest
+from unittest import mock
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jeomgeuli_backend.settings")
+
+import django
+django.setup()
+
+from django.core.cache import cache
+
+from apps.chat import ai_assistant
+from apps.chat.prompts import PREFIX, SYSTEM_PROMPTS, request_prompt, system_prompt
+from services.usage import UsageMeter, get_usage_meter
+
+
+class TestPrompts(unittest.TestCase):
+
+    def test_only_requested_mode_is_sent(self):
+        self.assertIs(system_prompt("news"), system_prompt("summary"))
+        for template, prompt in SYSTEM_PROMPTS.items():
+            self.assertTrue(prompt.startswith(PREFIX))   # 모드가 달라도 같은 앞부분
+            self.assertIn(f'"mode": "{template}"', prompt)
+            self.assertNotIn("{{", prompt)
+            self.assertNotIn("actions", prompt)
+            self.assertLess(len(prompt), 1800)
+        self.assertNotIn('"detail"', system_prompt("summary"))
+        self.assertNotIn('"bullets"', system_prompt("detail"))
+        self.assertEqual(request_prompt("블록체인", "explain"), "사용자 질문: 블록체인\n모드: summary")
+        self.assertIn("확장 대상(topic): 블록체인", request_prompt("자세히", "detail", "블록체인"))
+
+
+class FakeLLM:
+    def __init__(self, parts=()):
+        self.parts = list(parts)
+        self.calls = []
+
+    async def complete(self, prompt, system=None):
+        self.calls.append((system, prompt))
+        return json.dumps({"keywords": ["블록"], "chat_markdown": "• 분산 장부", "simple_tts": "분산 장부",
+                           "bullets": ["분산 장부"]}, ensure_ascii=False)
+
+    async def stream(self, prompt, system=None):
+        self.calls.append((system, prompt))
+        for part in self.parts:
+            yield part
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+class TestAssistantStream(unittest.TestCase):
+
+    def test_non_json_stream_with_brace_falls_back(self):
+        # 첫 조각에서 JSON이 아님을 알게 된 뒤에도 나머지 조각을 끝까지 받아 fallback 응답으로
+        parts = ["Use {braces} ", "like this ", "ok."]
+        with mock.patch.object(ai_assistant, "_get_llm", return_value=FakeLLM(parts)):
+            events = asyncio.run(collect(ai_assistant.processor.stream_query("괄호", "qa")))
+        done = json.loads(events[-1].split("data: ", 1)[1])
+        expected = ai_assistant.processor.create_fallback_response("괄호", "qa", "".join(parts))
+        self.assertEqual(done, json.loads(json.dumps(expected, ensure_ascii=False)))
+
+class TestUsage(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_usage_meter().reset()
+
+    def test_assistant_call_is_counted_per_endpoint(self):
+        llm = FakeLLM()
+        with mock.patch.object(ai_assistant, "_get_llm", return_value=llm):
+            result = asyncio.run(ai_assistant.processor.process_query("블록체인", "news"))
+        self.assertEqual(result["bullets"], ["분산 장부"])
+        # 모드별 고정 지시문은 system으로, 요청마다 바뀌는 줄만 prompt로
+        self.assertEqual(llm.calls, [(system_prompt("news"), "사용자 질문: 블록체인\n모드: summary")])
+        stats = get_usage_meter().stats()["ai_assistant.summary"]
+        self.assertEqual((stats["calls"], stats["estimated_calls"]), (1, 1))
+
+    def test_estimates_without_provider_usage(self):
+        meter = UsageMeter()
+        meter.record("chat_ask", "가" * 100, "나" * 20, 0.5)
+        meter.record("chat_ask", "가" * 100, "나" * 20, 1.5)
+        stats = meter.stats()["chat_ask"]
+        self.assertEqual((stats["tokens_in"], stats["tokens_out"], stats["estimated_calls"]), (102, 22, 2))
+        self.assertEqual(stats["avg_latency_ms"], 1000.0)
+        self.assertEqual(stats["p95_latency_ms"], 1500.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+요청 레이트리밋(services.ratelimit) 테스트
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.ratelimit import MemoryStore, RateLimiter, SQLiteStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_token_bucket_per_route_policy(self):
+        clock = Clock()
+        limiter = RateLimiter(MemoryStore(clock=clock), {"default": (1.0, 1), "chat_ask": (0.5, 2)})
+        self.assertTrue(limiter.check("chat_ask", "1.1.1.1").allowed)
+        self.assertTrue(limiter.check("chat_ask", "1.1.1.1").allowed)  # burst 2
+        denied = limiter.check("chat_ask", "1.1.1.1")
+        self.assertFalse(denied.allowed)
+        self.assertAlmostEqual(denied.retry_after, 2.0)
+        # 다른 라우트/클라이언트는 별도 버킷
+        self.assertTrue(limiter.check("chat_detail", "1.1.1.1").allowed)
+        self.assertTrue(limiter.check("chat_ask", "2.2.2.2").allowed)
+
+        clock.now += 2.0
+        self.assertTrue(limiter.check("chat_ask", "1.1.1.1").allowed)
+
+    def test_memory_stays_flat_under_ip_scan(self):
+        limiter = RateLimiter(MemoryStore(max_keys=100))
+        for i in range(5000):
+            limiter.check("chat_ask", f"10.0.{i // 256}.{i % 256}")
+        self.assertEqual(limiter.stats()["buckets"], 100)
+        # 최근 클라이언트의 버킷은 유지됨
+        self.assertFalse(limiter.check("chat_ask", "10.0.19.135").allowed)
+
+    def test_sqlite_store_is_shared_and_pruned(self):
+        clock = Clock()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ratelimit.sqlite3")
+            # 워커 두 개가 같은 파일 사용
+            worker_a = RateLimiter(SQLiteStore(path, max_keys=50, clock=clock))
+            worker_b = RateLimiter(SQLiteStore(path, max_keys=50, clock=clock))
+            self.assertTrue(worker_a.check("chat_ask", "1.1.1.1").allowed)
+            self.assertFalse(worker_b.check("chat_ask", "1.1.1.1").allowed)
+
+            for i in range(SQLiteStore.PRUNE_EVERY * 4):
+                worker_a.check("chat_ask", f"10.0.{i // 256}.{i % 256}")
+            self.assertLessEqual(len(worker_a.store), 50 + SQLiteStore.PRUNE_EVERY)
+
+            clock.now += 10  # 모든 버킷이 다시 가득 참 → 다음 정리에서 삭제
+            for i in range(SQLiteStore.PRUNE_EVERY):
+                worker_a.check("chat_ask", "9.9.9.9")
+            self.assertEqual(len(worker_a.store), 1)
+
+
+    def test_sqlite_wait_does_not_block_event_loop(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ratelimit.sqlite3")
+            limiter = RateLimiter(SQLiteStore(path))
+            # 다른 워커가 쓰기 잠금을 잡고 있음
+            other = sqlite3.connect(path, isolation_level=None)
+            other.execute("BEGIN IMMEDIATE")
+            order = []
+
+            async def ticker():
+                for _ in range(3):
+                    await asyncio.sleep(0.02)
+                order.append("tick")
+                other.execute("COMMIT")  # 잠금 해제
+
+            async def check():
+                decision = await limiter.acheck("chat_ask", "1.1.1.1")
+                order.append("check")
+                return decision
+
+            async def main():
+                return (await asyncio.gather(check(), ticker()))[0]
+
+            self.assertTrue(asyncio.run(main()).allowed)
+            self.assertEqual(order, ["tick", "check"])
+            other.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+single-flight(services.singleflight) 테스트
+"""
+import asyncio
+import threading
+import time
+import unittest
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.deadline import Deadline, DeadlineExceeded, scope, wait_for
+from services.singleflight import SingleFlight, flight_key
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def run_concurrently(self, n, target):
+        results, errors = [], []
+
+        def worker():
+            try:
+                results.append(target())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        return results, errors
+
+    def test_concurrent_identical_calls_share_one_upstream_call(self):
+        group = SingleFlight()
+        calls = []
+
+        def slow_llm():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"answer": "공유", "keywords": ["a"]}
+
+        results, errors = self.run_concurrently(8, lambda: group.do(flight_key("ask", "날씨"), slow_llm))
+        self.assertEqual(errors, [])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(r == {"answer": "공유", "keywords": ["a"]} for r in results))
+        # 결과는 요청별 사본
+        results[0]["keywords"].append("b")
+        self.assertEqual(results[1]["keywords"], ["a"])
+        self.assertEqual(group.in_flight(), 0)
+
+    def test_error_is_shared_and_not_remembered(self):
+        group = SingleFlight()
+
+        def failing():
+            time.sleep(0.1)
+            raise RuntimeError("quota")
+
+        results, errors = self.run_concurrently(4, lambda: group.do("k", failing))
+        self.assertEqual(len(errors), 4)
+        # 끝난 호출은 공유하지 않음 (결과 캐시가 아님)
+        self.assertEqual(group.do("k", lambda: "ok"), "ok")
+
+    def test_async_calls_share_one_upstream_call(self):
+        group = SingleFlight()
+        calls = []
+
+        async def slow_llm():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"keywords": ["a"]}
+
+        async def main():
+            return await asyncio.gather(*(group.do_async("k", slow_llm) for _ in range(5)))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"keywords": ["a"]}] * 5)
+        self.assertEqual(group.in_flight(), 0)
+
+    def test_async_calls_share_across_event_loops(self):
+        # WSGI: async 뷰마다 async_to_sync가 새 루프를 만듦
+        group = SingleFlight()
+        calls = []
+
+        async def slow_llm():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return "답변"
+
+        results, errors = self.run_concurrently(3, lambda: asyncio.run(group.do_async("k", slow_llm)))
+        self.assertEqual((results, errors), (["답변"] * 3, []))
+        self.assertEqual(len(calls), 1)
+
+    def test_cancelled_leader_hands_over_to_waiter(self):
+        group = SingleFlight()
+        calls = []
+
+        async def slow_llm():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "답변"
+
+        async def main():
+            leader = asyncio.ensure_future(group.do_async("k", slow_llm))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(group.do_async("k", slow_llm))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await waiter
+
+        # 기다리던 요청은 CancelledError 대신 새 leader로 다시 호출해 결과를 받음
+        self.assertEqual(asyncio.run(main()), "답변")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(group.in_flight(), 0)
+
+    def test_joined_requests_wait_under_their_own_deadline(self):
+        group = SingleFlight()
+        calls = []
+
+        async def slow_llm():
+            calls.append(1)
+            return await wait_for(asyncio.sleep(0.1, "답변"))  # 호출한 요청의 마감 시간 안에서
+
+        async def request(budget):
+            with scope(Deadline(budget)):
+                return await group.do_async("k", slow_llm)
+
+        async def main():
+            leader = asyncio.ensure_future(request(0.05))
+            await asyncio.sleep(0)
+            joined = [asyncio.ensure_future(request(budget)) for budget in (1.0, 0.02)]
+            return await asyncio.gather(leader, *joined, return_exceptions=True)
+
+        leader, long_budget, short_budget = asyncio.run(main())
+        self.assertIsInstance(leader, DeadlineExceeded)
+        self.assertIsInstance(short_budget, DeadlineExceeded)
+        # 시간이 남은 요청은 leader의 504를 받지 않고 새 leader로 다시 호출
+        self.assertEqual(long_budget, "답변")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(group.in_flight(), 0)
+
+    def test_different_keys_run_separately(self):
+        self.assertNotEqual(flight_key("ask", "a"), flight_key("detail", "a"))
+        self.assertEqual(flight_key("gen", "q", [{"role": "user"}]), flight_key("gen", "q", [{"role": "user"}]))
+
+
+if __name__ == '__main__':
+    unittest.main()
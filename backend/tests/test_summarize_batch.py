@@ -0,0 +1,92 @@
+"""
+여러 텍스트 한꺼번에 요약(services.ai.summarize_many) 테스트
+"""
+import json
+import re
+import threading
+import unittest
+from unittest import mock
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import ai
+
+
+class FakeGemini:
+    """배치 프롬프트의 [id] 항목마다 요약을 돌려주는 가짜 _generate (skip_ids는 응답에서 뺌)"""
+
+    def __init__(self, skip_ids=()):
+        self.prompts = []
+        self.skip_ids = set(skip_ids)
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, endpoint=None):
+        with self._lock:
+            self.prompts.append(prompt)
+        body = prompt.split("분석할 텍스트:\n", 1)[1]
+        if prompt.startswith(ai.PROMPT):
+            return json.dumps({"summary": f"단건: {body}", "bullets": ["하나"], "keywords": ["단건"]}, ensure_ascii=False)
+        items = [
+            {"id": item_id, "summary": f"요약: {text.strip()}", "bullets": ["하나"], "keywords": [text.strip()[:2]]}
+            for item_id, text in re.findall(r"\[(\d+)\]\n(.*?)(?=\n\n\[\d+\]\n|$)", body, re.S)
+            if item_id not in self.skip_ids
+        ]
+        return "```json\n" + json.dumps({"items": items}, ensure_ascii=False) + "\n```"
+
+
+class TestSummarizeMany(unittest.TestCase):
+
+    def setUp(self):
+        ai._cache.clear()
+
+    def test_batches_by_budget_and_caches_by_content(self):
+        texts = [f"뉴스 {i} " + "가" * 40 for i in range(5)]
+        fake = FakeGemini()
+        with mock.patch.object(ai, "_generate", fake), mock.patch.object(ai, "BATCH_TOKEN_BUDGET", 50):
+            results = ai.summarize_many(texts + [texts[0], ""])
+            self.assertEqual(len(fake.prompts), 3)  # 항목당 약 23토큰 → 2 + 2 + 1
+            self.assertEqual([r["summary"] for r in results[:4]], [f"요약: {t}" for t in texts[:4]])
+            self.assertEqual(results[4]["summary"], f"단건: {texts[4]}")  # 혼자 남은 항목은 단건 프롬프트
+            self.assertEqual(results[5], results[0])
+            self.assertEqual(results[6]["summary"], "")
+
+            # 같은 본문(공백만 다름)은 다시 요약하지 않음
+            again = ai.summarize_many(["  " + texts[3].replace(" ", "  ")])
+            self.assertEqual(again[0]["summary"], f"요약: {texts[3]}")
+            self.assertEqual(ai.summarize(texts[1])["summary"], f"요약: {texts[1]}")
+            self.assertEqual(len(fake.prompts), 3)
+
+    def test_missing_item_is_requested_alone(self):
+        fake = FakeGemini(skip_ids={"2"})
+        with mock.patch.object(ai, "_generate", fake):
+            results = ai.summarize_many(["첫 번째 기사", "두 번째 기사"])
+        self.assertEqual(results[0]["summary"], "요약: 첫 번째 기사")
+        self.assertTrue(results[1]["summary"].startswith("단건:"))
+        self.assertEqual(len(fake.prompts), 2)
+
+    def test_incomplete_item_is_requested_alone(self):
+        def generate(prompt, endpoint=None):
+            if prompt.startswith(ai.PROMPT):
+                return json.dumps({"summary": "단건", "bullets": ["하나"], "keywords": ["단건"]}, ensure_ascii=False)
+            return json.dumps({"items": [
+                {"id": "1", "summary": "요약 1", "bullets": ["하나"], "keywords": ["첫"]},
+                {"id": "2", "summary": "요약 2", "bullets": ["하나"]},  # keywords 빠짐
+            ]}, ensure_ascii=False)
+
+        with mock.patch.object(ai, "_generate", side_effect=generate) as fake:
+            results = ai.summarize_many(["첫 번째 기사", "두 번째 기사"])
+        self.assertEqual([r["summary"] for r in results], ["요약 1", "단건"])
+        self.assertEqual(fake.call_count, 2)
+
+    def test_failed_batch_falls_back_without_caching(self):
+        with mock.patch.object(ai, "_generate", side_effect=RuntimeError("down")):
+            results = ai.summarize_many(["첫 번째 기사", "두 번째 기사"])
+        self.assertTrue(all("간단 요약" in r["summary"] for r in results))
+        self.assertEqual(len(ai._cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+점자 순차 읽기 재생 타임라인
+
+텍스트를 디스플레이 페이지로 나누고(encode_hangul.paginate), 페이지마다 표시 시간(dwell)을 계산합니다.
+클라이언트(PWA)와 라즈베리파이 브릿지는 받은 타임라인을 그대로 재생하면 되므로
+단계마다 서버에 다시 요청할 필요가 없습니다.
+
+표시 시간 = base + 셀 수 × per_cell + 올라온 점 수 × per_dot + 축약 보정 × per_contraction
+    축약 보정: 글자의 셀 수가 자모 수와 다른 정도
+        (쌍자음/이중모음/겹받침처럼 셀이 늘어나거나, 초성 ㅇ 생략처럼 셀이 줄어드는 경우)
+"""
+import hashlib
+import unicodedata
+from typing import Dict, List, Tuple
+
+from django.core.cache import cache
+
+from .encode_hangul import TABLE_VERSION, encode_char, paginate
+
+# 읽기 속도 프로필 (ms)
+SPEED_PROFILES: Dict[str, Dict[str, int]] = {
+    "slow": {"base": 1000, "per_cell": 400, "per_dot": 60, "per_contraction": 500},
+    "normal": {"base": 600, "per_cell": 250, "per_dot": 40, "per_contraction": 300},
+    "fast": {"base": 300, "per_cell": 150, "per_dot": 20, "per_contraction": 150},
+}
+DEFAULT_PROFILE = "normal"
+MAX_TEXT_LENGTH = 2000
+CACHE_TIMEOUT = 60 * 60 * 24  # 같은 텍스트/프로필은 디바이스와 관계없이 재사용
+
+
+def _jamo_count(char: str) -> int:
+    if "가" <= char <= "힣":
+        return 3 if (ord(char) - ord("가")) % 28 else 2
+    return 1
+
+
+def contraction_weight(char: str) -> int:
+    """글자의 셀 수가 자모 수와 다른 정도 (0이면 자모당 1셀)"""
+    return abs(len(encode_char(char)) - _jamo_count(char))
+
+
+def page_dwell_ms(page_text: str, packets: List[Tuple[int, int]], profile: Dict[str, int]) -> int:
+    dots = sum(bin(pattern).count("1") for _, pattern in packets)
+    contractions = sum(contraction_weight(char) for char in page_text)
+    return (
+        profile["base"]
+        + profile["per_cell"] * len(packets)
+        + profile["per_dot"] * dots
+        + profile["per_contraction"] * contractions
+    )
+
+
+def build_timeline(text: str, profile: str = DEFAULT_PROFILE, cells: int = 3) -> dict:
+    """
+    재생 타임라인 생성
+
+    Returns:
+        {"text", "profile", "cells", "version", "total_ms",
+         "frames": [{"index", "at_ms", "dwell_ms", "text", "packets"}, ...]}
+    """
+    if profile not in SPEED_PROFILES:
+        raise ValueError(f"unknown profile: {profile}")
+    weights = SPEED_PROFILES[profile]
+
+    frames = []
+    at_ms = 0
+    for index, (page_text, packets) in enumerate(paginate(text, cells)):
+        dwell_ms = page_dwell_ms(page_text, packets, weights)
+        frames.append({
+            "index": index,
+            "at_ms": at_ms,
+            "dwell_ms": dwell_ms,
+            "text": page_text,
+            "packets": [list(packet) for packet in packets],
+        })
+        at_ms += dwell_ms
+
+    return {
+        "text": text,
+        "profile": profile,
+        "cells": cells,
+        "version": TABLE_VERSION,
+        "total_ms": at_ms,
+        "frames": frames,
+    }
+
+
+def _cache_key(text: str, profile: str, cells: int) -> str:
+    digest = hashlib.sha1(f"{profile}\x00{cells}\x00{text}".encode("utf-8")).hexdigest()
+    return f"braille:timeline:v{TABLE_VERSION}:{digest}"
+
+
+def get_timeline(text: str, profile: str = DEFAULT_PROFILE, cells: int = 3) -> dict:
+    """캐시된 타임라인 반환 (없으면 생성 후 캐시)"""
+    text = unicodedata.normalize("NFC", text or "")
+    key = _cache_key(text, profile, cells)
+    timeline = cache.get(key)
+    if timeline is None:
+        timeline = build_timeline(text, profile, cells)
+        cache.set(key, timeline, CACHE_TIMEOUT)
+    return timeline
@@ -17,6 +17,13 @@ CMD_MULTI = 0x81   # 다중 셀 모드 (단어/문장 모드)
 CMD_CLEAR = 0x82   # 모든 셀 클리어
 CMD_TEST = 0x83    # 테스트 모드 (dot1~dot6 순차 출력)
 
+# 완성형 분해용 자모 순서 (유니코드 초성/중성 인덱스)
+CONSONANTS = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+VOWELS = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
+
+# 컴파일된 점자 테이블 포맷 버전 (raspberrypi/braille_table.json)
+TABLE_VERSION = 1
+
 
 def dots_to_pattern(dots: List[int]) -> int:
     """
@@ -33,6 +40,80 @@ def dots_to_pattern(dots: List[int]) -> int:
     return bit_array_to_pattern(bit_array)
 
 
+def _entry_patterns(entry, braille_map: dict, resolve_refs: bool = False) -> List[int]:
+    """
+    JSON 엔트리 하나를 패턴 리스트로 변환 (빈 패턴 제외)
+
+    Args:
+        entry: 점 번호 리스트, 2차원 배열 또는 문자열 참조 (["ㅗ", "⠗"])
+        braille_map: 점자 매핑 테이블
+        resolve_refs: 문자열 참조를 vowel/special 섹션에서 해석할지 여부 (중성용)
+
+    Returns:
+        패턴 바이트 리스트
+    """
+    patterns = []
+    # 2차원 배열 처리 (쌍자음/이중모음/겹받침): [[6], [4]]
+    if isinstance(entry, list) and len(entry) > 0 and isinstance(entry[0], list):
+        for sub_entry in entry:
+            normalized = normalize_braille_entry(sub_entry, braille_map)
+            if any(normalized):
+                patterns.append(bit_array_to_pattern(normalized))
+    # 문자열 참조 형식: ["ㅗ", "⠗"] 형식
+    elif resolve_refs and isinstance(entry, list) and len(entry) == 2 and all(isinstance(x, str) for x in entry):
+        for ref in entry:
+            ref_entry = None
+            if "vowel" in braille_map and ref in braille_map["vowel"]:
+                ref_entry = braille_map["vowel"][ref]
+            elif "special" in braille_map and ref in braille_map["special"]:
+                ref_entry = braille_map["special"][ref]
+
+            if ref_entry:
+                normalized = normalize_braille_entry(ref_entry, braille_map)
+                if any(normalized):
+                    patterns.append(bit_array_to_pattern(normalized))
+    else:
+        normalized = normalize_braille_entry(entry, braille_map)
+        if any(normalized):
+            patterns.append(bit_array_to_pattern(normalized))
+    return patterns
+
+
+def _initial_patterns(index: int, braille_map: dict) -> List[int]:
+    """초성 인덱스(0~18)의 패턴 리스트"""
+    if index >= len(CONSONANTS):
+        return []
+    char = CONSONANTS[index]
+    if "initial" in braille_map and char in braille_map["initial"]:
+        return _entry_patterns(braille_map["initial"][char], braille_map)
+    return []
+
+
+def _medial_patterns(index: int, braille_map: dict) -> List[int]:
+    """중성 인덱스(0~20)의 패턴 리스트"""
+    if index >= len(VOWELS):
+        return []
+    char = VOWELS[index]
+    if "vowel" in braille_map and char in braille_map["vowel"]:
+        return _entry_patterns(braille_map["vowel"][char], braille_map, resolve_refs=True)
+    return []
+
+
+def _final_patterns(index: int, braille_map: dict) -> List[int]:
+    """종성 인덱스(0~27)의 패턴 리스트 (0은 받침 없음)"""
+    if not (0 < index < len(CONSONANTS)):
+        return []
+    char = CONSONANTS[index]
+    entry = None
+    if "final" in braille_map and char in braille_map["final"]:
+        entry = braille_map["final"][char]
+    elif "initial" in braille_map and char in braille_map["initial"]:
+        entry = braille_map["initial"][char]
+    if not entry:
+        return []
+    return _entry_patterns(entry, braille_map)
+
+
 def encode_char(char: str) -> List[Tuple[int, int]]:
     """
     단일 문자를 CMD/PATTERN 패킷 리스트로 변환
@@ -119,84 +200,11 @@ def encode_char(char: str) -> List[Tuple[int, int]]:
         medial = (base % (21 * 28)) // 28  # 중성
         final = base % 28  # 종성
         
-        consonants = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
-        vowels = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
-        
-        patterns = []
-        
-        # 초성 처리
-        if initial < len(consonants):
-            initial_char = consonants[initial]
-            if "initial" in braille_map and initial_char in braille_map["initial"]:
-                initial_entry = braille_map["initial"][initial_char]
-                # 2차원 배열 처리 (쌍자음): [[6], [4]]
-                if isinstance(initial_entry, list) and len(initial_entry) > 0 and isinstance(initial_entry[0], list):
-                    for sub_entry in initial_entry:
-                        normalized = normalize_braille_entry(sub_entry, braille_map)
-                        if any(normalized):
-                            pattern = bit_array_to_pattern(normalized)
-                            patterns.append(pattern)
-                else:
-                    normalized = normalize_braille_entry(initial_entry, braille_map)
-                    if any(normalized):
-                        pattern = bit_array_to_pattern(normalized)
-                        patterns.append(pattern)
-        
-        # 중성 처리
-        if medial < len(vowels):
-            medial_char = vowels[medial]
-            if "vowel" in braille_map and medial_char in braille_map["vowel"]:
-                medial_entry = braille_map["vowel"][medial_char]
-                
-                # 2차원 배열 처리 (이중모음): [[1, 2, 3, 6], [1, 2, 3, 5]]
-                if isinstance(medial_entry, list) and len(medial_entry) > 0 and isinstance(medial_entry[0], list):
-                    for sub_entry in medial_entry:
-                        normalized = normalize_braille_entry(sub_entry, braille_map)
-                        if any(normalized):
-                            pattern = bit_array_to_pattern(normalized)
-                            patterns.append(pattern)
-                # 문자열 참조 형식: ["ㅗ", "⠗"] 형식
-                elif isinstance(medial_entry, list) and len(medial_entry) == 2 and all(isinstance(x, str) for x in medial_entry):
-                    for ref in medial_entry:
-                        ref_entry = None
-                        if "vowel" in braille_map and ref in braille_map["vowel"]:
-                            ref_entry = braille_map["vowel"][ref]
-                        elif "special" in braille_map and ref in braille_map["special"]:
-                            ref_entry = braille_map["special"][ref]
-                        
-                        if ref_entry:
-                            normalized = normalize_braille_entry(ref_entry, braille_map)
-                            if any(normalized):
-                                pattern = bit_array_to_pattern(normalized)
-                                patterns.append(pattern)
-                else:
-                    normalized = normalize_braille_entry(medial_entry, braille_map)
-                    if any(normalized):
-                        pattern = bit_array_to_pattern(normalized)
-                        patterns.append(pattern)
-        
-        # 종성 처리
-        if final > 0 and final < len(consonants):
-            final_char = consonants[final]
-            final_entry = None
-            if "final" in braille_map and final_char in braille_map["final"]:
-                final_entry = braille_map["final"][final_char]
-            elif "initial" in braille_map and final_char in braille_map["initial"]:
-                final_entry = braille_map["initial"][final_char]
-            
-            if final_entry:
-                # 2차원 배열 처리 (겹받침): [[1], [3]]
-                if isinstance(final_entry, list) and len(final_entry) > 0 and isinstance(final_entry[0], list):
-                    for sub_entry in final_entry:
-                        normalized = normalize_braille_entry(sub_entry, braille_map)
-                        if any(normalized):
-                            pattern = bit_array_to_pattern(normalized)
-                            patterns.append(pattern)
-                else:
-                    normalized = normalize_braille_entry(final_entry, braille_map)
-                    if any(normalized):
-                        pattern = bit_array_to_pattern(normalized)
-                        patterns.append(pattern)
+        patterns = (
+            _initial_patterns(initial, braille_map)
+            + _medial_patterns(medial, braille_map)
+            + _final_patterns(final, braille_map)
+        )
         
         # 패턴이 있으면 패킷 생성
         if patterns:
@@ -271,3 +279,82 @@ def text_to_packets(text: str) -> List[Tuple[int, int]]:
     
     return encode_sentence(text)
 
+
+
+def paginate(text: str, cells: int = 3) -> List[Tuple[str, List[Tuple[int, int]]]]:
+    """
+    텍스트를 점자 디스플레이 페이지 단위로 나눔 (페이지에 표시되는 글자 포함)
+
+    한 페이지는 최대 cells개의 셀(패턴)을 담고, 한 글자의 패킷은 가능한 한
+    같은 페이지에 둡니다. cells보다 긴 글자만 여러 페이지로 나눕니다.
+
+    Args:
+        text: 변환할 텍스트
+        cells: 디스플레이 셀 수
+
+    Returns:
+        [(페이지 글자, [(CMD, pattern), ...]), ...] 리스트
+    """
+    if not text:
+        return []
+
+    pages = []
+    page_text, page = "", []
+    for char in unicodedata.normalize("NFC", text):
+        packets = encode_char(char)
+        if page and len(page) + len(packets) > cells:
+            pages.append((page_text, page))
+            page_text, page = "", []
+        if len(packets) > cells:
+            # 셀 수보다 긴 글자는 단독 페이지들로 나눔
+            pages.extend((char, packets[i:i + cells]) for i in range(0, len(packets), cells))
+            continue
+        page_text += char
+        page.extend(packets)
+    if page:
+        pages.append((page_text, page))
+    return pages
+
+
+def text_to_pages(text: str, cells: int = 3) -> List[List[Tuple[int, int]]]:
+    """
+    텍스트를 점자 디스플레이 페이지 단위로 나눈 패킷 리스트로 변환 (paginate 참고)
+
+    Returns:
+        [[(CMD, pattern), ...], ...] 페이지 리스트
+    """
+    return [packets for _, packets in paginate(text, cells)]
+
+
+def compile_table() -> dict:
+    """
+    Django 없이 사용할 수 있는 컴파일된 점자 테이블 생성
+    (라즈베리파이 브릿지의 로컬 인코딩용, scripts/build_braille_table.py 참고)
+
+    - chars: 자모/구두점 등 직접 매핑 문자 → [[CMD, pattern], ...]
+    - initial/medial/final: 완성형 분해 인덱스별 패턴 리스트
+
+    완성형 한글은 initial[초성] + medial[중성] + final[종성] 패턴을 이어 붙이고,
+    패턴이 1개면 CMD_SINGLE, 여러 개면 CMD_MULTI로 인코딩합니다.
+
+    Returns:
+        JSON 직렬화 가능한 dict
+    """
+    braille_map = _load_braille_map()
+    if not braille_map or "initial" not in braille_map:
+        return {}
+
+    chars = {}
+    for section in ("initial", "vowel", "final", "punctuation"):
+        for char in braille_map.get(section, {}):
+            if char not in chars:
+                chars[char] = [list(packet) for packet in encode_char(char)]
+
+    return {
+        "version": TABLE_VERSION,
+        "cmd": {"single": CMD_SINGLE, "multi": CMD_MULTI, "clear": CMD_CLEAR},
+        "chars": chars,
+        "initial": [_initial_patterns(i, braille_map) for i in range(19)],
+        "medial": [_medial_patterns(i, braille_map) for i in range(21)],
+        "final": [_final_patterns(i, braille_map) for i in range(28)],
+    }
@@ -0,0 +1,205 @@
+"""
+로컬 키워드 추출 (점자 출력용 1~3글자 명사 위주)
+
+LLM에 "키워드: ..."를 따로 요청하지 않아도, LLM이 응답하지 않을 때도 답변/질문 텍스트에서 바로 키워드를 뽑습니다.
+
+    from utils.keywords import extract_keywords
+    extract_keywords("물가가 오르면서 정부가 대책을 발표했다")   # ['물가', '정부', '대책']
+
+1. 한글 어절을 조사/어미 접미사 트라이로 잘라 어간(명사 후보)만 남김 ("정부가" → "정부", "발표했다" → "발표").
+   받침에 맞지 않는 조사는 떼지 않음 ("디스플레이"의 "이"는 조사가 아님), 서술어("놀았다", "배우는", "맑고")는 뺌
+2. 후보마다 TF × IDF (문서 빈도표: data/keyword_idf.json, 흔한 단어일수록 낮음.
+   저장소의 문서/답변/학습 문장으로 scripts/build_keyword_idf.py가 build_idf()로 생성)
+3. 점자 셀이 적게 드는 1~3글자에 가중치, 동점이면 먼저 나온 단어
+"""
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+IDF_PATH = Path(__file__).resolve().parent.parent / "data" / "keyword_idf.json"
+
+_WORD = re.compile(r"[가-힣]+")
+
+# 어절 끝에서 떼어낼 조사/어미 (긴 것부터 맞춰 봄)
+PARTICLES = (
+    "이", "가", "은", "는", "을", "를", "의", "에", "도", "만", "와", "과", "로", "들",
+    "에서", "에게", "께서", "한테", "으로", "부터", "까지", "처럼", "보다", "마다", "이나", "이란", "라는", "이라", "에는",
+    "에도", "와의", "과의", "로서", "로써", "이다", "였다", "이며", "이고", "적인", "적으로", "에서는", "으로는", "이라는",
+    "이었다", "입니다", "이에요", "예요", "이죠", "하다", "한다", "했다", "하는", "하고", "하며", "하여", "해서", "했던",
+    "합니다", "했습니다", "하면", "하지", "하게", "되다", "된다", "됐다", "되는", "되고", "되어", "돼", "된", "됩니다",
+    "되었다", "시키는", "스러운", "들이", "들은", "들을", "들의", "들에게", "들과", "야", "이야",
+)
+# 받침 있는 말 뒤에만 오는 조사 / 받침 없는 말 뒤에만 오는 조사 ("레이", "체인"처럼 받침이 안 맞으면 명사의 일부)
+_AFTER_CONSONANT = frozenset(p for p in PARTICLES if p[0] in "이은을과으")
+_AFTER_VOWEL = frozenset(("가", "는", "를", "와", "와의", "예요", "야"))
+# 받침 뒤 "이"로 끝나지만 통째로 명사인 단어
+NOUNS = frozenset("점글이 고양이 어린이 원숭이 놀이 길이 높이 깊이 넓이 먹이".split())
+# 떼어낸 뒤 남아야 하는 최소 길이: 한 글자 조사는 "국가"→"국"처럼 명사를 자르기 쉬워 어간 2글자 이상일 때만
+# ("인", "한"처럼 명사 끝에 흔한 글자는 아예 넣지 않음: "체인", "권한")
+_MIN_STEM = {1: 2}
+
+STOPWORDS = frozenset(
+    "것 수 등 때 중 더 및 또 그 이 저 좀 잘 못 안 뭐 왜 우리 저희 여러분 무엇 어떤 이것 그것 저것 여기 거기 "
+    "이런 그런 저런 때문 가지 하나 모두 매우 아주 가장 정말 다시 바로 그냥 또한 그리고 하지만 그러나 "
+    "알려줘 설명해줘 해줘 주세요 있다 없다 같다 있는 없는 같은 이다 입니다 습니다 키워드 "
+    "위해 위한 여러 모든 다른 뭐야 뭐지 뭔가 뭔가요 뭐예요 뭐에요 뭘까 뭔데 뭐니 어때 어때요 어떻게".split()
+)
+_VERB_ENDINGS = ("요", "죠", "까", "니다", "줘", "습니다", "면서", "지만", "어서", "아서", "니까", "는데", "려고", "도록",
+                 "거야", "인가", "는가", "로운", "러운", "거운", "까운", "려운", "여운", "다운")
+# 조사를 떼면 명사처럼 보이는 동사/형용사 어간 ("미치는" → "미치", "배우는" → "배우")
+VERB_STEMS = frozenset(
+    "미치 끼치 지니 보이 나타나 만들 이루 따르 바꾸 오르 내리 생기 모르 다르 지나 느끼 알리 늘리 "
+    "배우 싸우 세우 키우 채우 비우 가르치 고치 다루 나누 가꾸 모으 부르 고르 누르 흐르 기르 자르 만나 떠나 보내 지내".split()
+)
+# 연결/관형 어미 "-고", "-게" 앞에 오는 용언 받침 (명사+"고"는 "광고", "창고", "참고", "원고"처럼 ㄴ/ㄹ/ㅁ/ㅇ 받침)
+_VERB_FINALS = frozenset("ㄱㄲㄳㄵㄶㄷㄺㄻㄼㄽㄾㄿㅀㅂㅄㅅㅆㅈㅊㅋㅌㅍㅎ")
+# 관형 어미 "-은", "-을" 앞에 오는 형용사 받침 ("좋은", "많은", "맑은", "넓은"; 명사 끝에는 거의 안 옴)
+_ADJ_FINALS = frozenset("ㄵㄶㄺㄼㄾㅀㅆㅎ")
+_FINALS = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+# "-어" 꼴 연결 어미로 끝나는 글자 ("나눠", "바꿔"; "파워", "타워" 같은 외래어 때문에 "워"는 뺌)
+_CONNECTIVE_EO = frozenset("눠꿔둬뤄춰숴쒀")
+# "다"로 끝나는 명사 (그 밖의 "...다"는 서술어: "놀았다", "미친다", "귀엽다")
+_NOUNS_ENDING_IN_DA = frozenset("바다".split())
+
+# 글자 수별 가중치 (점자 디스플레이 3셀 기준으로 짧은 명사 선호)
+LENGTH_WEIGHT = {1: 0.6, 2: 1.3, 3: 1.1}
+LONG_WEIGHT = 0.5
+
+
+def _build_trie(suffixes: Iterable[str]) -> dict:
+    """뒤집은 접미사 트라이 (어절 끝에서부터 한 글자씩 따라감)"""
+    root: dict = {}
+    for suffix in suffixes:
+        node = root
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        node[""] = len(suffix)
+    return root
+
+
+_TRIE = _build_trie(PARTICLES)
+
+
+@lru_cache(maxsize=1)
+def _idf_table() -> tuple:
+    try:
+        with open(IDF_PATH, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+        return int(data.get("documents", 0)), dict(data.get("df", {}))
+    except (OSError, ValueError):
+        return 0, {}
+
+
+def idf(word: str) -> float:
+    documents, df = _idf_table()
+    return math.log((documents + 1) / (df.get(word, 0) + 1)) + 1
+
+
+@lru_cache(maxsize=4096)
+def strip_particles(word: str) -> str:
+    """어절에서 조사/어미를 떼어낸 어간 (사전에 있는 단어는 그대로)"""
+    if word in _idf_table()[1] or word in NOUNS:
+        return word
+    node, cut = _TRIE, 0
+    for char in reversed(word):
+        node = node.get(char)
+        if node is None:
+            break
+        length = node.get("")
+        if length and len(word) - length >= _MIN_STEM.get(length, 1) and _fits(word[:-length], word[-length:]):
+            cut = length  # 조건을 만족하는 가장 긴 접미사
+    if cut:
+        word = word[:-cut]
+    if len(word) > 2 and word.endswith("들"):  # "학생들에게" → "학생들" → "학생"
+        word = word[:-1]
+    return word
+
+
+def _has_final(char: str) -> bool:
+    """받침이 있는 한글 음절인지"""
+    return "가" <= char <= "힣" and (ord(char) - 0xAC00) % 28 != 0
+
+
+def _fits(stem: str, particle: str) -> bool:
+    """조사가 어간의 받침과 맞는지 ("레이"+"가"는 되고 "디스플레"+"이"는 안 됨)"""
+    if particle in _AFTER_CONSONANT:
+        return _has_final(stem[-1])
+    if particle in _AFTER_VOWEL:
+        return not _has_final(stem[-1])
+    return True
+
+
+def _final(char: str) -> str:
+    """한글 음절의 받침 (없으면 " ")"""
+    return _FINALS[(ord(char) - 0xAC00) % 28] if "가" <= char <= "힣" else " "
+
+
+def _predicate(stem: str) -> bool:
+    """동사/형용사 (키워드로 쓰지 않음)"""
+    if stem.endswith(_VERB_ENDINGS) or stem in VERB_STEMS or stem[-1] in _CONNECTIVE_EO:
+        return True
+    if len(stem) < 2:
+        return False
+    last, before = stem[-1], _final(stem[-2])
+    if last == "다":  # "놀았다", "미친다", "귀엽다"
+        return stem not in _NOUNS_ENDING_IN_DA
+    if last in "고게":  # "맑고", "먹고", "쉽게"
+        return before in _VERB_FINALS
+    if last in "은을":  # "좋은", "많은"
+        return before in _ADJ_FINALS
+    # 미래 관형형 "조정할", "변경될" ("역할"처럼 두 글자 명사는 그대로)
+    return len(stem) >= 3 and last in "할될"
+
+
+def candidates(text: str, predicates: bool = False) -> List[str]:
+    """텍스트의 명사 후보 (등장 순서대로, 중복 포함). predicates=True면 서술어("오를까", "읽어")도 남김"""
+    words = []
+    for token in _WORD.findall(text or ""):
+        if token in STOPWORDS:
+            continue
+        stem = strip_particles(token)
+        if not stem or stem in STOPWORDS or (not predicates and _predicate(stem)):
+            continue
+        words.append(stem)
+    return words
+
+
+def extract_keywords(text: str, limit: int = 3, boost: Optional[str] = None) -> List[str]:
+    """
+    TF-IDF 상위 키워드 limit개 (결정적 순서)
+
+    boost: 질문 등 함께 고려할 텍스트. 여기 나온 단어는 두 배로 셈
+    """
+    words = candidates(text)
+    if boost:
+        words += candidates(boost) * 2
+    if not words:
+        return []
+    counts = Counter(words)
+    first = {}
+    for position, word in enumerate(words):
+        first.setdefault(word, position)
+
+    def score(word: str) -> float:
+        weight = LENGTH_WEIGHT.get(len(word), LONG_WEIGHT)
+        return (1 + math.log(counts[word])) * idf(word) * weight
+
+    ranked = sorted(counts, key=lambda word: (-score(word), first[word]))
+    return ranked[:limit]
+
+
+def build_idf(documents: Iterable[str]) -> Dict[str, object]:
+    """말뭉치에서 문서 빈도표 생성 (data/keyword_idf.json 갱신용)"""
+    df: Counter = Counter()
+    total = 0
+    for document in documents:
+        total += 1
+        df.update(set(candidates(document)))
+    # 빈도 내림차순, 같으면 가나다순 (다시 만들어도 같은 파일)
+    return {"documents": total, "df": dict(sorted(df.items(), key=lambda item: (-item[1], item[0])))}
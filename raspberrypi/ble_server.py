@@ -4,56 +4,123 @@
 Raspberry Pi 4에서 실행
 
 HARDWARE_SPEC.md의 스펙을 준수합니다.
+여러 점자 모듈을 연결하면 디스플레이 ID로 라우팅합니다 (bridge.py 참고).
 """
 
 from bluezero import peripheral
 from serial import Serial
+import os
 import sys
 import time
 
+from bridge import DisplayRouter, SerialOutput, parse_serial_ports
+from serial_link import SerialLink
+
 # BLE 설정 (HARDWARE_SPEC.md에 명시된 값 - 불변)
 DEVICE_NAME = "Jeomgeuli"
 SERVICE_UUID = "12345678-1234-5678-1234-56789abcdef0"
 CHAR_UUID = "abcdabcd-1234-5678-1111-abcdefabcdef"
 
+# 텍스트 프레임 Characteristic (선택: UTF-8 텍스트를 Pi에서 직접 점자로 인코딩)
+# JEOMGEULI_LOCAL_ENCODE=0 으로 비활성화
+TEXT_CHAR_UUID = "abcdabcd-1234-5678-1111-abcdefabcdf0"
+LOCAL_ENCODE = os.getenv("JEOMGEULI_LOCAL_ENCODE", "1") != "0"
+
+# 멀티 디스플레이 프레임 Characteristic: [display_id, frame_type, payload...]
+FRAME_CHAR_UUID = "abcdabcd-1234-5678-1111-abcdefabcdf1"
+
 # Serial 설정
+# 여러 모듈: JEOMGEULI_SERIAL_PORTS="/dev/ttyACM0,/dev/ttyACM1" (순서대로 디스플레이 0, 1, ...)
+#           또는 "0=/dev/ttyACM0,2=/dev/ttyUSB0" 처럼 ID 지정
 SERIAL_PORT = "/dev/ttyACM0"  # Arduino가 연결된 포트 (확인 필요)
+SERIAL_PORTS = parse_serial_ports(os.getenv("JEOMGEULI_SERIAL_PORTS", SERIAL_PORT))
 BAUD_RATE = 115200
+QUEUE_SIZE = int(os.getenv("JEOMGEULI_QUEUE_SIZE", "64"))
 
-# Serial 연결
-try:
-    ser = Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-    print(f"[Serial] {SERIAL_PORT} 연결됨 ({BAUD_RATE} baud)")
-except Exception as e:
-    print(f"[Serial] 연결 실패: {e}")
+# ACK + 슬라이딩 윈도우 프레임 전송 (serial_link.py, 프레임 수신부가 있는 펌웨어 필요)
+# JEOMGEULI_SERIAL_ARQ=1 로 활성화
+SERIAL_ARQ = os.getenv("JEOMGEULI_SERIAL_ARQ", "0") == "1"
+
+# 기존 Characteristic(헤더 없음)은 이 디스플레이로 전달
+DEFAULT_DISPLAY = min(SERIAL_PORTS) if SERIAL_PORTS else 0
+
+# 로컬 인코더
+encode = None
+if LOCAL_ENCODE:
+    try:
+        from braille_encoder import get_table, text_to_bytes
+        table = get_table()
+        encode = text_to_bytes
+        print(f"[Encoder] 로컬 점자 인코딩 활성화 (테이블 v{table.version})")
+    except Exception as e:
+        print(f"[Encoder] 점자 테이블 로드 실패, 텍스트 프레임 비활성화: {e}")
+
+# Serial 연결 (디스플레이마다 writer 스레드)
+outputs = {}
+for display_id, port in sorted(SERIAL_PORTS.items()):
+    try:
+        if SERIAL_ARQ:
+            # ACK 수신 스레드가 짧게 깨어나 재전송/윈도우 갱신을 처리하도록 read 타임아웃을 짧게
+            ser = SerialLink(Serial(port, BAUD_RATE, timeout=0.02)).open()
+        else:
+            ser = Serial(port, BAUD_RATE, timeout=1)
+        outputs[display_id] = SerialOutput(display_id, ser, queue_size=QUEUE_SIZE, name=port)
+        mode = "ACK/윈도우" if SERIAL_ARQ else "raw"
+        print(f"[Serial] 디스플레이 {display_id}: {port} 연결됨 ({BAUD_RATE} baud, {mode})")
+    except Exception as e:
+        print(f"[Serial] 디스플레이 {display_id}: {port} 연결 실패: {e}")
+
+if not outputs:
+    print(f"[Serial] 연결된 포트가 없습니다.")
     print(f"[Serial] 사용 가능한 포트 확인: ls /dev/ttyACM* /dev/ttyUSB*")
     sys.exit(1)
 
+router = DisplayRouter(outputs, encode=encode)
+
 def write_handler(value):
-    """BLE Write → Serial 전송"""
-    try:
-        # BLE로 받은 데이터를 그대로 Serial로 전송
-        ser.write(value)
-        ser.flush()
-        print(f"[BLE→Serial] {len(value)} 바이트 전송: {value.hex()}")
-    except Exception as e:
-        print(f"[BLE→Serial] 전송 실패: {e}")
+    """BLE Write → Serial 전송 (기본 디스플레이)"""
+    # BLE로 받은 데이터를 그대로 Serial로 전송
+    router.send_packets(DEFAULT_DISPLAY, bytes(value))
+
+def text_write_handler(value):
+    """BLE Write(UTF-8 텍스트) → 로컬 점자 인코딩 → Serial 전송 (기본 디스플레이)"""
+    router.send_text(DEFAULT_DISPLAY, bytes(value))
+
+def frame_write_handler(value):
+    """BLE Write(헤더 프레임) → 디스플레이 ID로 라우팅"""
+    router.route(bytes(value))
+
+characteristics = [{
+    'uuid': CHAR_UUID,
+    'properties': ['write', 'write-without-response'],
+    'write': write_handler
+}, {
+    'uuid': FRAME_CHAR_UUID,
+    'properties': ['write', 'write-without-response'],
+    'write': frame_write_handler
+}]
+
+if encode is not None:
+    characteristics.append({
+        'uuid': TEXT_CHAR_UUID,
+        'properties': ['write', 'write-without-response'],
+        'write': text_write_handler
+    })
 
 # BLE 서버 생성
 print(f"[BLE] 서버 초기화 중...")
 print(f"[BLE] 디바이스 이름: {DEVICE_NAME}")
 print(f"[BLE] Service UUID: {SERVICE_UUID}")
 print(f"[BLE] Characteristic UUID: {CHAR_UUID}")
+print(f"[BLE] Frame Characteristic UUID: {FRAME_CHAR_UUID} (디스플레이 {sorted(outputs)})")
+if encode is not None:
+    print(f"[BLE] Text Characteristic UUID: {TEXT_CHAR_UUID}")
 
 ble = peripheral.Peripheral(
     device_name=DEVICE_NAME,
     services=[{
         'uuid': SERVICE_UUID,
-        'characteristics': [{
-            'uuid': CHAR_UUID,
-            'properties': ['write', 'write-without-response'],
-            'write': write_handler
-        }]
+        'characteristics': characteristics
     }]
 )
 
@@ -62,6 +129,7 @@ try:
     ble.run()
 except KeyboardInterrupt:
     print("\n[BLE] 서버 종료")
-    ser.close()
+    router.close()
+    for output in outputs.values():
+        output.port.close()
     sys.exit(0)
-
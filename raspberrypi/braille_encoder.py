@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+점글이 로컬 점자 인코더 (Django 불필요)
+Raspberry Pi에서 UTF-8 텍스트를 직접 CMD/PATTERN 패킷으로 변환
+
+backend의 utils.encode_hangul과 동일한 결과를 내도록
+컴파일된 테이블(braille_table.json)을 사용합니다.
+테이블 갱신: backend에서 `python scripts/build_braille_table.py`
+"""
+
+import json
+import os
+import unicodedata
+from typing import List, Optional, Tuple
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "braille_table.json")
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+
+class BrailleTable:
+    """컴파일된 점자 테이블 (utils.encode_hangul.compile_table 결과)"""
+
+    def __init__(self, table: dict):
+        self.version = table.get("version")
+        cmd = table.get("cmd", {})
+        self.cmd_single = cmd.get("single", 0x80)
+        self.cmd_multi = cmd.get("multi", 0x81)
+        self.cmd_clear = cmd.get("clear", 0x82)
+        self.chars = {ch: [tuple(p) for p in packets] for ch, packets in table.get("chars", {}).items()}
+        self.initial = table.get("initial", [])
+        self.medial = table.get("medial", [])
+        self.final = table.get("final", [])
+
+    @classmethod
+    def load(cls, path: str = TABLE_PATH) -> "BrailleTable":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def encode_char(self, char: str) -> List[Tuple[int, int]]:
+        """단일 문자 → [(CMD, pattern), ...]"""
+        if not char:
+            return []
+
+        ch = unicodedata.normalize("NFC", char)[0]
+        if ch in self.chars:
+            return list(self.chars[ch])
+
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            base = code - HANGUL_BASE
+            patterns = (
+                self.initial[base // (21 * 28)]
+                + self.medial[(base % (21 * 28)) // 28]
+                + self.final[base % 28]
+            )
+            if not patterns:
+                return []
+            first_cmd = self.cmd_single if len(patterns) == 1 else self.cmd_multi
+            return [(first_cmd if i == 0 else self.cmd_multi, p) for i, p in enumerate(patterns)]
+
+        # 알 수 없는 문자는 공백
+        return [(self.cmd_single, 0x00)]
+
+    def text_to_packets(self, text: str) -> List[Tuple[int, int]]:
+        """텍스트 → [(CMD, pattern), ...]"""
+        packets = []
+        for ch in unicodedata.normalize("NFC", text or ""):
+            packets.extend(self.encode_char(ch))
+        return packets
+
+
+def packets_to_bytes(packets: List[Tuple[int, int]]) -> bytes:
+    """[(CMD, pattern), ...] → Serial 전송용 바이트열 (CMD, PATTERN 순서)"""
+    return bytes(b for cmd, pattern in packets for b in (cmd & 0xFF, pattern & 0x3F))
+
+
+_TABLE: Optional[BrailleTable] = None
+
+
+def get_table() -> BrailleTable:
+    """기본 테이블 로드 (프로세스당 1회)"""
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = BrailleTable.load()
+    return _TABLE
+
+
+def text_to_packets(text: str) -> List[Tuple[int, int]]:
+    """텍스트를 CMD/PATTERN 패킷 리스트로 변환 (메인 진입점)"""
+    return get_table().text_to_packets(text)
+
+
+def text_to_bytes(text: str) -> bytes:
+    """텍스트를 Serial 전송용 바이트열로 변환"""
+    return packets_to_bytes(text_to_packets(text))
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+점글이 멀티 디스플레이 브릿지
+하나의 Raspberry Pi로 여러 점자 모듈(Arduino)을 구동
+
+- 디스플레이마다 Serial 출력 + 전용 큐 + writer 스레드
+- BLE 콜백은 큐에 넣기만 하므로 느린 디바이스가 다른 디바이스를 막지 않음
+- 프레임 헤더의 디스플레이 ID로 라우팅
+
+프레임 형식 (FRAME_CHAR_UUID):
+    [display_id, frame_type, payload...]
+    frame_type 0x00: CMD/PATTERN 패킷 바이트 (그대로 전달)
+    frame_type 0x01: UTF-8 텍스트 (Pi에서 로컬 인코딩)
+"""
+
+import codecs
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+FRAME_PACKETS = 0x00
+FRAME_TEXT = 0x01
+
+DEFAULT_QUEUE_SIZE = 64
+
+
+def parse_serial_ports(spec: str) -> Dict[int, str]:
+    """
+    포트 설정 문자열 파싱
+
+    예: "/dev/ttyACM0,/dev/ttyACM1" → {0: "/dev/ttyACM0", 1: "/dev/ttyACM1"}
+        "0=/dev/ttyACM0,3=/dev/ttyUSB0" → {0: "/dev/ttyACM0", 3: "/dev/ttyUSB0"}
+    """
+    ports = {}
+    for index, item in enumerate(p.strip() for p in (spec or "").split(",")):
+        if not item:
+            continue
+        if "=" in item:
+            display_id, port = item.split("=", 1)
+            ports[int(display_id)] = port.strip()
+        else:
+            ports[index] = item
+    return ports
+
+
+class SerialOutput:
+    """디스플레이 하나의 Serial 출력 (전용 큐 + writer 스레드)"""
+
+    def __init__(self, display_id: int, port, queue_size: int = DEFAULT_QUEUE_SIZE, name: str = ""):
+        self.display_id = display_id
+        self.port = port
+        self.name = name or str(getattr(port, "port", display_id))
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name=f"serial-writer-{display_id}", daemon=True)
+        self._thread.start()
+
+    def submit(self, data: bytes) -> bool:
+        """전송 요청 (블로킹 없음). 큐가 가득 차면 버리고 False"""
+        if not data:
+            return True
+        try:
+            self.queue.put_nowait(bytes(data))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            print(f"[Display {self.display_id}] 큐 가득 참, 프레임 버림 ({len(data)} 바이트, 누적 {self.dropped})")
+            return False
+
+    def _run(self):
+        while True:
+            data = self.queue.get()
+            if data is None:
+                break
+            try:
+                self.port.write(data)
+                self.port.flush()
+                self.sent += len(data)
+                print(f"[Display {self.display_id}→{self.name}] {len(data)} 바이트 전송: {data.hex()}")
+            except Exception as e:
+                print(f"[Display {self.display_id}→{self.name}] 전송 실패: {e}")
+
+    def close(self, timeout: float = 2.0):
+        """
+        남은 큐를 보낸 뒤 writer 종료 (최대 timeout초)
+
+        포트가 막혀 timeout 안에 큐에 자리가 나지 않으면 남은 프레임은 버리고 종료 신호만 넣습니다.
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            while True:
+                self._drain()
+                try:
+                    self.queue.put_nowait(None)
+                    break
+                except queue.Full:  # 그 사이 다른 스레드가 submit
+                    continue
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+
+    def _drain(self):
+        while True:
+            try:
+                data = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if data is not None:
+                self.dropped += 1
+
+
+class DisplayRouter:
+    """디스플레이 ID → SerialOutput 라우팅"""
+
+    def __init__(self, outputs: Dict[int, SerialOutput], encode: Optional[Callable[[str], bytes]] = None):
+        self.outputs = outputs
+        self.encode = encode
+        # BLE 쓰기 단위로 잘린 멀티바이트 문자를 디스플레이별로 이어 붙임
+        self._decoders = {
+            display_id: codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for display_id in outputs
+        }
+
+    def send_packets(self, display_id: int, data: bytes) -> bool:
+        """패킷 바이트를 그대로 전달"""
+        output = self.outputs.get(display_id)
+        if output is None:
+            print(f"[Router] 알 수 없는 디스플레이 ID: {display_id}")
+            return False
+        return output.submit(data)
+
+    def send_text(self, display_id: int, data: bytes) -> bool:
+        """UTF-8 텍스트를 로컬 인코딩 후 전달"""
+        if self.encode is None:
+            print("[Router] 로컬 인코딩 비활성화 상태, 텍스트 프레임 무시")
+            return False
+        decoder = self._decoders.get(display_id)
+        if decoder is None:
+            print(f"[Router] 알 수 없는 디스플레이 ID: {display_id}")
+            return False
+        text = decoder.decode(bytes(data))
+        if not text:
+            return True
+        return self.send_packets(display_id, self.encode(text))
+
+    def route(self, frame: bytes) -> bool:
+        """헤더가 붙은 프레임 처리: [display_id, frame_type, payload...]"""
+        frame = bytes(frame)
+        if len(frame) < 2:
+            print(f"[Router] 잘못된 프레임: {frame.hex()}")
+            return False
+        display_id, frame_type, payload = frame[0], frame[1], frame[2:]
+        if frame_type == FRAME_TEXT:
+            return self.send_text(display_id, payload)
+        if frame_type == FRAME_PACKETS:
+            return self.send_packets(display_id, payload)
+        print(f"[Router] 알 수 없는 프레임 타입: 0x{frame_type:02x}")
+        return False
+
+    def close(self):
+        for output in self.outputs.values():
+            output.close()
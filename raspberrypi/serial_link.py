@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+점글이 Serial 링크 프로토콜 (ACK + 슬라이딩 윈도우)
+Raspberry Pi ↔ Arduino 구간에서 펌웨어 버퍼(100바이트)를 넘기지 않고 링크를 꽉 채워 전송
+
+Host → Arduino: [STX, TYPE, SEQ, LEN, PAYLOAD..., CRC8]
+    TYPE 0x00 DATA : CMD/PATTERN 패킷 바이트
+    TYPE 0x01 SYNC : 시퀀스 초기화 + 펌웨어 버퍼 비우기 (LEN=0)
+    TYPE 0x02 PROBE: 현재 상태 ACK 요청 (LEN=0, 윈도우 갱신 유실 대비)
+Arduino → Host: [ACK|NAK, SEQ, FREE, CRC8]
+    ACK SEQ: SEQ까지 모두 수신 (누적 ACK), FREE = 펌웨어 버퍼 남은 바이트
+    NAK SEQ: SEQ부터 다시 보내야 함 (CRC 오류/유실) → go-back-N 재전송
+
+펌웨어는 버퍼를 소비하면서 FREE가 늘어나면 같은 SEQ로 ACK(윈도우 갱신)를 보냅니다.
+전송 가능한 양 = 마지막으로 알려진 FREE - 아직 ACK 받지 못한 바이트.
+
+펌웨어 구현: arduino/braille_3cell/braille_3cell.ino
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+STX = 0x02
+ACK = 0x06
+NAK = 0x15
+
+TYPE_DATA = 0x00
+TYPE_SYNC = 0x01
+TYPE_PROBE = 0x02
+
+FIRMWARE_BUFFER = 100   # 펌웨어 수신 버퍼 크기 (바이트)
+MAX_PAYLOAD = 48        # 프레임당 최대 페이로드 (버퍼에 2프레임이 들어가도록)
+MAX_INFLIGHT = 64       # 시퀀스 공간(256)의 절반 미만
+FRAME_OVERHEAD = 5      # STX, TYPE, SEQ, LEN, CRC
+
+
+class SerialLinkError(RuntimeError):
+    """재전송 한도 초과 또는 펌웨어 무응답"""
+
+
+def crc8(data: bytes, crc: int = 0) -> int:
+    """CRC-8 (다항식 0x07, 초기값 0)"""
+    for b in data:
+        crc ^= b
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def encode_frame(frame_type: int, seq: int, payload: bytes = b"") -> bytes:
+    """Host → Arduino 프레임 생성"""
+    body = bytes([frame_type, seq & 0xFF, len(payload)]) + bytes(payload)
+    return bytes([STX]) + body + bytes([crc8(body)])
+
+
+def encode_ack(kind: int, seq: int, free: int) -> bytes:
+    """Arduino → Host ACK/NAK 생성 (펌웨어 대역/테스트용)"""
+    body = bytes([kind, seq & 0xFF, free & 0xFF])
+    return body + bytes([crc8(body)])
+
+
+def _seq_le(a: int, b: int) -> bool:
+    """모듈러 시퀀스 비교: a가 b 이전이거나 같음"""
+    return ((b - a) & 0xFF) < 128
+
+
+class SerialLink:
+    """
+    ACK 기반 슬라이딩 윈도우 Serial 링크
+
+    write()/flush()를 제공하므로 bridge.SerialOutput의 포트로 그대로 사용할 수 있습니다.
+    port는 read(n)(타임아웃 있음), write(), flush()를 가진 객체 (pyserial Serial 등)
+    """
+
+    def __init__(self, port, buffer_size: int = FIRMWARE_BUFFER, max_payload: int = MAX_PAYLOAD,
+                 ack_timeout: float = 0.3, max_retries: int = 5, align: int = 2):
+        self.port = port
+        self.buffer_size = buffer_size
+        self.max_payload = min(max_payload, buffer_size, 255)
+        self.ack_timeout = ack_timeout
+        self.max_retries = max_retries
+        self.align = max(1, align)  # CMD/PATTERN 쌍이 프레임 경계에서 갈라지지 않도록
+
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._next_seq = 0
+        self._inflight = OrderedDict()  # seq → (frame, payload_len)
+        self._inflight_bytes = 0
+        self._peer_free = 0
+        self._sent_at = 0.0
+        self._last_rx = 0.0
+        self._retries = 0
+        self._nak = None
+        self._last_ack = None
+        self._last_nak = (None, 0.0)
+        self._waiting = 0
+        self._error = None
+        self._closed = False
+        self._reader = None
+
+        self.frames_sent = 0
+        self.retransmits = 0
+
+    # --- 연결 관리 ---
+
+    def open(self) -> "SerialLink":
+        """ACK 수신 스레드 시작 + 펌웨어와 시퀀스 동기화"""
+        if self._reader is None:
+            self._reader = threading.Thread(target=self._read_loop, name="serial-link-reader", daemon=True)
+            self._reader.start()
+        self.sync()
+        return self
+
+    def sync(self):
+        """SYNC 프레임으로 시퀀스 초기화 (펌웨어 재부팅/오류 복구)"""
+        with self._cond:
+            seq = (self._next_seq - 1) & 0xFF
+            self._inflight.clear()
+            self._inflight_bytes = 0
+            self._nak = None
+            self._last_ack = None
+            self._error = None
+            for _ in range(self.max_retries + 1):
+                self._write(encode_frame(TYPE_SYNC, seq))
+                deadline = time.monotonic() + self.ack_timeout
+                while self._last_ack != seq and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._last_ack == seq:
+                    self._retries = 0
+                    return
+            raise SerialLinkError("펌웨어가 SYNC에 응답하지 않습니다")
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._reader is not None:
+            self._reader.join(1.0)
+        close = getattr(self.port, "close", None)
+        if close:
+            close()
+
+    # --- 전송 ---
+
+    def send(self, data: bytes):
+        """
+        데이터를 프레임으로 나눠 윈도우가 허용하는 만큼 바로 전송
+        (윈도우가 닫혀 있으면 ACK/윈도우 갱신을 기다림, 전체 ACK는 기다리지 않음)
+        """
+        if self._error is not None:
+            # 이전 전송이 실패했다면 다시 동기화 후 진행 (실패한 윈도우는 버려짐)
+            print(f"[SerialLink] 이전 오류 후 재동기화: {self._error}")
+            self.sync()
+        for chunk in self._chunks(bytes(data)):
+            with self._cond:
+                self._waiting = len(chunk)
+                try:
+                    while (len(chunk) > self._peer_free - self._inflight_bytes
+                           or len(self._inflight) >= MAX_INFLIGHT):
+                        self._raise_if_failed()
+                        self._cond.wait(self.ack_timeout / 4)
+                    self._raise_if_failed()
+                finally:
+                    self._waiting = 0
+
+                seq = self._next_seq
+                self._next_seq = (seq + 1) & 0xFF
+                frame = encode_frame(TYPE_DATA, seq, chunk)
+                if not self._inflight:
+                    self._sent_at = time.monotonic()
+                self._inflight[seq] = (frame, len(chunk))
+                self._inflight_bytes += len(chunk)
+                self._write(frame)
+                self.frames_sent += 1
+
+    def drain(self, timeout: float = None) -> bool:
+        """보낸 프레임이 모두 ACK될 때까지 대기"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._inflight:
+                if self._closed or self._error is not None:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # SerialOutput 호환 (port.write / port.flush)
+    def write(self, data: bytes):
+        self.send(data)
+
+    def flush(self):
+        pass
+
+    # --- 내부 ---
+
+    def _chunks(self, data: bytes):
+        size = self.max_payload - (self.max_payload % self.align)
+        for i in range(0, len(data), size):
+            yield data[i:i + size]
+
+    def _write(self, frame: bytes):
+        with self._write_lock:
+            self.port.write(frame)
+            self.port.flush()
+
+    def _raise_if_failed(self):
+        if self._closed:
+            raise SerialLinkError("링크가 닫혔습니다")
+        if self._error is not None:
+            raise SerialLinkError(self._error)
+
+    def _retransmit_locked(self):
+        self._retries += 1
+        if self._retries > self.max_retries:
+            self._fail_locked(f"재전송 한도 초과 ({self.max_retries}회)")
+            return
+        self._sent_at = time.monotonic()
+        for frame, _ in self._inflight.values():
+            self._write(frame)
+            self.retransmits += 1
+
+    def _fail_locked(self, reason: str):
+        print(f"[SerialLink] 전송 실패: {reason}")
+        self._error = reason
+        self._inflight.clear()
+        self._inflight_bytes = 0
+        self._cond.notify_all()
+
+    def _service_locked(self):
+        """NAK/타임아웃 재전송, 닫힌 윈도우 프로브 (수신 스레드에서 lock 보유 상태로 호출)"""
+        if self._error is not None or self._last_ack is None:
+            return
+        now = time.monotonic()
+        if self._nak is not None:
+            self._nak = None
+            if self._inflight:
+                self._retransmit_locked()
+        elif self._inflight and now - self._sent_at >= self.ack_timeout:
+            self._retransmit_locked()
+        elif (not self._inflight and self._waiting > self._peer_free
+                and now - max(self._sent_at, self._last_rx) >= self.ack_timeout):
+            # 윈도우 갱신 ACK가 유실됐을 수 있으므로 상태를 다시 요청
+            if now - self._last_rx >= self.ack_timeout * (self.max_retries + 1):
+                self._fail_locked("펌웨어 응답이 없습니다")
+                return
+            self._sent_at = now
+            self._write(encode_frame(TYPE_PROBE, (self._next_seq - 1) & 0xFF))
+
+    def _read_loop(self):
+        buf = bytearray()
+        while not self._closed:
+            try:
+                data = self.port.read(1)
+            except Exception as e:
+                if self._closed:
+                    break
+                print(f"[SerialLink] 수신 실패: {e}")
+                time.sleep(self.ack_timeout)
+                data = b""
+            if data:
+                buf.extend(data)
+                # 펌웨어 로그 텍스트 사이에서 [ACK|NAK, SEQ, FREE, CRC] 찾기
+                while buf and buf[0] not in (ACK, NAK):
+                    del buf[0]
+                while len(buf) >= 4:
+                    if crc8(bytes(buf[:3])) != buf[3]:
+                        del buf[0]
+                        while buf and buf[0] not in (ACK, NAK):
+                            del buf[0]
+                        continue
+                    kind, seq, free = buf[0], buf[1], buf[2]
+                    del buf[:4]
+                    self._on_ack(kind, seq, free)
+            with self._cond:
+                self._service_locked()
+
+    def _on_ack(self, kind: int, seq: int, free: int):
+        with self._cond:
+            now = time.monotonic()
+            self._last_rx = now
+            self._peer_free = free
+            if kind == ACK:
+                self._last_ack = seq
+            # 누적 ACK: NAK SEQ는 SEQ-1까지 받았다는 의미
+            acked = seq if kind == ACK else (seq - 1) & 0xFF
+            popped = False
+            while self._inflight:
+                first = next(iter(self._inflight))
+                if not _seq_le(first, acked):
+                    break
+                _, length = self._inflight.pop(first)
+                self._inflight_bytes -= length
+                popped = True
+            if popped:
+                self._retries = 0
+                self._sent_at = now
+            if kind == NAK:
+                # 같은 구간을 이미 다시 보냈다면 뒤따르는 NAK는 무시 (go-back-N 중복 방지)
+                last_seq, last_at = self._last_nak
+                if last_seq != seq or now - last_at >= self.ack_timeout:
+                    self._last_nak = (seq, now)
+                    self._nak = seq
+            self._cond.notify_all()
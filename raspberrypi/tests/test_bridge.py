@@ -0,0 +1,106 @@
+"""
+멀티 디스플레이 브릿지(bridge.py) 테스트
+"""
+import threading
+import time
+import unittest
+import sys
+import os
+
+# raspberrypi 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bridge import DisplayRouter, SerialOutput, FRAME_PACKETS, FRAME_TEXT, parse_serial_ports
+from braille_encoder import text_to_bytes
+
+
+class FakePort:
+    """Serial 대역: 쓰기마다 delay초 지연"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.data = bytearray()
+        self.written = threading.Event()
+
+    def write(self, data):
+        time.sleep(self.delay)
+        self.data.extend(data)
+        self.written.set()
+
+    def flush(self):
+        pass
+
+
+class TestBridge(unittest.TestCase):
+
+    def test_parse_serial_ports(self):
+        self.assertEqual(parse_serial_ports("/dev/ttyACM0, /dev/ttyACM1"), {0: "/dev/ttyACM0", 1: "/dev/ttyACM1"})
+        self.assertEqual(parse_serial_ports("0=/dev/ttyACM0,3=/dev/ttyUSB0"), {0: "/dev/ttyACM0", 3: "/dev/ttyUSB0"})
+
+    def test_slow_display_does_not_block_fast_display(self):
+        """느린 디스플레이에 쌓인 프레임이 빠른 디스플레이 전송을 막지 않음"""
+        slow, fast = FakePort(delay=0.5), FakePort()
+        router = DisplayRouter({0: SerialOutput(0, slow), 1: SerialOutput(1, fast)})
+        try:
+            started = time.monotonic()
+            for _ in range(3):
+                self.assertTrue(router.route(bytes([0, FRAME_PACKETS, 0x80, 0x08])))
+            self.assertTrue(router.route(bytes([1, FRAME_PACKETS, 0x80, 0x23])))
+            self.assertLess(time.monotonic() - started, 0.1)  # 라우팅은 블로킹 없음
+            self.assertTrue(fast.written.wait(0.3))
+            self.assertEqual(bytes(fast.data), bytes([0x80, 0x23]))
+        finally:
+            router.close()
+
+    def test_full_queue_drops_frames(self):
+        port = FakePort(delay=0.2)
+        output = SerialOutput(0, port, queue_size=1)
+        try:
+            results = [output.submit(b"\x80\x08") for _ in range(4)]
+            self.assertIn(False, results)
+            self.assertGreater(output.dropped, 0)
+        finally:
+            output.close()
+
+    def test_close_does_not_hang_on_stuck_port(self):
+        """포트 쓰기가 멈춰 큐가 가득 차도 close()는 timeout 안에 끝남"""
+        stuck, writing = threading.Event(), threading.Event()
+
+        class StuckPort(FakePort):
+            def write(self, data):
+                writing.set()
+                stuck.wait(5)
+
+        output = SerialOutput(0, StuckPort(), queue_size=2)
+        output.submit(b"\x80\x08")
+        self.assertTrue(writing.wait(1.0))  # writer가 첫 프레임에서 멈춤
+        for _ in range(2):
+            self.assertTrue(output.submit(b"\x80\x08"))
+        started = time.monotonic()
+        output.close(timeout=0.2)
+        self.assertLess(time.monotonic() - started, 1.0)
+        stuck.set()
+        output._thread.join(1.0)
+        self.assertFalse(output._thread.is_alive())  # 포트가 풀리면 종료 신호를 받고 끝남
+
+    def test_text_frame_split_across_writes(self):
+        """BLE 쓰기 경계에서 잘린 UTF-8 문자도 올바르게 인코딩"""
+        port = FakePort()
+        router = DisplayRouter({2: SerialOutput(2, port)}, encode=text_to_bytes)
+        raw = "가나".encode("utf-8")
+        router.route(bytes([2, FRAME_TEXT]) + raw[:4])
+        router.route(bytes([2, FRAME_TEXT]) + raw[4:])
+        router.close()
+        self.assertEqual(bytes(port.data), text_to_bytes("가나"))
+
+    def test_unknown_display_is_rejected(self):
+        router = DisplayRouter({0: SerialOutput(0, FakePort())})
+        try:
+            self.assertFalse(router.route(bytes([5, FRAME_PACKETS, 0x80, 0x08])))
+            self.assertFalse(router.route(b"\x00"))
+        finally:
+            router.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Serial 링크 프로토콜(serial_link.py) 테스트
+pty 양 끝에 호스트(SerialLink)와 펌웨어 대역(FakeFirmware)을 연결해 검증
+"""
+import os
+import pty
+import select
+import threading
+import time
+import tty
+import unittest
+import sys
+
+# raspberrypi 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from serial_link import (
+    ACK, NAK, STX, TYPE_DATA, TYPE_PROBE, TYPE_SYNC, FIRMWARE_BUFFER,
+    SerialLink, SerialLinkError, crc8, encode_ack,
+)
+
+
+class FdPort:
+    """pyserial Serial과 같은 read(n)/write/flush 인터페이스 (타임아웃 있는 read)"""
+
+    def __init__(self, fd, timeout=0.02):
+        self.fd = fd
+        self.timeout = timeout
+
+    def read(self, n=1):
+        ready, _, _ = select.select([self.fd], [], [], self.timeout)
+        return os.read(self.fd, n) if ready else b""
+
+    def write(self, data):
+        os.write(self.fd, data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeFirmware(threading.Thread):
+    """
+    braille_3cell.ino의 프레임 수신부와 같은 동작을 하는 펌웨어 대역
+    - 100바이트 링 버퍼, 누적 ACK, 순서 어긋난 프레임은 NAK
+    - consume_delay초마다 패킷(2바이트)을 소비하며 윈도우 갱신 ACK 전송
+    """
+
+    def __init__(self, port, consume_delay=0.002, drop_seqs=(), corrupt_seqs=()):
+        super().__init__(daemon=True)
+        self.port = port
+        self.consume_delay = consume_delay
+        self.drop_seqs = set(drop_seqs)
+        self.corrupt_seqs = set(corrupt_seqs)
+        self.ring = bytearray()
+        self.received = bytearray()
+        self.max_used = 0
+        self.overflows = 0
+        self.expected = 0
+        self.last_seq = 0xFF
+        self.advertised = FIRMWARE_BUFFER
+        self.stop = threading.Event()
+
+    def send_ack(self, kind, seq):
+        free = FIRMWARE_BUFFER - len(self.ring)
+        self.advertised = free
+        self.port.write(encode_ack(kind, seq, free))
+
+    def handle(self, frame_type, seq, payload, crc_ok):
+        if not crc_ok:
+            self.send_ack(NAK, self.expected)
+            return
+        if frame_type == TYPE_SYNC:
+            self.ring.clear()
+            self.last_seq, self.expected = seq, (seq + 1) & 0xFF
+            self.send_ack(ACK, self.last_seq)
+            return
+        if frame_type == TYPE_PROBE:
+            self.send_ack(ACK, self.last_seq)
+            return
+        if seq != self.expected:
+            if 0 < ((self.expected - seq) & 0xFF) <= 128:
+                self.send_ack(ACK, self.last_seq)
+            else:
+                self.send_ack(NAK, self.expected)
+            return
+        if len(payload) > FIRMWARE_BUFFER - len(self.ring):
+            self.overflows += 1
+            self.send_ack(NAK, self.expected)
+            return
+        self.ring.extend(payload)
+        self.max_used = max(self.max_used, len(self.ring))
+        self.last_seq, self.expected = seq, (seq + 1) & 0xFF
+        self.send_ack(ACK, self.last_seq)
+
+    def run(self):
+        buf = bytearray()
+        last_consume = time.monotonic()
+        while not self.stop.is_set():
+            buf.extend(self.port.read(64))
+            while buf:
+                if buf[0] != STX:
+                    del buf[0]
+                    continue
+                if len(buf) < 5 or len(buf) < 5 + buf[3]:
+                    break
+                frame_type, seq, length = buf[1], buf[2], buf[3]
+                payload = bytes(buf[4:4 + length])
+                crc_ok = crc8(bytes(buf[1:4 + length])) == buf[4 + length]
+                del buf[:5 + length]
+                if frame_type == TYPE_DATA and seq in self.drop_seqs:
+                    self.drop_seqs.discard(seq)  # 한 번만 유실
+                    continue
+                if frame_type == TYPE_DATA and seq in self.corrupt_seqs:
+                    self.corrupt_seqs.discard(seq)
+                    crc_ok = False
+                self.handle(frame_type, seq, payload, crc_ok)
+            now = time.monotonic()
+            if len(self.ring) >= 2 and now - last_consume >= self.consume_delay:
+                last_consume = now
+                self.received.extend(self.ring[:2])
+                del self.ring[:2]
+                free = FIRMWARE_BUFFER - len(self.ring)
+                if free - self.advertised >= 16 or (not self.ring and self.advertised < FIRMWARE_BUFFER):
+                    self.send_ack(ACK, self.last_seq)
+
+
+class TestSerialLink(unittest.TestCase):
+
+    def start(self, **firmware_kwargs):
+        host_fd, fw_fd = pty.openpty()
+        tty.setraw(host_fd)
+        tty.setraw(fw_fd)
+        self.addCleanup(os.close, host_fd)
+        self.addCleanup(os.close, fw_fd)
+        firmware = FakeFirmware(FdPort(fw_fd, timeout=0.001), **firmware_kwargs)
+        firmware.start()
+        self.addCleanup(firmware.join, 1.0)
+        self.addCleanup(firmware.stop.set)
+        link = SerialLink(FdPort(host_fd), ack_timeout=0.1).open()
+        self.addCleanup(link.close)
+        return link, firmware
+
+    def wait_received(self, firmware, size, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while len(firmware.received) < size and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def payload(self, n):
+        return bytes(b for i in range(n) for b in (0x80 | (i % 2), i % 64))
+
+    def test_long_message_never_overruns_firmware_buffer(self):
+        """버퍼(100바이트)보다 훨씬 긴 데이터도 잘림/넘침 없이 순서대로 전달"""
+        link, firmware = self.start()
+        data = self.payload(400)  # 800바이트
+        link.send(data)
+        self.assertTrue(link.drain(5.0))
+        self.wait_received(firmware, len(data))
+        self.assertEqual(bytes(firmware.received), data)
+        self.assertLessEqual(firmware.max_used, FIRMWARE_BUFFER)
+        self.assertEqual(firmware.overflows, 0)
+
+    def test_window_keeps_multiple_frames_in_flight(self):
+        """ACK를 기다리지 않고 윈도우만큼 연속 전송 (링크 포화)"""
+        link, firmware = self.start(consume_delay=0.05)
+        link.send(self.payload(48))  # 96바이트 = 2프레임
+        self.assertEqual(link.frames_sent, 2)
+        self.assertTrue(link.drain(2.0))
+        self.assertEqual(link.retransmits, 0)
+
+    def test_lost_and_corrupted_frames_are_retransmitted(self):
+        link, firmware = self.start(drop_seqs={1}, corrupt_seqs={3})
+        data = self.payload(150)
+        link.send(data)
+        self.assertTrue(link.drain(5.0))
+        self.wait_received(firmware, len(data))
+        self.assertEqual(bytes(firmware.received), data)
+        self.assertGreater(link.retransmits, 0)
+
+    def test_silent_firmware_raises(self):
+        host_fd, fw_fd = pty.openpty()
+        tty.setraw(host_fd)
+        tty.setraw(fw_fd)
+        self.addCleanup(os.close, host_fd)
+        self.addCleanup(os.close, fw_fd)
+        link = SerialLink(FdPort(host_fd), ack_timeout=0.05, max_retries=1)
+        self.addCleanup(link.close)
+        with self.assertRaises(SerialLinkError):
+            link.open()
+
+
+if __name__ == '__main__':
+    unittest.main()